@@ -5,14 +5,60 @@ import re
 import sys
 import datetime
 import argparse
+import bisect
+import contextlib
+import functools
+import hashlib
+import glob
+import io
+import logging
+import mmap
+import os
+import threading
+import time
+import concurrent.futures
+import xml.parsers.expat
 from pathlib import Path
-import xlsxwriter
-import l5x
 import re
+from collections.abc import Mapping
+
+import iogen_log
+from iogen_cache import ParseCache
+from iogen_profile import profiler, import_report
+
+# xlsxwriter и l5x импортируются при первом использовании (writer/reader), это заметная часть запуска
+LAZY_MODULES = ('xlsxwriter', 'l5x')
 
-io_config = {}
-io_description = {}
 use_kip_tag = True
+# меняется при любом изменении разбора, которое влияет на результат (сбрасывает кэш)
+PARSER_VERSION = 4
+
+log = logging.getLogger('iogen')
+log_csv = logging.getLogger('iogen.csv')
+log_l5x = logging.getLogger('iogen.l5x')
+log_map = logging.getLogger('iogen.map')
+log_alias = logging.getLogger('iogen.alias')
+_chassis_loggers = {}
+
+
+def _chassis_logger(chassis):
+    """ iogen.alias.<chassis>, for --debug-chassis"""
+    logger = _chassis_loggers.get(chassis)
+    if logger is None:
+        logger = _chassis_loggers[chassis] = logging.getLogger(f'iogen.alias.{chassis}')
+    return logger
+
+
+def _debug_flag(reader):
+    """ A reader's `debug=True` lowers `iogen.alias` to DEBUG while the reader runs"""
+    position = reader.__code__.co_varnames.index('debug')
+
+    @functools.wraps(reader)
+    def wrapper(*args, **kwargs):
+        debug = args[position] if len(args) > position else kwargs.get('debug', False)
+        with iogen_log.verbose(debug):
+            return reader(*args, **kwargs)
+    return wrapper
 
 
 class Tag(object):
@@ -47,12 +93,359 @@ class Tag(object):
         return self.name
 
 
-def RUS_comment_decoder(comment: str):
-    """ Decode russian comments"""
-    # $0422$0435$043a$0443$0449$0430$044f $0441$0442$0435$043f$0435$043d$044c $043e$0442$043a$0440$044b$0442$0438$044f, %
-    # Текущая степень открытия, %
-    if comment is None:
-        return ""
+class IOPoint(object):
+    """
+    One IO channel of a project; `alias` is the AliasFor address the tag was parsed from.
+    Made by IOModel on access, the model itself keeps the points in columns.
+    """
+    __slots__ = ('chassis', 'slot', 'point', 'tag', 'description', 'alias')
+
+    def __init__(self, chassis: str, slot: int, point: int, tag: str, description: str = '', alias: str = ''):
+        self.chassis = chassis
+        self.slot = slot
+        self.point = point
+        self.tag = tag
+        self.description = description
+        self.alias = alias
+
+    def __repr__(self):
+        return f'IOPoint({self.chassis!r}, {self.slot!r}, {self.point!r}, {self.tag!r})'
+
+
+class _SlotColumns(object):
+    """ Points of one slot: tag, description and alias lists indexed by point number, tag None — no point"""
+    __slots__ = ('tags', 'descriptions', 'aliases')
+
+    def __init__(self):
+        self.tags = []
+        self.descriptions = []
+        self.aliases = []
+
+    def numbers(self):
+        """ Point numbers in use, ascending"""
+        return [n for n, tag in enumerate(self.tags) if tag is not None]
+
+
+class IOModel(object):
+    """
+    IO allocation of one project: chassis → slot → columns of the slot's points.
+
+    Replaces the pair of io_config / io_description dicts. A slot keeps tag
+    names, descriptions and aliases in three lists indexed by point number
+    (channels are numbered densely from 0), so a point costs three list
+    entries instead of two dict entries; chassis names are interned.
+    IOPoint records are made only when points are read out.
+    Slots are registered by `add_slot` even if no point of them was parsed,
+    the same way `append_chass` always did.
+    `stats` holds the counters of the reader which filled the model.
+    """
+
+    def __init__(self):
+        self._chassis = {}
+        self._size = 0
+        self.stats = {}
+
+    def add_slot(self, chassis: str, slot: int):
+        slots = self._chassis.get(chassis)
+        if slots is None:
+            slots = self._chassis[sys.intern(chassis)] = {}
+        if slot not in slots:
+            slots[slot] = _SlotColumns()
+
+    def put(self, chassis: str, slot: int, point: int, tag: str, description: str = '', alias: str = ''):
+        """ Store a point, returns the IOPoint it replaced (or None)"""
+        chassis = sys.intern(chassis)
+        slots = self._chassis.get(chassis)
+        if slots is None:
+            slots = self._chassis[chassis] = {}
+        columns = slots.get(slot)
+        if columns is None:
+            columns = slots[slot] = _SlotColumns()
+        tags = columns.tags
+        old = None
+        if point >= len(tags):
+            free = [None] * (point + 1 - len(tags))
+            tags.extend(free)
+            columns.descriptions.extend(free)
+            columns.aliases.extend(free)
+        elif tags[point] is not None:
+            old = IOPoint(chassis, slot, point, tags[point], columns.descriptions[point], columns.aliases[point])
+        if old is None:
+            self._size += 1
+        tags[point] = tag
+        columns.descriptions[point] = description
+        columns.aliases[point] = alias
+        return old
+
+    def _columns(self, chassis: str, slot: int):
+        slots = self._chassis.get(chassis)
+        return None if slots is None else slots.get(slot)
+
+    def get(self, chassis: str, slot: int, point: int):
+        """ IOPoint at the address or None"""
+        columns = self._columns(chassis, slot)
+        if columns is None or not 0 <= point < len(columns.tags) or columns.tags[point] is None:
+            return None
+        return IOPoint(chassis, slot, point, columns.tags[point], columns.descriptions[point], columns.aliases[point])
+
+    def tag(self, chassis: str, slot: int, point: int, default=''):
+        p = self.get(chassis, slot, point)
+        return default if p is None else p.tag
+
+    def description(self, chassis: str, slot: int, point: int, default=''):
+        p = self.get(chassis, slot, point)
+        return default if p is None else p.description
+
+    def chassis(self):
+        """ Sorted chassis names"""
+        return sorted(self._chassis)
+
+    def slots(self, chassis: str):
+        """ Sorted slot numbers of a chassis"""
+        return sorted(self._chassis.get(chassis, ()))
+
+    def slot_points(self, chassis: str, slot: int):
+        """ point → IOPoint dict of one slot (empty if the slot is unknown)"""
+        return {p.point: p for p in self.points(chassis, slot)}
+
+    def points(self, chassis: str, slot: int):
+        """ IOPoints of one slot sorted by point number"""
+        columns = self._columns(chassis, slot)
+        if columns is None:
+            return []
+        return [IOPoint(chassis, slot, n, tag, description, alias)
+                for n, (tag, description, alias) in enumerate(zip(columns.tags, columns.descriptions,
+                                                                   columns.aliases))
+                if tag is not None]
+
+    def iter_points(self, chassis: str = None):
+        """ All IOPoints (or those of one chassis) sorted by chassis, slot, point"""
+        for c in (self.chassis() if chassis is None else [chassis]):
+            for s in self.slots(c):
+                yield from self.points(c, s)
+
+    def clear(self):
+        self._chassis.clear()
+        self._size = 0
+        self.stats = {}
+
+    def merge(self, other):
+        """ Add all slots and points of another model (taken over as is when this one is empty)"""
+        if not self._chassis:
+            self._chassis, self._size = other._chassis, other._size
+            self.stats = dict(other.stats)
+            other._chassis, other._size = {}, 0
+        else:
+            self.load_columns(other.dump_columns())
+
+    def dump_columns(self):
+        """ Plain column lists of the model (for caches and stores), see `load_columns`"""
+        table = {'slots': [], 'chassis': [], 'slot': [], 'point': [], 'tag': [], 'description': [], 'alias': [],
+                 'stats': dict(self.stats)}
+        for chassis, slots in self._chassis.items():
+            for slot, columns in slots.items():
+                table['slots'].append((chassis, slot))
+                numbers = columns.numbers()
+                table['chassis'].extend([chassis] * len(numbers))
+                table['slot'].extend([slot] * len(numbers))
+                table['point'].extend(numbers)
+                table['tag'].extend(columns.tags[n] for n in numbers)
+                table['description'].extend(columns.descriptions[n] for n in numbers)
+                table['alias'].extend(columns.aliases[n] for n in numbers)
+        return table
+
+    def load_columns(self, table):
+        """ Add the points of a `dump_columns` table to the model"""
+        for chassis, slot in table['slots']:
+            self.add_slot(chassis, slot)
+        aliases = table.get('alias') or [''] * len(table['tag'])
+        # equal descriptions share one string, as they do after the decoder's memo
+        shared = {}
+        for chassis, slot, point, tag, description, alias in zip(table['chassis'], table['slot'], table['point'],
+                                                                 table['tag'], table['description'], aliases):
+            self.put(chassis, slot, point, tag, shared.setdefault(description, description), alias)
+        self.stats.update(table.get('stats', {}))
+
+    def __len__(self):
+        """ Number of points"""
+        return self._size
+
+    def __contains__(self, chassis):
+        return chassis in self._chassis
+
+
+class _ModelView(Mapping):
+    """
+    Read-only chassis → slot → point → str view of an IOModel.
+    Kept for code written against the old io_config / io_description dicts.
+    """
+
+    def __init__(self, model: IOModel, field: str, path=()):
+        self._model = model
+        self._field = field
+        self._path = path
+
+    def _node(self):
+        node = self._model._chassis
+        for key in self._path:
+            node = node[key]
+        return node
+
+    def __getitem__(self, key):
+        if len(self._path) == 2:
+            p = self._model.get(*self._path, key)
+            if p is None:
+                raise KeyError(key)
+            return getattr(p, self._field)
+        self._node()[key]  # KeyError for an unknown chassis or slot
+        return _ModelView(self._model, self._field, self._path + (key,))
+
+    def __iter__(self):
+        node = self._node()
+        return iter(node.numbers() if len(self._path) == 2 else node)
+
+    def __len__(self):
+        node = self._node()
+        return len(node.numbers() if len(self._path) == 2 else node)
+
+    def clear(self):
+        if self._path:
+            raise TypeError('only the top level view can be cleared')
+        self._model.clear()
+
+    def __repr__(self):
+        return repr({key: (dict(value) if isinstance(value, Mapping) else value) for key, value in self.items()})
+
+
+def _find_all(blob, starts, needle):
+    """ Numbers of the '\\0'-separated entries of `blob` (starting at `starts`) which contain `needle`"""
+    found = []
+    pos = blob.find(needle)
+    while pos >= 0:
+        i = bisect.bisect_right(starts, pos) - 1
+        found.append(i)
+        pos = blob.find(needle, starts[i + 1]) if i + 1 < len(starts) else -1
+    return found
+
+
+class IOIndex(object):
+    """
+    Reverse lookups over an IOModel: where is a tag or an instrument wired.
+
+    * tag(name) — exact tag name, with or without the "Program/" prefix;
+    * kip(name) — KIP name as tag2kip shows it (PT-1024), '-' and case ignored;
+    * tag_prefix(text), tag_contains(text) — search over tag names;
+    * description_contains(text) — search in decoded descriptions;
+    * search(text) — tag or description contains text (the preview filter);
+    * find(query) — all of the above, best matches first.
+
+    Matching ignores case (str.casefold, so Cyrillic descriptions work too).
+    Results are IOPoints, sorted by chassis, slot, point within a kind.
+    The index is a snapshot: build a new one after the model changed.
+    """
+
+    def __init__(self, model=None):
+        points = self._points = list(_model(model).iter_points())
+        tags = [p.tag.casefold() for p in points]
+        self._tags = {}  # casefolded tag and tag without program → [point numbers]
+        for i, tag in enumerate(tags):
+            self._tags.setdefault(tag, []).append(i)
+            base = tag.rpartition('/')[2]
+            if base != tag:
+                self._tags.setdefault(base, []).append(i)
+        self._names = sorted(self._tags)
+        self._kips = {}  # normalised KIP name → [point numbers]
+        for i, p in enumerate(points):
+            self._kips.setdefault(self._kip_key(_kip_name(p.tag.rpartition('/')[2])), []).append(i)
+        self._tag_blob, self._tag_starts = self._blob(tags)
+        self._description_blob, self._description_starts = self._blob([p.description.casefold() for p in points])
+
+    @staticmethod
+    def _blob(texts):
+        starts = []
+        pos = 0
+        for text in texts:
+            starts.append(pos)
+            pos += len(text) + 1
+        return '\0'.join(texts), starts
+
+    @staticmethod
+    def _kip_key(kip):
+        return kip.casefold().replace('-', '')
+
+    def _result(self, numbers):
+        return [self._points[i] for i in sorted(set(numbers))]
+
+    def __len__(self):
+        return len(self._points)
+
+    def tag(self, name):
+        return self._result(self._tags.get(name.casefold(), ()))
+
+    def kip(self, name):
+        return self._result(self._kips.get(self._kip_key(name), ()))
+
+    def tag_prefix(self, text):
+        text = text.casefold()
+        numbers = []
+        for i in range(bisect.bisect_left(self._names, text), len(self._names)):
+            if not self._names[i].startswith(text):
+                break
+            numbers += self._tags[self._names[i]]
+        return self._result(numbers)
+
+    def tag_contains(self, text):
+        text = text.casefold().replace('\0', '')
+        return self._result(_find_all(self._tag_blob, self._tag_starts, text) if text else ())
+
+    def description_contains(self, text):
+        text = text.casefold().replace('\0', '')
+        return self._result(_find_all(self._description_blob, self._description_starts, text) if text else ())
+
+    def search(self, text):
+        text = text.casefold().replace('\0', '')
+        if not text:
+            return []
+        return self._result(_find_all(self._tag_blob, self._tag_starts, text) +
+                            _find_all(self._description_blob, self._description_starts, text))
+
+    def find(self, query, limit=None):
+        """ Exact tag and KIP matches, then tag prefix, tag substring and description matches"""
+        query = query.strip()
+        if not query:
+            return []
+        found = {}
+        for lookup in (self.tag, self.kip, self.tag_prefix, self.tag_contains, self.description_contains):
+            if limit is not None and len(found) >= limit:
+                break
+            for p in lookup(query):
+                found.setdefault(id(p), p)
+        return list(found.values())[:limit]
+
+
+# модель по умолчанию, с ней работают функции, которым не передана своя модель
+default_model = IOModel()
+# совместимость: старый код читает эти словари напрямую
+io_config = _ModelView(default_model, 'tag')
+io_description = _ModelView(default_model, 'description')
+
+
+def _model(model):
+    return default_model if model is None else model
+
+
+_RUS_CODE = re.compile(r"\$([0-9A-Fa-f]{4}|Q|N)")
+
+
+def _rus_code(match):
+    code = match.group(1)
+    if code == 'Q' or code == 'N':
+        return '\n'
+    return chr(int(code, base=16))
+
+
+def _RUS_comment_decoder_slow(comment: str):
+    """ Character by character decoder, used for comments with unusual '$' sequences"""
     out = ''
     pos = 0
     try:
@@ -73,14 +466,51 @@ def RUS_comment_decoder(comment: str):
     return out
 
 
+@functools.lru_cache(maxsize=8192)
+def RUS_comment_decoder(comment: str):
+    """ Decode russian comments"""
+    # $0422$0435$043a$0443$0449$0430$044f $0441$0442$0435$043f$0435$043d$044c $043e$0442$043a$0440$044b$0442$0438$044f, %
+    # Текущая степень открытия, %
+    if comment is None:
+        return ""
+    if '$' not in comment:
+        return comment
+    if '\\' not in comment:
+        # $hhhh → \uhhhh for the unicode_escape codec, which decodes in C and
+        # rejects any '$' that is not followed by four hex digits
+        try:
+            return (comment.replace('$N', '\n').replace('$Q', '\n').replace('$', '\\u')
+                    .encode('latin-1').decode('unicode_escape'))
+        except UnicodeError:
+            pass  # malformed code, or characters above U+00FF in the comment itself
+    out, count = _RUS_CODE.subn(_rus_code, comment)
+    if count == comment.count('$'):
+        return out
+    # truncated or malformed '$' sequence somewhere in the comment
+    return _RUS_comment_decoder_slow(comment)
+
+
+def decode_many(comments):
+    """ Decode an iterable of comments, returns a list"""
+    return [RUS_comment_decoder(comment) for comment in comments]
+
+
 def tag2kip(tag_name: str):  #
     global use_kip_tag
     if not use_kip_tag:
         return tag_name
+    return _kip_name(tag_name)
+
+
+_KIP_NAME = re.compile(r"([A-Z]+)([0-9]+[A-Z]*)", re.IGNORECASE)
+
+
+def _kip_name(tag_name: str):
+    """ KIP (instrument) name of a tag: iPT1024 → PT-1024"""
     kip = tag_name.removeprefix('i').removeprefix('o')
     if '_' in kip:
         return kip
-    match = re.match(r"([A-Z]+)([0-9]+[A-Z]*)", kip, re.IGNORECASE)
+    match = _KIP_NAME.match(kip)
     if match:
         head, tail = match.groups()
         out = f'{head}-{tail}'
@@ -89,21 +519,18 @@ def tag2kip(tag_name: str):  #
         return kip
 
 
-def append_chass(chass_name: str, slot_num: int):
-    global io_config
-    global io_description
-    if chass_name not in io_config.keys():
-        io_config[chass_name] = {}
-    if slot_num not in io_config[chass_name]:
-        io_config[chass_name][slot_num] = {}
-    # bad copy paste
-    if chass_name not in io_description.keys():
-        io_description[chass_name] = {}
-    if slot_num not in io_description[chass_name]:
-        io_description[chass_name][slot_num] = {}
+def append_chass(chass_name: str, slot_num: int, model=None):
+    _model(model).add_slot(chass_name, slot_num)
 
 
 class n11mapping(object):
+    """
+    Substitution map for N11/N68 style addresses.
+
+    Keys are looked up by longest prefix: `N11[10]` wins over `N11[1]` for
+    `N11[10].3`, whatever the order of rows in the map file.
+    """
+
     def __init__(self, map_file_name):
         with open(map_file_name, newline='') as map_file:
             map_reader = csv.reader(map_file, delimiter=' ')
@@ -116,204 +543,1111 @@ class n11mapping(object):
                     self._n11[row[0]] = row[1]
                     # CP_P0024JA:6:I.Data N11[0]
             except IndexError:
-                print(f"Unparsed row in map file '{map_file_name}'")
-            print(f'Read {len(self._n11.keys())} point from map file')
+                log_map.warning("Unparsed row in map file '%s'", map_file_name)
+            log_map.info('Read %d point from map file', len(self._n11))
+        # distinct key lengths, longest first
+        self._lengths = sorted({len(n) for n in self._n11 if n}, reverse=True)
+        # first characters of the keys: most addresses are rejected on this alone
+        self._first = frozenset(n[0] for n in self._n11 if n)
 
     def replace(self, point_address: str):
-        for n in self._n11.keys():  # N11[0].
-            if point_address.startswith(n):
-                return point_address.replace(n, self._n11[n])
+        """Replace the longest matching map key at the start of `point_address`."""
+        if point_address[:1] not in self._first:
+            return point_address
+        n11 = self._n11
+        size = len(point_address)
+        for length in self._lengths:
+            if length > size:
+                continue
+            target = n11.get(point_address[:length])
+            if target is not None:
+                return target + point_address[length:]
         return point_address
 
 
-def read_input_csv(filename, map_file_name=None, old_csv_version=False):
-    global io_config
-    global io_description
+class LoadCancelled(Exception):
+    """ The load was cancelled through its LoadProgress"""
 
-    print(f'Input file name = "{filename}"')
-    if map_file_name:
-        print(f'Map file name = "{map_file_name}"')
-        n11 = n11mapping(map_file_name)
-        map_func = n11.replace
-    else:
-        map_func = lambda s: s
+
+class LoadProgress(object):
+    """
+    Progress report and cancel token of one load, shared by the loader thread and the GUI.
+
+    Readers announce a stage with `start(stage, total)`, move on with
+    `advance(n)` and call `check()` at points where stopping is safe (between
+    file chunks and programs); after `cancel()` check() raises LoadCancelled.
+    `callback(stage, done, total)` is called at most every `interval` seconds
+    and at the start of every stage.
+
+    Args:
+        callback (callable | None): Receives (stage, done, total); runs in the loader thread.
+        interval (float): Minimal time between two callbacks, seconds.
+    """
+
+    def __init__(self, callback=None, interval=0.2):
+        self.callback = callback
+        self.interval = interval
+        self.stage = ''
+        self.done = 0
+        self.total = 0
+        self._cancel = threading.Event()
+        self._next_report = 0.0
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def check(self):
+        if self._cancel.is_set():
+            raise LoadCancelled(f"Loading cancelled ({self.stage})")
+
+    def start(self, stage, total):
+        self.stage = stage
+        self.total = total
+        self.done = 0
+        self._report(time.monotonic())
+
+    def advance(self, n):
+        self.done += n
+        now = time.monotonic()
+        if now >= self._next_report:
+            self._report(now)
+
+    def _report(self, now):
+        self._next_report = now + self.interval
+        if self.callback is not None:
+            self.callback(self.stage, min(self.done, self.total), self.total)
+
+
+def _process_scopes(scopes, map_func, counters, debug, model, progress):
+    """ process_aliases of [(prefix, aliases)] in order, checking `progress` between scopes"""
+    if progress is not None:
+        progress.start('Processing alias tags', sum(len(aliases) for _, aliases in scopes))
+    for prefix, aliases in scopes:
+        if progress is not None:
+            progress.check()
+        process_aliases(aliases, map_func, counters, prefix, debug, model)
+        if progress is not None:
+            progress.advance(len(aliases))
+
+
+def _csv_alias_lines(csvfile, delimiter, seen, chunk_size=1 << 20, progress=None):
+    """
+    Lines of the ALIAS records of a tag export; other records are dropped
+    before the csv module sees them.
+
+    The file is read in chunks of whole lines. A record whose quoted field
+    holds a line break starts with a line with an odd number of quotes; chunks
+    with such lines are walked keeping track of open quotes, so a record is
+    kept or dropped whole. `seen[0]` counts the lines read; `progress`
+    advances by the characters read (bytes, the file is Latin-1).
+    """
+    prefixes = ('ALIAS' + delimiter, '"ALIAS"' + delimiter)
+    open_quote = False
+    keep = False
+    while True:
+        chunk = csvfile.read(chunk_size)
+        if not chunk:
+            break
+        if not chunk.endswith('\n'):
+            chunk += csvfile.readline()
+        if progress is not None:
+            progress.check()
+            progress.advance(len(chunk))
+        lines = chunk.split('\n')
+        if not lines[-1]:
+            lines.pop()
+        seen[0] += len(lines)
+        if not open_quote and not any(line.count('"') & 1 for line in lines):
+            # no record of this chunk spans lines
+            yield from [line for line in lines if line.startswith(prefixes)]
+            continue
+        for line in lines:
+            if not open_quote:
+                keep = line.startswith(prefixes)
+            if keep:
+                yield line + '\n'
+            if line.count('"') & 1:
+                open_quote = not open_quote
+
+
+@_debug_flag
+def read_input_csv(filename, map_file_name=None, old_csv_version=False, debug=False, model=None, progress=None):
+    """
+    Read alias tags from a CSV tag export (RSLogix 5000 / Studio 5000).
+
+    Only ALIAS records are parsed; their aliases go through the same
+    `process_alias_tag` as L5X tags, program scope tags are named
+    "Program/Tag" and applied before controller tags, so a CSV export gives
+    the same table as the L5X project.
+
+    Args:
+        filename (str | Path): Path to the CSV file.
+        map_file_name (str | None): Optional path to a substitution (mapping) file.
+        old_csv_version (bool): The export uses '?' as field separator (old RSLogix).
+        debug (bool): Enables verbose logging for troubleshooting.
+        model (IOModel | None): Model to fill, `default_model` if None.
+        progress (LoadProgress | None): Progress report and cancel token.
+
+    Returns:
+        bool: True.
+    """
+    model = _model(model)
+
+    log_csv.info('Input file name = "%s"', filename)
+    map_func = load_map_func(map_file_name)
 
     csv_delimiter = '?' if old_csv_version else ','
 
-    with open(filename, newline='', encoding="ISO-8859-1") as csvfile:
-        spamreader = csv.reader(csvfile, delimiter=csv_delimiter, quotechar='"')
-        total_points_counter = 0
-        for row in spamreader:
-            #     0    1     2       3          4        5          6
-            #   TYPE,SCOPE,NAME,DESCRIPTION,DATATYPE,SPECIFIER,ATTRIBUTES
-            #   TYPE?SCOPE?NAME?DESCRIPTION?DATATYPE?SPECIFIER
-            try:
-                TYPE, SCOPE, NAME, DESCRIPTION, DATATYPE, SPECIFIER = row[0], row[1], row[2], row[3], row[
-                    4], row[5],
-            except IndexError:
+    #     0    1     2       3          4        5          6
+    #   TYPE,SCOPE,NAME,DESCRIPTION,DATATYPE,SPECIFIER,ATTRIBUTES
+    #   TYPE?SCOPE?NAME?DESCRIPTION?DATATYPE?SPECIFIER
+    scopes = {}  # SCOPE ('' — controller) → [(tag_name, alias_for, description)]
+    seen = [0]
+    with profiler.stage('csv.parse'), open(filename, newline='', encoding="ISO-8859-1") as csvfile:
+        if progress is not None:
+            progress.start('Reading CSV', os.fstat(csvfile.fileno()).st_size)
+        lines = _csv_alias_lines(csvfile, csv_delimiter, seen, progress=progress)
+        reader = csv.reader(lines, delimiter=csv_delimiter, quotechar='"')
+        for row in reader:
+            if len(row) < 6 or row[0] != 'ALIAS':
                 continue  # short string
-            if TYPE == 'ALIAS':
-                mapped_specifier = map_func(SPECIFIER)
-                if not mapped_specifier == SPECIFIER:
-                    # NAME = bold(NAME)
-                    pass
-                io_address = mapped_specifier.split(':', 2)
-                if io_address[0] == 'RIO_SD' and False:
-                    print(SPECIFIER, NAME)
-                if len(io_address) == 3:  # ['RIO2_B', '8', 'I.Ch1Data'] or ['RIO_SD', '0', 'I.4']
-                    chass, slot = io_address[0], int(io_address[1])
-                    append_chass(chass_name=chass, slot_num=int(slot))
-
-                    last_part = io_address[2].split('.', 2)
-                    # I.Ch1Data I.Ch10Data vs I.Data.0 I.Data.10
-                    if len(last_part) == 3:  # 'I.Data.10'
-                        if last_part[0] == 'C':  # C.Ch0Config.HighEngineering
-                            continue
-                        if last_part[0] in 'IO' and last_part[1] == 'Data':
-                            point = int(last_part[2])
-                            # print(f'{tag_name} = {chass} {slot} {point}')
-                            io_config[chass][slot][point] = NAME
-                            io_description[chass][slot][point] = RUS_comment_decoder(DESCRIPTION)
-                            total_points_counter += 1
-
-                    if len(last_part) == 2:  # 'I.Ch3Data'  or   'I.4' for FlexIO
-                        if last_part[0] == 'I' or last_part[0] == 'O':
-                            if last_part[1].endswith('Data'):  # Ch8Data
-                                point = last_part[1].removesuffix('Data').removeprefix('Ch')
-                                if point.isdigit():
-                                    point = int(point)
-                                    # print(f'{tag_name} = {chass} {slot} {point}')
-                                    # ic(io_config)
-                                    io_config[chass][slot][point] = NAME
-                                    io_description[chass][slot][point] = RUS_comment_decoder(DESCRIPTION)
-                                    total_points_counter += 1
-                                else:
-                                    print(f'Unknown IO point format {last_part[1]}')
-                            elif last_part[1].isdigit():  # just '4'  for FlexIO
-                                point = int(last_part[1])
-                                io_config[chass][slot][point] = NAME
-                                io_description[chass][slot][point] = RUS_comment_decoder(DESCRIPTION)
-                                total_points_counter += 1
-
-        print(f'Total: {total_points_counter} points found')
-
-
-def read_input_l5x(l5x_path, map_file_name=None, test_run=False, debug=False):
+            scope = scopes.get(row[1])
+            if scope is None:
+                scope = scopes[row[1]] = []
+            scope.append((row[2], row[5], row[3]))
+
+    counters = new_counters()
+    ordered = [(f"{name}/", aliases) for name, aliases in scopes.items() if name]
+    ordered.append(('', scopes.get('', [])))
+    _process_scopes(ordered, map_func, counters, debug, model, progress)
+
+    log_csv.info('Total: %d points found', counters['parsed'])
+    model.stats.update(counters, points=counters['parsed'])
+    count_parsing(counters, seen[0])
+    return True
+
+
+def load_map_func(map_file_name):
+    """ n11mapping.replace of the map file; identity if there is no map or it cannot be read"""
+    if map_file_name:
+        try:
+            with profiler.stage('map.load'):
+                n11 = n11mapping(map_file_name)
+            log_map.info("🔄 Mapping file loaded: %s", map_file_name)
+            return n11.replace
+        except Exception as e:
+            log_map.warning("⚠️  Failed to load mapping file '%s': %s", map_file_name, e)
+    return _no_mapping
+
+
+def _no_mapping(address):
+    """ Map function without a map file (module level, so it can be sent to worker processes)"""
+    return address
+
+
+def process_aliases(aliases, map_func, counters, prefix='', debug=False, model=None):
+    """
+    Map, decode and parse (tag_name, alias_for, raw description) tuples of one
+    L5X scope or CSV SCOPE. `prefix` is prepended to tag names ("Program/"), `counters`
+    (total/parsed/skipped/mapped) are updated in place.
+    """
+    with profiler.stage('decode'):
+        descriptions = decode_many(description for _, _, description in aliases)
+    with profiler.stage('map'):
+        mapped = [map_func(alias_source) for _, alias_source, _ in aliases]
+    model = _model(model)
+    total = parsed = changed = 0
+    with profiler.stage('classify'):
+        for (tag_name, alias_source, _), alias, description in zip(aliases, mapped, descriptions):
+            if alias != alias_source:
+                changed += 1
+            if ":" in alias:
+                total += 1
+                if process_alias_tag(prefix + tag_name, alias, description, map_func, debug, model, alias_source):
+                    parsed += 1
+    counters['total'] += total
+    counters['parsed'] += parsed
+    counters['skipped'] += total - parsed
+    counters['mapped'] += changed
+
+
+def new_counters():
+    """ Counters of a reader run, filled by process_aliases"""
+    return {'total': 0, 'parsed': 0, 'skipped': 0, 'mapped': 0}
+
+
+def sum_counters(counters, parts):
+    """ Add the counters of scopes or runs (`parts`) to `counters`"""
+    for part in parts:
+        for key, value in part.items():
+            counters[key] += value
+    return counters
+
+
+def finish_parsing(model, counters, tags_seen=None, test_run=False, **stats):
+    """ End of an L5X reader: model stats, profiler counts and the parsing summary"""
+    model.stats.update(counters, **stats)
+    count_parsing(counters, tags_seen)
+    print_parsing_summary(counters)
+    if 'reused_scopes' in stats:
+        log_l5x.info("  • ♻️ Scopes reused unchanged:  %d of %d", stats['reused_scopes'], stats['scopes'])
+    if test_run:
+        log_l5x.info("🧪 Test run complete — %d points parsed into the model.", counters['parsed'])
+
+
+def count_parsing(counters, tags_seen=None):
+    """ Add a reader's counters to the profiler"""
+    if tags_seen is not None:
+        profiler.count('tags seen', tags_seen)
+    profiler.count('alias tags', counters['total'])
+    profiler.count('parsed', counters['parsed'])
+    profiler.count('skipped', counters['skipped'])
+    profiler.count('mapped', counters['mapped'])
+
+
+def print_parsing_summary(counters):
+    log_l5x.info("\n📊 Parsing summary:\n"
+                 "  • Total alias tags processed: %(total)s\n"
+                 "  • ✅ Successfully parsed:     %(parsed)s\n"
+                 "  • ⚠️ Skipped (invalid fmt):   %(skipped)s\n"
+                 "  • 🔁 Mapped via map-file:     %(mapped)s", counters, extra={'counters': dict(counters)})
+
+
+@_debug_flag
+def read_input_l5x(l5x_path, map_file_name=None, test_run=False, debug=False, model=None, progress=None):
     """
     Parse alias tags from an L5X project and populate IO configuration tables.
 
     Args:
         l5x_path (str | Path): Path to the L5X (XML) project file.
         map_file_name (str | None): Optional path to a substitution (mapping) file.
-        test_run (bool): If True, no data structures are modified (dry-run mode).
+        test_run (bool): Test run: the model is filled as usual, the summary ends with a test run line.
         debug (bool): Enables verbose logging for troubleshooting.
+        model (IOModel | None): Model to fill, `default_model` if None.
+        progress (LoadProgress | None): Progress (programs processed) and cancel token.
 
     Returns:
-        None
+        bool: False if the project could not be read.
     """
+    model = _model(model)
 
-    global io_config, io_description
-
-    print(f"📘 Reading L5X XML file: {l5x_path}")
+    log_l5x.info("📘 Reading L5X XML file: %s", l5x_path)
 
     # --- Load project ---
     try:
-        project = l5x.Project(l5x_path)
-        print(f"✅ L5X project loaded: {project}")
+        with profiler.stage('l5x.project'):
+            import l5x
+            project = l5x.Project(l5x_path)
+        log_l5x.info("✅ L5X project loaded: %s", project)
     except Exception as e:
-        print(f"❌ Failed to load L5X project: {e}")
-        return
+        log_l5x.error("❌ Failed to load L5X project: %s", e)
+        return False
 
     # --- Load optional mapping file ---
-    if map_file_name:
-        try:
-            n11 = n11mapping(map_file_name)
-            map_func = n11.replace
-            print(f"🔄 Mapping file loaded: {map_file_name}")
-        except Exception as e:
-            print(f"⚠️  Failed to load mapping file '{map_file_name}': {e}")
-            map_func = lambda s: s
-    else:
-        map_func = lambda s: s
+    map_func = load_map_func(map_file_name)
+
+    counters = new_counters()
+    tags_seen = 0
+
+    def scope_aliases(tags):
+        """ (tag_name, alias_for, raw description) of the alias tags of one scope"""
+        nonlocal tags_seen
+        aliases = []
+        with profiler.stage('l5x.tags'):
+            for tag_name in tags.names:
+                tags_seen += 1
+                try:
+                    tag = tags[tag_name]
+                    alias_source = getattr(tag, "alias_for", None)
+                    if not alias_source:
+                        continue
+                    aliases.append((tag_name, alias_source, getattr(tag, "description", "")))
+                except RuntimeError:
+                    # Often raised by invalid tag structures
+                    continue
+        return aliases
 
-    # --- Counters ---
-    total_points = parsed = skipped = mapped = 0
+    program_names = project.programs.names
+    if progress is not None:
+        progress.start('Processing programs', len(program_names) + 1)
 
     # =======================================================================
     # 1  Program tags
     # =======================================================================
-    for prog_name in project.programs.names:
+    for prog_name in program_names:
+        if progress is not None:
+            progress.check()
         program = project.programs[prog_name]
-
-        for tag_name in program.tags.names:
-            try:
-                tag = program.tags[tag_name]
-                alias_source = getattr(tag, "alias_for", None)
-                if not alias_source:
-                    continue
-
-                # Apply mapping substitution (if any)
-                alias = map_func(alias_source)
-                if alias != alias_source:
-                    mapped += 1
-
-                # Decode comment (convert possible Russian encoding issues)
-                description = RUS_comment_decoder(getattr(tag, "description", ""))
-
-                # Process alias tag
-                if ":" in alias:
-                    ok = process_alias_tag(
-                        f"{prog_name}/{tag_name}", alias, description, map_func, debug
-                    )
-                    parsed += int(ok)
-                    skipped += int(not ok)
-                    total_points += 1
-
-            except RuntimeError:
-                # Often raised by invalid tag structures
-                continue
+        process_aliases(scope_aliases(program.tags), map_func, counters, f"{prog_name}/", debug, model)
+        if progress is not None:
+            progress.advance(1)
 
     # =======================================================================
     # 2  Controller-level tags
     # =======================================================================
-    for tag_name in project.controller.tags.names:
+    if progress is not None:
+        progress.check()
+    process_aliases(scope_aliases(project.controller.tags), map_func, counters, '', debug, model)
+
+    # =======================================================================
+    # Summary
+    # =======================================================================
+    finish_parsing(model, counters, tags_seen, test_run)
+    return True
+
+
+class L5XAliasCollector(object):
+    """
+    expat handler which picks alias <Tag> elements out of the Controller
+    and Program <Tags> sections of an L5X file.
+
+    Only the element name stack and the currently open alias tag are kept,
+    so memory does not depend on the size of the project.
+    For every alias tag `on_alias(program, tag_name, alias_for, description)`
+    is called; `program` is None for controller scope tags.
+    """
+    chunk_size = 1 << 20
+
+    def __init__(self, on_alias):
+        self.on_alias = on_alias
+        self.lang = None  # CurrentLanguage of multi-language projects
+        self._stack = []
+        self._program = None
+        self._tags_scope = False  # inside Controller/Tags or Program/Tags
+        self._tag = None  # (name, alias_for) of the open alias tag
+        self._tag_depth = 0
+        self._descr = None  # Description text, None if there is none
+        self._cdata = None  # Description CDATA content
+        self._collect = False
+        self._in_cdata = False
+        self.tags_seen = 0  # <Tag> elements of the Tags sections, alias or not
+
+        self.parser = xml.parsers.expat.ParserCreate()
+        self.parser.buffer_text = True
+        self.parser.StartElementHandler = self._start
+        self.parser.EndElementHandler = self._end
+        self.parser.CharacterDataHandler = self._data
+        self.parser.StartCdataSectionHandler = self._cdata_start
+        self.parser.EndCdataSectionHandler = self._cdata_end
+
+    def parse_file(self, path, prescan=True, progress=None):
+        """
+        Parse an L5X file. With `prescan` only the Controller and Program
+        <Tags> sections found by `L5XPrescan` go through expat; files the
+        pre-scan does not understand are parsed in full.
+        `progress` (LoadProgress) advances by the bytes parsed and is checked
+        for cancellation after every chunk.
+        """
+        if prescan:
+            with profiler.stage('l5x.prescan'):
+                regions = L5XPrescan.scan(path)
+            if regions is not None:
+                with regions:
+                    if self.parse_regions(regions, progress=progress):
+                        return
+        with open(path, 'rb') as f:
+            if progress is not None:
+                progress.start('Reading L5X', os.fstat(f.fileno()).st_size)
+            while True:
+                chunk = f.read(self.chunk_size)
+                if not chunk:
+                    break
+                self.parser.Parse(chunk, False)
+                if progress is not None:
+                    progress.check()
+                    progress.advance(len(chunk))
+        self.parser.Parse(b'', True)
+
+    def parse_regions(self, regions, scopes=None, progress=None):
+        """
+        Parse the <Tags> sections of a pre-scanned file (`scopes`: program
+        names, None for the controller; all if not given). The aliases are
+        passed on only if the sections parse cleanly, otherwise nothing is
+        reported and False is returned.
+        """
+        found = []
+        collector = L5XAliasCollector(lambda *alias: found.append(alias))
+        if progress is not None:
+            progress.start('Reading L5X tags', regions.size(scopes))
         try:
-            tag = project.controller.tags[tag_name]
-            alias_source = getattr(tag, "alias_for", None)
-            if not alias_source:
+            for piece in regions.document(scopes):
+                collector.parser.Parse(piece, False)
+                if progress is not None:
+                    progress.check()
+                    progress.advance(len(piece))
+            collector.parser.Parse(b'', True)
+        except xml.parsers.expat.ExpatError as e:
+            log_l5x.debug("Pre-scanned sections do not parse (%s), reading the whole file", e)
+            return False
+        self.lang = collector.lang
+        self.tags_seen += collector.tags_seen
+        for alias in found:
+            self.on_alias(*alias)
+        return True
+
+    def _start(self, name, attrs):
+        stack = self._stack
+        parent = stack[-1] if stack else None
+        stack.append(name)
+
+        if self._tag is not None:
+            # inside an alias tag only its Description is of interest
+            depth = len(stack) - self._tag_depth
+            if depth == 1 and name == 'Description':
+                self._descr = ''
+                self._collect = self.lang is None
+            elif depth == 2 and parent == 'Description' and self.lang is not None:
+                self._collect = attrs.get('Lang') == self.lang
+            return
+
+        if name == 'Tag':
+            if self._tags_scope and parent == 'Tags':
+                self.tags_seen += 1
+                if 'AliasFor' in attrs:
+                    self._tag = (attrs.get('Name', ''), attrs['AliasFor'])
+                    self._tag_depth = len(stack)
+                    self._descr = self._cdata = None
+        elif name == 'Tags':
+            self._tags_scope = parent in ('Controller', 'Program')
+        elif name == 'Program' and parent == 'Programs':
+            self._program = attrs.get('Name', '')
+        elif name == 'RSLogix5000Content':
+            self.lang = attrs.get('CurrentLanguage')
+
+    def _end(self, name):
+        stack = self._stack
+        if self._tag is not None:
+            if len(stack) == self._tag_depth:
+                tag_name, alias_for = self._tag
+                self._tag = None
+                if self._cdata is not None:
+                    description = self._cdata
+                elif self._descr is not None:
+                    description = self._descr.strip()
+                else:
+                    description = None
+                self.on_alias(self._program, tag_name, alias_for, description)
+            else:
+                self._collect = False
+        elif name == 'Tags':
+            self._tags_scope = False
+        elif name == 'Program':
+            self._program = None
+        stack.pop()
+
+    def _data(self, text):
+        if self._collect:
+            if self._in_cdata:
+                self._cdata += text
+            else:
+                self._descr += text
+
+    def _cdata_start(self):
+        self._in_cdata = True
+        if self._collect and self._cdata is None:
+            self._cdata = ''
+
+    def _cdata_end(self):
+        self._in_cdata = False
+
+
+class L5XPrescan(object):
+    """
+    Byte-level map of the Controller and Program <Tags> sections of an L5X file.
+
+    The file is memory-mapped and the sections are found with plain byte
+    searches, skipping matches inside CDATA (rung text, descriptions).
+    `document()` then yields a small XML document made of the root,
+    Controller and Program start tags and these sections, as views of the
+    mapping, so routines, data types and modules never reach the XML parser.
+
+    `scan()` returns None for files it does not handle: non UTF-8 encodings,
+    comments or a DTD, or no Controller element.
+    """
+    _ENCODING = re.compile(rb'<\?xml[^>]*?encoding\s*=\s*["\']([A-Za-z0-9._-]+)["\']')
+    _NAME = re.compile(rb'\sName\s*=\s*"([^"]*)"')
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            self._file.close()
+            raise
+        self._view = memoryview(self._mm)
+        self.root_tag = b''
+        self.controller_tag = b''
+        self.controller = None  # (start, end) of the controller <Tags> element
+        self.programs = []  # (name, start tag, (start, end) of its <Tags> or None)
+
+    @classmethod
+    def scan(cls, path):
+        """ L5XPrescan of the file, or None if it has to be parsed in full"""
+        try:
+            regions = cls(path)
+        except (ValueError, OSError):
+            return None
+        reason = regions._scan()
+        if reason:
+            log_l5x.debug("Pre-scan not used for %s: %s", path, reason)
+            regions.close()
+            return None
+        return regions
+
+    def layout(self, scopes=None):
+        """ What the scan found about `scopes` (all by default) as plain values, see `from_layout`"""
+        controller = self.controller if scopes is None or None in scopes else None
+        programs = [p for p in self.programs if scopes is None or p[0] in scopes]
+        return self.root_tag, self.controller_tag, controller, programs
+
+    @classmethod
+    def from_layout(cls, path, layout):
+        """ Map a file again with the result of an earlier scan (parallel workers), without scanning it"""
+        regions = cls(path)
+        regions.root_tag, regions.controller_tag, regions.controller, regions.programs = layout
+        return regions
+
+    def close(self):
+        self._view.release()
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- scanning -----------------------------------------------------------------------------------------------------
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _start_tag(name):
+        return re.compile(b'<' + name + rb'(?=[\s/>])(?:[^>"\']|"[^"]*"|\'[^\']*\')*>')
+
+    def _in_cdata(self, pos, lo):
+        opened = self._mm.rfind(b'<![CDATA[', lo, pos)
+        return opened >= 0 and self._mm.rfind(b']]>', opened, pos) < 0
+
+    def _find_start(self, name, pos, end):
+        """ Start tag match of element `name` in [pos, end) outside CDATA, or None"""
+        mm = self._mm
+        pattern = self._start_tag(name)
+        lo = pos
+        while True:
+            i = mm.find(b'<' + name, pos, end)
+            if i < 0:
+                return None
+            if self._in_cdata(i, lo):
+                pos = mm.find(b']]>', i, end)
+                if pos < 0:
+                    return None
+                lo = pos  # known to be outside CDATA from here on
                 continue
+            match = pattern.match(mm, i, end)
+            if match:
+                return match
+            pos = lo = i + 1
+
+    def _find_end(self, name, pos, end):
+        """ Position just past the end tag of `name` in [pos, end) outside CDATA, or -1"""
+        mm = self._mm
+        closing = b'</' + name + b'>'
+        lo = pos
+        while True:
+            i = mm.find(closing, pos, end)
+            if i < 0 or not self._in_cdata(i, lo):
+                return i if i < 0 else i + len(closing)
+            pos = lo = mm.find(b']]>', i, end)
+            if pos < 0:
+                return -1
+
+    def _tags_region(self, pos, end):
+        tags = self._find_start(b'Tags', pos, end)
+        if tags is None or tags.group().endswith(b'/>'):
+            return None
+        tags_end = self._find_end(b'Tags', tags.end(), end)
+        if tags_end < 0:
+            raise ValueError('unterminated <Tags>')
+        return tags.start(), tags_end
+
+    def _scan(self):
+        mm = self._mm
+        size = len(mm)
+        head = mm[:512]
+        if head.startswith((b'\xff\xfe', b'\xfe\xff')):
+            return 'UTF-16 file'
+        declaration = self._ENCODING.search(head)
+        if declaration and declaration.group(1).lower() not in (b'utf-8', b'utf8'):
+            return f'encoding {declaration.group(1).decode("ascii")}'
+        if mm.find(b'<!--') >= 0 or mm.find(b'<!DOCTYPE') >= 0:
+            return 'comments or DTD'
+
+        root = self._find_start(b'RSLogix5000Content', 0, size)
+        controller = root and self._find_start(b'Controller', root.end(), size)
+        if controller is None:
+            return 'no Controller element'
+        self.root_tag = root.group()
+        self.controller_tag = controller.group()
 
-            alias = map_func(alias_source)
-            if alias != alias_source:
-                mapped += 1
+        try:
+            programs = self._find_start(b'Programs', controller.end(), size)
+            if programs is None:
+                controller_end = self._find_end(b'Controller', controller.end(), size)
+                self.controller = self._tags_region(controller.end(), controller_end if controller_end > 0 else size)
+                return None
+            self.controller = self._tags_region(controller.end(), programs.start())
+            if programs.group().endswith(b'/>'):
+                return None
+            programs_end = self._find_end(b'Programs', programs.end(), size)
+            if programs_end < 0:
+                return 'unterminated <Programs>'
+            pos = programs.end()
+            while True:
+                program = self._find_start(b'Program', pos, programs_end)
+                if program is None:
+                    break
+                name = self._NAME.search(program.group())
+                name = name.group(1).decode('utf-8') if name else ''
+                if '&' in name:
+                    import html
+                    name = html.unescape(name)
+                if program.group().endswith(b'/>'):
+                    self.programs.append((name, program.group(), None))
+                    pos = program.end()
+                    continue
+                program_end = self._find_end(b'Program', program.end(), programs_end)
+                if program_end < 0:
+                    return 'unterminated <Program>'
+                self.programs.append((name, program.group(), self._tags_region(program.end(), program_end)))
+                pos = program_end
+        except (ValueError, UnicodeDecodeError) as e:
+            return str(e)
+        return None
+
+    # --- output -------------------------------------------------------------------------------------------------------
+    def size(self, scopes=None):
+        """ Total length of the <Tags> sections of `scopes` (all by default), bytes"""
+        spans = [self.controller] if scopes is None or None in scopes else []
+        spans += [tags for name, _, tags in self.programs if scopes is None or name in scopes]
+        return sum(end - start for start, end in filter(None, spans))
+
+    def region(self, scope):
+        """ Bytes view of the <Tags> element of a program (None — controller), empty if there is none"""
+        if scope is None:
+            span = self.controller
+        else:
+            span = next((tags for name, _, tags in self.programs if name == scope), None)
+        return self._view[span[0]:span[1]] if span else self._view[0:0]
+
+    def document(self, scopes=None):
+        """ Pieces of an XML document holding the <Tags> sections of `scopes` (all by default)"""
+        chunk = L5XAliasCollector.chunk_size
+        view = self._view
+
+        def section(span):
+            for start in range(span[0], span[1], chunk):
+                yield view[start:min(start + chunk, span[1])]
+
+        yield b'<?xml version="1.0" encoding="UTF-8"?>'
+        yield self.root_tag
+        yield self.controller_tag
+        if self.controller and (scopes is None or None in scopes):
+            yield from section(self.controller)
+        yield b'<Programs>'
+        for name, start_tag, tags in self.programs:
+            if tags and (scopes is None or name in scopes):
+                yield start_tag
+                yield from section(tags)
+                yield b'</Program>'
+        yield b'</Programs></Controller></RSLogix5000Content>'
+
+
+@_debug_flag
+def read_input_l5x_stream(l5x_path, map_file_name=None, test_run=False, debug=False, model=None, progress=None):
+    """
+    Streaming variant of `read_input_l5x`.
 
-            description = RUS_comment_decoder(getattr(tag, "description", ""))
+    The L5X file is fed to expat in chunks and only alias <Tag> elements of
+    the Controller and Program scopes are looked at, instead of building the
+    whole l5x.Project DOM. Program tags are processed as they are read;
+    controller tags are processed after all programs, in the same order as
+    `read_input_l5x` does, so tag overrides give the same result.
 
-            if ":" in alias:
-                ok = process_alias_tag(tag_name, alias, description, map_func, debug)
-                parsed += int(ok)
-                skipped += int(not ok)
-                total_points += 1
+    Args (l5x_path, map_file_name, test_run, debug, model and the result as in `read_input_l5x`):
+        progress (LoadProgress | None): Progress (bytes parsed) and cancel token.
+    """
+    model = _model(model)
+    log_l5x.info("📘 Reading L5X XML file (streaming): %s", l5x_path)
 
-        except RuntimeError:
-            continue
+    # --- Load optional mapping file ---
+    map_func = load_map_func(map_file_name)
 
-    # =======================================================================
-    # Summary
-    # =======================================================================
-    print("\n📊 Parsing summary:")
-    print(f"  • Total alias tags processed: {total_points}")
-    print(f"  • ✅ Successfully parsed:     {parsed}")
-    print(f"  • ⚠️ Skipped (invalid fmt):   {skipped}")
-    print(f"  • 🔁 Mapped via map-file:     {mapped}")
+    counters = new_counters()
+    controller_aliases = []
 
-    if test_run:
-        print("🧪 Test run complete — no data structures modified.")
+    def on_alias(program, tag_name, alias_for, description):
+        if program is None:
+            controller_aliases.append((tag_name, alias_for, description))
+        else:
+            process_aliases([(tag_name, alias_for, description)], map_func, counters,
+                            f"{program}/", debug, model)
+
+    collector = L5XAliasCollector(on_alias)
+    try:
+        with profiler.stage('l5x.parse'):
+            collector.parse_file(l5x_path, progress=progress)
+    except (OSError, xml.parsers.expat.ExpatError) as e:
+        log_l5x.error("❌ Failed to read L5X project: %s", e)
+        return False
+
+    _process_scopes([('', controller_aliases)], map_func, counters, debug, model, progress)
+
+    finish_parsing(model, counters, collector.tags_seen, test_run)
+    return True
+
+
+class _RecordingModel(object):
+    """ Passes add_slot/put on to a model and records them, so that a result can be replayed"""
 
+    def __init__(self, model):
+        self.model = model
+        self.ops = []
 
-def process_alias_tag(tag_name, alias, description, map_func, debug=False):
-    """Parse IO alias address (supports RIO, FlexBus, and short formats)."""
-    global io_config, io_description
+    def add_slot(self, chassis, slot):
+        self.ops.append((chassis, slot))
+        self.model.add_slot(chassis, slot)
+
+    def put(self, chassis, slot, point, tag, description='', alias=''):
+        self.ops.append((chassis, slot, point, tag, description, alias))
+        return self.model.put(chassis, slot, point, tag, description, alias)
+
+
+class _NullModel(object):
+    """ Keeps nothing; parallel workers record what they would store and never see an overridden tag"""
+
+    def add_slot(self, chassis, slot):
+        pass
+
+    def put(self, chassis, slot, point, tag, description='', alias=''):
+        return None
+
+
+def _replay(ops, model):
+    """
+    Apply recorded add_slot/put calls to a model, reporting overridden tags like process_alias_tag.
+    Log records among the ops (parallel workers) are emitted in their place.
+    """
+    for op in ops:
+        if isinstance(op, logging.LogRecord):
+            logging.getLogger(op.name).handle(op)
+        elif len(op) == 2:
+            model.add_slot(*op)
+        else:
+            old = model.put(*op)
+            if old is not None and old.tag:
+                _chassis_logger(op[0]).warning("   Tag [%s] replaced by [%s]", old.tag, op[3])
+
+
+def _incremental_state_key(cache, l5x_path):
+    """ Cache key of the per-scope results of read_input_l5x_incremental for a project path"""
+    return cache.named_key('incremental', os.path.abspath(l5x_path))
+
+
+@_debug_flag
+def read_input_l5x_incremental(l5x_path, map_file_name=None, test_run=False, debug=False, model=None,
+                               cache=None, progress=None):
+    """
+    Incremental variant of `read_input_l5x_stream` for the edit–reload loop.
+
+    The alias tags of every Program (and of the Controller) are fingerprinted.
+    The parsed result of each scope is kept in the parse cache together with
+    its fingerprint; on the next load only scopes whose fingerprint changed
+    go through mapping, comment decoding and `process_alias_tag`, the others
+    are replayed from the stored result. Scopes are applied in the same
+    order as `read_input_l5x` (programs, then controller), so tag overrides
+    come out the same.
+
+    The fingerprint covers name, AliasFor and description of the alias tags,
+    which is everything in a <Tags> section that affects the IO table.
+    A changed map file or PARSER_VERSION invalidates all stored scopes.
+
+    Args (l5x_path, map_file_name, test_run, debug, model and the result as in `read_input_l5x`):
+        cache (ParseCache | None): Where per-scope results are kept, default cache directory if None.
+        progress (LoadProgress | None): Progress and cancel token, checked between scopes.
+    """
+    model = _model(model)
+    cache = ParseCache() if cache is None else cache
+    log_l5x.info("📘 Reading L5X XML file (incremental): %s", l5x_path)
+
+    # --- Collect alias tags per scope ---
+    scopes = {}  # program name (None — controller) → [(tag_name, alias_for, description)]
+
+    def on_alias(program, tag_name, alias_for, description):
+        scopes.setdefault(program, []).append((tag_name, alias_for, description))
+
+    collector = L5XAliasCollector(on_alias)
+    try:
+        with profiler.stage('l5x.parse'):
+            collector.parse_file(l5x_path, progress=progress)
+    except (OSError, xml.parsers.expat.ExpatError) as e:
+        log_l5x.error("❌ Failed to read L5X project: %s", e)
+        return False
+
+    # --- Results of the previous load ---
+    state_key = _incremental_state_key(cache, l5x_path)
+    map_digest = cache.digest(map_file_name) if map_file_name else None
+    with profiler.stage('cache.load'):
+        state = cache.load(state_key) or {}
+    if state.get('version') == PARSER_VERSION and state.get('map') == map_digest and not iogen_log.tracing():
+        previous = dict(state.get('scopes', []))
+    else:
+        previous = {}  # with per-tag traces (debug) every scope is processed, replayed ones would have none
+
+    map_func = None
+    counters = new_counters()
+    stored = {}
+    reused = 0
+    order = [name for name in scopes if name is not None] + ([None] if None in scopes else [])
+    if progress is not None:
+        progress.start('Processing alias tags', sum(len(aliases) for aliases in scopes.values()))
+    for name in order:
+        if progress is not None:
+            progress.check()
+        aliases = scopes[name]
+        fingerprint = hashlib.blake2b(repr(aliases).encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+        result = previous.get(name)
+        if result is not None and result['fingerprint'] == fingerprint:
+            with profiler.stage('incremental.replay'):
+                _replay(result['ops'], model)
+            reused += 1
+        else:
+            if map_func is None:
+                map_func = load_map_func(map_file_name)
+            recorder = _RecordingModel(model)
+            scope_counters = new_counters()
+            prefix = '' if name is None else f"{name}/"
+            process_aliases(aliases, map_func, scope_counters, prefix, debug, recorder)
+            result = {'fingerprint': fingerprint, 'ops': recorder.ops, 'counters': scope_counters}
+        stored[name] = result
+        if progress is not None:
+            progress.advance(len(aliases))
+
+    with profiler.stage('cache.store'):
+        cache.store(state_key, {'version': PARSER_VERSION, 'map': map_digest, 'scopes': list(stored.items())})
+
+    profiler.count('scopes reused', reused)
+    sum_counters(counters, (result['counters'] for result in stored.values()))
+    finish_parsing(model, counters, collector.tags_seen, test_run, reused_scopes=reused, scopes=len(stored))
+    return True
+
+
+def _parallel_scopes_job(l5x_path, map_func, scopes, layout, debug=False):
+    """
+    Worker of `read_input_l5x_parallel`: parse the <Tags> sections of `scopes`
+    (program names, None — controller) found by the pre-scan (`layout`) and
+    run them through process_aliases.
+
+    `map_func` is the map of the main process (see load_map_func), sent with
+    every job, so a worker never uses a map file that changed since.
+
+    Returns [(scope, ops, counters)] in the order of `scopes` plus the number of
+    tags seen, or None if the sections do not parse. `ops` are the recorded
+    add_slot/put calls with the log records between them (see _replay).
+    """
+    aliases = {scope: [] for scope in scopes}
+    collector = L5XAliasCollector(lambda program, *alias: aliases[program].append(alias))
+    try:
+        regions = L5XPrescan.from_layout(l5x_path, layout)
+    except (ValueError, OSError):
+        return None
+    with regions:
+        if not collector.parse_regions(regions, set(scopes)):
+            return None
+
+    results = []
+    for scope in scopes:
+        recorder = _RecordingModel(_NullModel())
+        counters = new_counters()
+        prefix = '' if scope is None else f"{scope}/"
+        with iogen_log.captured(recorder.ops):
+            process_aliases(aliases[scope], map_func, counters, prefix, debug, recorder)
+        results.append((scope, recorder.ops, counters))
+    return results, collector.tags_seen
+
+
+def _split_scopes(regions, parts):
+    """ Scopes of a pre-scanned file in document order (controller last), in up to `parts` runs of similar size"""
+    sizes = [(name, regions.size({name})) for name, _, _ in regions.programs] + [(None, regions.size({None}))]
+    target = max(sum(size for _, size in sizes) / max(parts, 1), 1)
+    chunks = [[]]
+    filled = 0
+    for name, size in sizes:
+        if chunks[-1] and filled + size > target:
+            chunks.append([])
+            filled = 0
+        chunks[-1].append(name)
+        filled += size
+    return chunks
+
+
+@_debug_flag
+def read_input_l5x_parallel(l5x_path, map_file_name=None, test_run=False, debug=False, model=None, jobs=None,
+                            progress=None):
+    """
+    Parallel variant of `read_input_l5x_stream` for projects with many programs.
+
+    The file is pre-scanned (L5XPrescan) and its Program <Tags> sections are
+    split into runs of similar size. Worker processes parse, map, decode and
+    classify the aliases of a run, recording the add_slot/put calls instead
+    of applying them. The runs are then replayed into the model in document
+    order, programs first and the controller last, so tag overrides ("Tag
+    [...] replaced by [...]") and the log come out as in a sequential load.
+
+    Files the pre-scan does not handle are read by `read_input_l5x_stream`.
+
+    Args (l5x_path, map_file_name, test_run, debug, model and the result as in `read_input_l5x`):
+        jobs (int | None): Worker processes, number of CPUs if None; 1 runs everything in this process.
+        progress (LoadProgress | None): Progress (runs done) and cancel token.
+    """
+    model = _model(model)
+    jobs = jobs or os.cpu_count() or 1
+    with profiler.stage('l5x.prescan'):
+        regions = L5XPrescan.scan(l5x_path)
+    if regions is None:
+        log_l5x.info("Pre-scan is not possible for this file, reading it sequentially")
+        return read_input_l5x_stream(l5x_path, map_file_name, test_run=test_run, debug=debug, model=model,
+                                     progress=progress)
+    with regions:
+        chunks = _split_scopes(regions, jobs * 4)
+        layouts = [regions.layout(set(scopes)) for scopes in chunks]
+    jobs = min(jobs, len(chunks))
+    log_l5x.info("📘 Reading L5X XML file (parallel, %d worker(s)): %s", jobs, l5x_path)
+
+    # --- Load optional mapping file (once, the workers get the parsed map) ---
+    map_func = load_map_func(map_file_name)
+
+    if progress is not None:
+        progress.start('Reading L5X programs', len(chunks))
+    results = [None] * len(chunks)
+    with profiler.stage('l5x.parallel'):
+        if jobs == 1:
+            for i, scopes in enumerate(chunks):
+                if progress is not None:
+                    progress.check()
+                results[i] = _parallel_scopes_job(l5x_path, map_func, scopes, layouts[i], debug)
+                if progress is not None:
+                    progress.advance(1)
+        else:
+            # worker logging as here, minus the JSON file: records are emitted once, by the replay
+            config = dict(iogen_log.current_config(), json_path=None)
+            with concurrent.futures.ProcessPoolExecutor(max_workers=jobs, initializer=iogen_log.reconfigure,
+                                                        initargs=(config if config.get('level') else None,)) as pool:
+                futures = {pool.submit(_parallel_scopes_job, l5x_path, map_func, scopes, layouts[i], debug): i
+                           for i, scopes in enumerate(chunks)}
+                try:
+                    for future in concurrent.futures.as_completed(futures):
+                        results[futures[future]] = future.result()
+                        if progress is not None:
+                            progress.check()
+                            progress.advance(1)
+                except BaseException:
+                    pool.shutdown(cancel_futures=True)
+                    raise
+
+    if any(result is None for result in results):
+        log_l5x.info("Pre-scanned sections do not parse, reading the file sequentially")
+        return read_input_l5x_stream(l5x_path, map_file_name, test_run=test_run, debug=debug, model=model,
+                                     progress=progress)
+
+    # --- Merge in document order ---
+    counters = new_counters()
+    tags_seen = 0
+    with profiler.stage('l5x.merge'):
+        for scope_results, chunk_tags in results:
+            tags_seen += chunk_tags
+            for _, ops, scope_counters in scope_results:
+                _replay(ops, model)
+                sum_counters(counters, [scope_counters])
+
+    finish_parsing(model, counters, tags_seen, test_run, workers=jobs, runs=len(chunks))
+    return True
+
+
+class AliasClassifier(object):
+    """
+    Recognizes the channel part of an IO alias (the text after the last ':').
+
+    Supported forms:
+      I.0 / O.15
+      I.Data.3 / O.Data.15
+      I.Ch14Data / O.Ch14Data
+      I.Ch[2].Data / O.Ch[2].Data
+      O.Data[1].0 / I.Data[3].15   ← FlexBus: [1] — слот, .0 — канал
+
+    Results are memoized per path: big projects repeat the same few hundred
+    paths (I.Data.0 .. I.Data.15 ...) for every chassis and slot.
+    """
+    IO, SERVICE, NON_IO = 0, 1, 2
+
+    def __init__(self, cache_size=4096):
+        # служебные поля отбрасываем до основного разбора
+        self._service = re.compile(r"Fault|Status|Cfg|Config", re.IGNORECASE)
+        self._channel = re.compile(r"""
+            ^[IO]\.?(
+                (?P<num1>\d{1,3})$                            | # I.0
+                [Dd]ata\.(?P<num2>\d{1,3})$                   | # I.Data.3
+                [Dd]ata\[(?P<flex>\d{1,3})\]\.(?P<num3>\d{1,3})$ | # O.Data[1].0  ← FlexBus
+                (?:Ch(?:annel)?\[?(?P<num4>\d{1,3})\]?(?:Data|\.[Dd]ata)?)$  # I.Ch14Data / I.Ch[2].Data
+            )
+        """, re.IGNORECASE | re.VERBOSE)
+        self.classify = functools.lru_cache(maxsize=cache_size)(self._classify)
+
+    def _classify(self, path: str):
+        """
+        Returns (kind, flex_slot, point).
+        flex_slot is None unless the path is a FlexBus Data[n].m address;
+        flex_slot and point are None unless kind is IO.
+        """
+        if self._service.search(path):
+            return self.SERVICE, None, None
+
+        match = self._channel.match(path)
+        if not match:
+            return self.NON_IO, None, None
+
+        if match.group("flex"):
+            return self.IO, int(match.group("flex")), int(match.group("num3"))
+
+        point = int(
+            match.group("num1") or
+            match.group("num2") or
+            match.group("num4")
+        )
+        return self.IO, None, point
+
+    def cache_info(self):
+        return self.classify.cache_info()
+
+
+alias_classifier = AliasClassifier()
+
+
+def process_alias_tag(tag_name, alias, description, map_func, debug=False, model=None, alias_source=None):
+    """
+    Parse IO alias address (supports RIO, FlexBus, and short formats).
+    `alias_source` is the AliasFor before mapping, kept in the point (`alias` if None).
+
+    Skipped tags are logged at DEBUG to `iogen.alias`, parsed ones to
+    `iogen.alias.<chassis>`; `debug` lowers `iogen.alias` to DEBUG for this call.
+    """
+    model = _model(model)
+    if debug and not log_alias.isEnabledFor(logging.DEBUG):
+        with iogen_log.verbose(True):
+            return process_alias_tag(tag_name, alias, description, map_func, False, model, alias_source)
 
     alias_mapped = map_func(alias)
     parts = alias_mapped.split(':')
@@ -327,66 +1661,40 @@ def process_alias_tag(tag_name, alias, description, map_func, debug=False):
         chass, slot_str, path = parts
         try:
             slot = int(slot_str)
-            append_chass(chass, slot)
+            model.add_slot(chass, slot)
         except ValueError:
-            if debug:
-                print(f"  ❌ Skipped [{tag_name}] — invalid slot number: {alias_mapped}")
+            if log_alias.isEnabledFor(logging.DEBUG):
+                log_alias.debug("  ❌ Skipped [%s] — invalid slot number: %s", tag_name, alias_mapped,
+                                extra={'tag': tag_name, 'alias': alias_mapped})
             return False
 
     # --- Вариант 2: короткий формат SD_Console:I.Data[0].0 ---
     elif len(parts) == 2:
         chass, path = parts
         slot = None  # определяем ниже из Data[...]
-        if debug:
-            print(f"  🟡 Detected short format [{alias_mapped}], slot будет определён из [{path}]")
+        if log_alias.isEnabledFor(logging.DEBUG):
+            log_alias.debug("  🟡 Detected short format [%s], slot будет определён из [%s]", alias_mapped, path,
+                            extra={'tag': tag_name, 'alias': alias_mapped})
 
     else:
-        if debug:
-            print(f"  ❌ Skipped [{tag_name}] — invalid alias format: {alias_mapped}")
+        if log_alias.isEnabledFor(logging.DEBUG):
+            log_alias.debug("  ❌ Skipped [%s] — invalid alias format: %s", tag_name, alias_mapped,
+                            extra={'tag': tag_name, 'alias': alias_mapped})
         return False
 
-    # --- Распознавание каналов и слотов (включая FlexBus) ---
-    # Поддерживаем:
-    #   I.0 / O.15
-    #   I.Data.3 / O.Data.15
-    #   I.Ch14Data / O.Ch14Data
-    #   I.Ch[2].Data / O.Ch[2].Data
-    #   O.Data[1].0 / I.Data[3].15   ← FlexBus: [1] — слот, .0 — канал
-
-    flex_slot = None
-    point = None
-
-    # шаблон для разных форматов
-    match = re.search(r"""
-        ^[IO]\.?(
-            (?P<num1>\d{1,3})$                            | # I.0
-            [Dd]ata\.(?P<num2>\d{1,3})$                   | # I.Data.3
-            [Dd]ata\[(?P<flex>\d{1,3})\]\.(?P<num3>\d{1,3})$ | # O.Data[1].0  ← FlexBus
-            (?:Ch(?:annel)?\[?(?P<num4>\d{1,3})\]?(?:Data|\.[Dd]ata)?)$  # I.Ch14Data / I.Ch[2].Data
-        )
-    """, path, re.IGNORECASE | re.VERBOSE)
+    # --- Распознавание каналов и слотов (включая FlexBus), см. AliasClassifier ---
+    kind, flex_slot, point = alias_classifier.classify(path)
 
-    if not match:
-        if debug:
-            print(f"  ⚠️  Skipped non-IO tag [{tag_name}] → {alias_mapped}")
+    if kind == AliasClassifier.SERVICE:
+        if log_alias.isEnabledFor(logging.DEBUG):
+            log_alias.debug("  🚫 Skipped service tag [%s] → %s", tag_name, alias_mapped,
+                            extra={'tag': tag_name, 'alias': alias_mapped})
         return False
 
-    if match.group("flex"):
-        flex_slot = int(match.group("flex"))
-        point = int(match.group("num3"))
-        append_chass(chass, flex_slot)
-
-    else:
-        point = int(
-            match.group("num1") or
-            match.group("num2") or
-            match.group("num4")
-        )
-
-    # 🚫 исключаем служебные поля
-    if re.search(r"(Fault|Status|Cfg|Config)", path, re.IGNORECASE):
-        if debug:
-            print(f"  🚫 Skipped service tag [{tag_name}] → {alias_mapped}")
+    if kind == AliasClassifier.NON_IO:
+        if log_alias.isEnabledFor(logging.DEBUG):
+            log_alias.debug("  ⚠️  Skipped non-IO tag [%s] → %s", tag_name, alias_mapped,
+                            extra={'tag': tag_name, 'alias': alias_mapped})
         return False
 
     # --- запоминаем ---
@@ -395,114 +1703,158 @@ def process_alias_tag(tag_name, alias, description, map_func, debug=False):
     else:
         key = slot
 
-    try:
-        if io_config[chass][key][point]:
-            print(f"   Tag [{io_config[chass][key][point]}] replaced by [{tag_name}]")
-    except KeyError:
-        pass
+    if key is None:
+        # короткий формат без Data[n] — номер слота взять неоткуда
+        if log_alias.isEnabledFor(logging.DEBUG):
+            log_alias.debug("  ❌ Skipped [%s] — no slot number in short format: %s", tag_name, alias_mapped,
+                            extra={'tag': tag_name, 'alias': alias_mapped})
+        return False
 
-    io_config[chass][key][point] = tag_name
-    io_description[chass][key][point] = description
+    old = model.put(chass, key, point, tag_name, description, alias if alias_source is None else alias_source)
+    if old is not None and old.tag:
+        _chassis_logger(chass).warning("   Tag [%s] replaced by [%s]", old.tag, tag_name,
+                                       extra={'tag': tag_name, 'replaced': old.tag})
 
-    if debug:
+    chassis_log = _chassis_logger(chass)
+    if chassis_log.isEnabledFor(logging.DEBUG):
         fs = f" FlexSlot={flex_slot}" if flex_slot is not None else ""
-        print(f"  ✅ Parsed [{tag_name}] → {chass}:{slot}:{point}{fs} ({path})")
+        chassis_log.debug("  ✅ Parsed [%s] → %s:%s:%s%s (%s)", tag_name, chass, slot, point, fs, path,
+                          extra={'tag': tag_name, 'chassis': chass, 'slot': key, 'point': point})
 
     return True
 
 
-def write_table(print_to_stdout=True):
-    global io_config
-    ms = f"""Created {datetime.datetime.now().isoformat()}
+def _print_lines(lines, out=None):
+    """ print() for a generator of text: writes it piece by piece and ends with a newline"""
+    out = sys.stdout if out is None else out
+    with profiler.stage('render_text'):
+        for line in lines:
+            out.write(line)
+        out.write('\n')
+
+
+def iter_table(model=None):
+    """ Yields the wide box-drawing table (slots 0..9) row by row"""
+    model = _model(model)
+    yield f"""Created {datetime.datetime.now().isoformat()}
 """
-    project_chass = list(io_config.keys())
-    project_chass.sort()
-    # ic(project_chass)
-    for CHASSI in project_chass:
+    for CHASSI in model.chassis():
         cn = f'CHASSIS {CHASSI}'
-        ms += f"""
+        yield f"""
 
 {cn: ^125} 
 ╒══╤═════════════════╤═════════════════╤═════════════════╤═════════════════╤═════════════════╤═════════════════╤═════════════════╤═════════════════╤═════════════════╤═════════════════╕
 │ch│      SLOT 0     │      SLOT 1     │      SLOT 2     │      SLOT 3     │      SLOT 4     │      SLOT 5     │      SLOT 6     │      SLOT 7     │      SLOT 8     │      SLOT 9     │ 
 ├──┼─────────────────┼─────────────────┼─────────────────┼─────────────────┼─────────────────┼─────────────────┼─────────────────┼─────────────────┼─────────────────┼─────────────────┤"""
+        slots = [model.slot_points(CHASSI, SLOT) for SLOT in range(0, 10)]
         for CHANNEL in range(16):
-            ms += f"""
-│{CHANNEL:02}│"""
-            for SLOT in range(0, 10):
-                try:
-                    tag = io_config[CHASSI][SLOT][CHANNEL]
-                    tag = tag2kip(tag)
-                except KeyError:
-                    tag = ''
-                ms += f"{tag: >17}│"
-        ms += '''
+            row = [f"""
+│{CHANNEL:02}│"""]
+            for points in slots:
+                point = points.get(CHANNEL)
+                tag = '' if point is None else tag2kip(point.tag)
+                row.append(f"{tag: >17}│")
+            yield ''.join(row)
+        yield '''
 └──┴─────────────────┴─────────────────┴─────────────────┴─────────────────┴─────────────────┴─────────────────┴─────────────────┴─────────────────┴─────────────────┴─────────────────┘
 '''
+
+
+def write_table(print_to_stdout=True, model=None, out=None):
+    """
+    Wide table of slots 0..9 of every chassis.
+    Streams it to `out` (stdout by default) when print_to_stdout is set,
+    otherwise returns it as one string (GUI preview).
+    """
     if print_to_stdout:
-        print(ms)
-    return ms
+        _print_lines(iter_table(model), out)
+        return None
+    with profiler.stage('render_text'):
+        return ''.join(iter_table(model))
 
 
-def write_table_compact():
-    global io_config
-    global io_description
-    project_chass = list(io_config.keys())
-    project_chass.sort()
-    # ic(project_chass)
-    ms = f"""Created {datetime.datetime.now().isoformat()}
+def iter_table_compact(model=None):
+    """ Yields the compact per-slot table row by row"""
+    model = _model(model)
+    yield f"""Created {datetime.datetime.now().isoformat()}
 """
-    for CHASSI in project_chass:
+    for CHASSI in model.chassis():
         cn = f'CHASSIS {CHASSI}'
-        ms += f"""
+        yield f"""
 
 {cn:=^22}
 """
-        slot_list = list(io_config[CHASSI].keys())
-        slot_list.sort()
-        for SLOT in io_config[CHASSI].keys():
-            ms += f"""
+        for SLOT in model.slots(CHASSI):
+            yield f"""
 ╒══╤═════════════════╕
 │ch│     SLOT {SLOT:02}     │
 ├──┼─────────────────┤"""
-            for CHANNEL in io_config[CHASSI][SLOT].keys():
-                tag = io_config[CHASSI][SLOT][CHANNEL]
-                descr = io_description.get(CHASSI, {}).get(SLOT, {}).get(CHANNEL, '')
-                ms += f"""
-│{CHANNEL:02}│{tag: >17}│ {descr}"""
-            ms += f'''
+            for p in model.points(CHASSI, SLOT):
+                yield f"""
+│{p.point:02}│{p.tag: >17}│ {p.description}"""
+            yield f'''
 └──┴─────────────────┘'''
-    print(ms)
 
 
-def write_csv_cspt(sep=','):
+def write_table_compact(model=None, out=None):
+    _print_lines(iter_table_compact(model), out)
+
+
+def iter_find(queries, model=None, limit=50):
+    """ Yields, for every query, the points IOIndex.find gives: address, tag and description"""
+    index = IOIndex(model)
+    for query in queries:
+        points = index.find(query)
+        yield f"\n🔎 {query}: {len(points)} point(s)"
+        for p in points[:limit]:
+            description = p.description.replace('\n', ' ')
+            kip = tag2kip(p.tag.rpartition('/')[2])
+            yield f"\n  {p.chassis}:{p.slot}:{p.point:02}  {kip:<12} {p.tag:<24} {description}"
+        if len(points) > limit:
+            yield f"\n  … {len(points) - limit} more"
+
+
+def write_find(queries, model=None, out=None, limit=50):
+    _print_lines(iter_find(queries, model, limit), out)
+
+
+def iter_csv_cspt(sep=',', model=None):
+    """ Yields Chassis, Slot, Point, Tagname rows"""
+    model = _model(model)
+    yield f"""Created {datetime.datetime.now().isoformat()}
+Chassis{sep}Slot{sep}Point,Tagname
+"""
+    for CHASSI in model.chassis():
+        for SLOT in model.slots(CHASSI):
+            for p in model.points(CHASSI, SLOT):
+                yield f"""
+{CHASSI}{sep}{SLOT}{sep}{p.point},{tag2kip(p.tag)}"""
+
+
+def write_csv_cspt(sep=',', model=None, out=None):
     """
     write datas in csv format
     Chassis, Slot, Point, Tagname
     :return:
     """
-    global io_config
-    project_chass = list(io_config.keys())
-    project_chass.sort()
-    # ic(project_chass)
-    ms = f"""Created {datetime.datetime.now().isoformat()}
-Chassis{sep}Slot{sep}Point,Tagname
-"""
-    for CHASSI in project_chass:
-        slot_list = list(io_config[CHASSI].keys())
-        slot_list.sort()
-        for SLOT in io_config[CHASSI].keys():
-            for CHANNEL in io_config[CHASSI][SLOT].keys():
-                tag = io_config[CHASSI][SLOT][CHANNEL]
-                ms += f"""
-{CHASSI}{sep}{SLOT}{sep}{CHANNEL},{tag2kip(io_config[CHASSI][SLOT][CHANNEL])}"""
-    print(ms)
-
-
-def write_xlsx(out_file_name):
-    global io_config
-    print(f'xlsx writer selected. filename = {out_file_name}')
-    workbook = xlsxwriter.Workbook(out_file_name)
+    _print_lines(iter_csv_cspt(sep, model), out)
+
+
+@profiler.timed('write_xlsx')
+def write_xlsx(out_file_name, model=None, constant_memory=False):
+    """
+    Write the IO table to an XLSX workbook: one block of 13 slots per chassis.
+
+    Cells are written strictly row by row, so with constant_memory=True
+    xlsxwriter flushes every finished row to disk instead of keeping the
+    whole sheet in memory. Strings are then stored inline; cell comments
+    are kept apart from the rows by xlsxwriter and work in both modes.
+    """
+    import xlsxwriter
+
+    model = _model(model)
+    log.info('xlsx writer selected. filename = %s', out_file_name)
+    workbook = xlsxwriter.Workbook(out_file_name, {'constant_memory': constant_memory})
     if True:
         # Add a formats.
         bold = workbook.add_format({'bold': True})
@@ -537,90 +1889,277 @@ def write_xlsx(out_file_name):
     # ==================================================================================================================
     row = 3
 
-    project_chass = list(io_config.keys())
-    project_chass.sort()
+    project_chass = model.chassis()
+    slot_numbers = range(13)
 
     def col_number(slot_number):
         return slot_number * 4 + 3
 
-    def write_slot(_col, _row, slot_num, slot_data, descr_data={}):
-        worksheet.write_string(_row, _col + 1, f'SLOT', slot_number_format)
-        worksheet.write_number(_row, _col + 2, slot_num, slot_number_format)
-        worksheet.write_blank(_row, _col + 3, '', slot_number_format)
-
-        worksheet.write_blank(_row + 1, _col + 1, f'SLOT', slot_number_format)
-        worksheet.write_blank(_row + 1, _col + 2, slot_num, slot_number_format)
-        worksheet.write_blank(_row + 1, _col + 3, '', slot_number_format)
-
-        worksheet.write_blank(_row, _col, '', ch_number_format)
-        worksheet.write_blank(_row + 1, _col, '', ch_number_format)
-
-        if len(slot_data.keys()) == 0:
-            max_channel = 15
-        else:
-            max_channel = max(slot_data.keys())
-
-        if max_channel <= 15:
-            max_channel = 15
-        else:
-            max_channel = 31
-
-        for Y in range(max_channel + 1):
-
-            worksheet.write_number(_row + Y + 2, _col, Y, ch_number_format)
-            tag = slot_data.get(Y, '')
-            descr = descr_data.get(Y, '')
-            worksheet.write_string(_row + Y + 2, _col + 1, tag2kip(tag), content_format)
-            if descr:
-                worksheet.write_comment(_row + Y + 2, _col + 1, descr.replace('$N', '\r'))
+    def slot_size(slot_data):
+        # 16 or 32 channels
+        if len(slot_data.keys()) == 0 or max(slot_data.keys()) <= 15:
+            return 15
+        return 31
 
-        worksheet.set_column(_col, _col, width=2.30)
-        worksheet.set_column(_col + 1, _col + 1, width=23)
+    if project_chass:
+        for slot_num in slot_numbers:
+            _col = col_number(slot_num)
+            worksheet.set_column(_col, _col, width=2.30)
+            worksheet.set_column(_col + 1, _col + 1, width=23)
 
-        return max_channel
-
-    # ic(project_chass)
     for CHASSI in project_chass:
         row += 2
         worksheet.write_string(row, 0, f'CHASSIS')
         worksheet.write_string(row, 1, CHASSI, bold)
         row += 1
-        size = 0
-        for slot_num in range(13):  # slot numbers
-            size = max(
-                size,
-                write_slot(col_number(slot_num),
-                           row,
-                           slot_num,
-                           io_config[CHASSI].get(slot_num, {}),
-                           io_description[CHASSI].get(slot_num, {})
-                           )
-            )
-            # worksheet.write_number(row, col_number(slot_num+1), slot_num, slot_number_format)
-            # worksheet.write_blank(row, col_number(slot_num), '', slot_number_format)  # left to slot number
-            # worksheet.set_column(col_number(slot_num), col_number(slot_num), width=2.30)
-            # worksheet.write_blank(row, col_number(slot_num) + 1, '', slot_number_format)  # right to slot number
-            # worksheet.write_blank(row, col_number(slot_num) + 2, '', slot_number_format)  # right to slot number
-            # worksheet.write_blank(row, col_number(slot_num) + 3, '', slot_number_format)  # right to slot number
+
+        # row buffer: all 13 slots of the chassis, written across each row
+        slots = [(col_number(slot_num), slot_num, model.slot_points(CHASSI, slot_num))
+                 for slot_num in slot_numbers]
+        sizes = [slot_size(slot_data) for _, _, slot_data in slots]
+        size = max(sizes)
+
+        for _col, slot_num, _ in slots:
+            worksheet.write_blank(row, _col, '', ch_number_format)
+            worksheet.write_string(row, _col + 1, f'SLOT', slot_number_format)
+            worksheet.write_number(row, _col + 2, slot_num, slot_number_format)
+            worksheet.write_blank(row, _col + 3, '', slot_number_format)
+        for _col, slot_num, _ in slots:
+            worksheet.write_blank(row + 1, _col, '', ch_number_format)
+            worksheet.write_blank(row + 1, _col + 1, f'SLOT', slot_number_format)
+            worksheet.write_blank(row + 1, _col + 2, slot_num, slot_number_format)
+            worksheet.write_blank(row + 1, _col + 3, '', slot_number_format)
+
+        for Y in range(size + 1):
+            for (_col, _, slot_data), max_channel in zip(slots, sizes):
+                if Y > max_channel:
+                    continue
+                worksheet.write_number(row + Y + 2, _col, Y, ch_number_format)
+                point = slot_data.get(Y)
+                tag = point.tag if point else ''
+                descr = point.description if point else ''
+                worksheet.write_string(row + Y + 2, _col + 1, tag2kip(tag), content_format)
+                if descr:
+                    worksheet.write_comment(row + Y + 2, _col + 1, descr.replace('$N', '\r'))
 
         row += size + 2
-    #     for CHANNEL in range(16):
-    #         worksheet.write_number(row, 1, CHANNEL, ch_number_format)  # channel number
-    #         for SLOT in range(0, 10):
-    #             col = col_number(SLOT)
-    #             try:
-    #                 tag = io_config[CHASSI][SLOT][CHANNEL]
-    #                 tag = tag2kip(tag)
-    #             except KeyError:
-    #                 tag = ''
-    #             worksheet.write_string(row, col, tag, content_format)
-    #             worksheet.write_blank(row, col + 1, '', right_to_content)
-    #
-    #         row += 1
-    # # ==================================================================================================================
 
     workbook.read_only_recommended()
-    workbook.close()
+    with profiler.stage('xlsx.close'):
+        workbook.close()
+
+
+INPUT_FORMATS = ('l5x', 'csv', 'csv_old')
+_CSV_RECORD = re.compile(r'"?(remark|TYPE|ALIAS|TAG|COMMENT|RCOMMENT)"?([,?])')
+
+
+def detect_format(input_file, old_csv_version=False, head_size=1 << 16):
+    """
+    Format of an export by its content: 'l5x' (XML), 'csv' (',' separated tag
+    export) or 'csv_old' ('?' separated, old RSLogix).
+
+    The first `head_size` bytes are looked at; the file extension (and
+    `old_csv_version` for .csv) is used only when the content says nothing.
+    Raises ValueError for files which are neither.
+    """
+    with open(input_file, 'rb') as f:
+        head = f.read(head_size)
+    if head.startswith((b'\xff\xfe', b'\xfe\xff')):
+        head = head.decode('utf-16', errors='ignore').encode('utf-8')
+    if head.startswith(b'\xef\xbb\xbf'):
+        head = head[3:]
+    head = head.lstrip()
+    if head.startswith(b'<'):
+        return 'l5x'
+    # the header and the records tell the separator, remark lines only if nothing else does
+    records = [m.groups() for m in map(_CSV_RECORD.match, head.decode('latin-1').splitlines()[:50]) if m]
+    records.sort(key=lambda record: record[0] == 'remark')
+    if records:
+        return 'csv' if records[0][1] == ',' else 'csv_old'
+    ext = Path(input_file).suffix.lower()
+    if ext == '.l5x':
+        return 'l5x'
+    if ext == '.csv':
+        return 'csv_old' if old_csv_version else 'csv'
+    raise ValueError(f"Unsupported file type: {input_file} (neither L5X XML nor a CSV tag export)")
+
+
+@profiler.timed('read_input')
+def read_input(input_file, map_file_name=None, old_csv_version=False, stream=False,
+               test_run=False, debug=False, model=None, cache=None, incremental=False, progress=None,
+               input_format=None, parallel=False, jobs=None):
+    """
+    Read a CSV or L5X export into the model. The reader is chosen by
+    `input_format` ('l5x', 'csv', 'csv_old'), detected from the file content
+    if None (see detect_format; `old_csv_version` is then only a fallback).
+
+    With a ParseCache the parsed table is looked up by the content of the
+    input and map files first; on a miss the file is parsed and stored
+    together with the warnings logged meanwhile, which a hit logs again.
+    With per-tag traces (`debug`, DEBUG level of `iogen.alias`) the lookup is skipped.
+    `incremental` (L5X, needs a cache) re-processes only changed Programs on a miss,
+    and bypasses the lookup while it has no per-Program results of the project yet;
+    `parallel` (L5X) reads the programs in `jobs` worker processes.
+    With a `progress` (LoadProgress) the file is parsed into a new model which
+    is merged only when the reader is done, so a cancelled load (LoadCancelled)
+    leaves `model` as it was.
+    Returns False if the reader could not load the file.
+    """
+    if input_format is None:
+        input_format = detect_format(input_file, old_csv_version)
+    if input_format not in INPUT_FORMATS:
+        raise ValueError(f"Unsupported input format: {input_format}")
+    old_csv_version = input_format == 'csv_old'
+    if input_format != 'l5x':
+        def reader(target):
+            return read_input_csv(input_file, map_file_name, old_csv_version=old_csv_version, debug=debug,
+                                  model=target, progress=progress)
+    elif incremental and cache is not None:
+        if parallel:
+            log.warning("⚠️  Parallel reading ignored: incremental loading (--incremental, --watch) is used")
+        def reader(target):
+            return read_input_l5x_incremental(input_file, map_file_name=map_file_name, test_run=test_run,
+                                              debug=debug, model=target, cache=cache, progress=progress)
+    elif parallel:
+        if stream:
+            log.warning("⚠️  Stream reading ignored: the parallel reader is used (its fallback is the stream one)")
+        def reader(target):
+            return read_input_l5x_parallel(input_file, map_file_name=map_file_name, test_run=test_run,
+                                           debug=debug, model=target, jobs=jobs, progress=progress)
+    else:
+        def reader(target):
+            read = read_input_l5x_stream if stream else read_input_l5x
+            return read(input_file, map_file_name=map_file_name, test_run=test_run, debug=debug, model=target,
+                        progress=progress)
+
+    model = _model(model)
+    if cache is None and progress is None:
+        return reader(model)
+
+    if cache is not None:
+        with profiler.stage('cache.load'):
+            key = cache.key(input_file, map_file_name, PARSER_VERSION, input_format)
+            if debug or iogen_log.tracing():
+                table = None  # per-tag DEBUG traces come only from parsing
+            elif input_format == 'l5x' and incremental and _incremental_state_key(cache, input_file) not in cache:
+                # the incremental reader needs its per-scope results of this project; until they exist
+                # (e.g. --watch started on an export cached by a plain run) the file goes through the reader
+                table = None
+            else:
+                table = cache.load(key)
+        if table is not None:
+            profiler.count('cache hits')
+            model.load_columns(table)
+            # the warnings of the parse ("Tag [...] replaced by [...]") are part of the result
+            for name, level, message in table.get('warnings', ()):
+                logging.getLogger(name).log(level, message)
+            log.info("⚡ Loaded from cache: %d points [%s]", len(table['tag']), input_file)
+            return True
+        profiler.count('cache misses')
+
+    parsed = IOModel()
+    with iogen_log.recorded() as warnings:
+        ok = reader(parsed)
+    if ok and cache is not None:
+        with profiler.stage('cache.store'):
+            table = parsed.dump_columns()
+            table['warnings'] = [(r.name, r.levelno, r.getMessage()) for r in warnings]
+            cache.store(key, table)
+    model.merge(parsed)
+    return ok
+
+
+def preload():
+    """ Import the lazily loaded libraries now (the GUI does it in the background after start)"""
+    for name in LAZY_MODULES:
+        try:
+            __import__(name)
+        except ImportError:
+            pass
+
+
+def expand_inputs(patterns):
+    """ Expand glob patterns into a list of files, keeping order and dropping duplicates"""
+    files = {}
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        for name in matches:
+            files.setdefault(os.path.normpath(name), None)
+    return list(files)
+
+
+def batch_job(input_file, map_file_name=None, old_csv_version=False, stream=False,
+              write_xls=True, constant_memory=False, cache_dir=None, use_cache=True):
+    """
+    One file of a batch run, executed in a worker process.
+    Parses into its own IOModel, writes <input>.xlsx and returns a summary dict.
+    """
+    model = IOModel()
+    result = {'file': input_file, 'status': 'ok', 'error': '',
+              'points': 0, 'chassis': 0, 'parse': 0.0, 'write': 0.0}
+    started = time.perf_counter()
+    with iogen_log.captured() as records, contextlib.redirect_stdout(io.StringIO()):
+        try:
+            loaded = read_input(input_file, map_file_name, old_csv_version=old_csv_version,
+                                stream=stream, model=model,
+                                cache=ParseCache(cache_dir) if use_cache else None)
+            parsed = time.perf_counter()
+            result['parse'] = parsed - started
+            if not loaded:
+                result['status'] = 'error'
+                errors = [r.getMessage() for r in records if r.levelno >= logging.ERROR]
+                result['error'] = errors[-1] if errors else 'not loaded'
+            elif write_xls:
+                write_xlsx(Path(input_file).with_suffix('.xlsx'), model=model, constant_memory=constant_memory)
+                result['write'] = time.perf_counter() - parsed
+        except Exception as e:
+            result['status'] = 'error'
+            result['error'] = f'{type(e).__name__}: {e}'
+    result['points'] = len(model)
+    result['chassis'] = len(model.chassis())
+    return result
+
+
+def run_batch(input_files, map_file_name=None, jobs=None, **options):
+    """
+    Process many inputs in a process pool (one worker per core by default),
+    print a line per finished file and a summary table at the end.
+    Returns the list of per-file results in input order.
+    """
+    started = time.perf_counter()
+    results = {}
+    print(f'Batch: {len(input_files)} file(s), {jobs or os.cpu_count()} worker(s)')
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs, initializer=iogen_log.reconfigure,
+                                                initargs=(iogen_log.current_config(),)) as pool:
+        futures = {pool.submit(batch_job, f, map_file_name, **options): f for f in input_files}
+        for future in concurrent.futures.as_completed(futures):
+            input_file = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:  # worker process died
+                result = {'file': input_file, 'status': 'error', 'error': f'{type(e).__name__}: {e}',
+                          'points': 0, 'chassis': 0, 'parse': 0.0, 'write': 0.0}
+            results[input_file] = result
+            print(f"  {'✅' if result['status'] == 'ok' else '❌'} {input_file}")
+    ordered = [results[f] for f in input_files]
+    print_batch_summary(ordered, time.perf_counter() - started)
+    return ordered
+
+
+def print_batch_summary(results, wall_time):
+    name_width = max([len('File')] + [len(r['file']) for r in results])
+    print()
+    print(f"{'File':<{name_width}}  {'Chassis':>7}  {'Points':>7}  {'Parse,s':>8}  {'XLSX,s':>8}  Status")
+    print('-' * (name_width + 50))
+    for r in results:
+        status = r['status'] if not r['error'] else f"{r['status']}: {r['error']}"
+        print(f"{r['file']:<{name_width}}  {r['chassis']:>7}  {r['points']:>7}  "
+              f"{r['parse']:>8.2f}  {r['write']:>8.2f}  {status}")
+    print('-' * (name_width + 50))
+    busy = sum(r['parse'] + r['write'] for r in results)
+    failed = sum(r['status'] != 'ok' for r in results)
+    print(f"{len(results)} file(s), {failed} failed, "
+          f"{sum(r['points'] for r in results)} points; wall {wall_time:.2f} s, worker time {busy:.2f} s")
 
 
 # Press the green button in the gutter to run the script.
@@ -634,24 +2173,98 @@ if __name__ == '__main__':
     parser.add_argument('--debug', action='store_true', help="Show detailed tag parsing log")
     parser.add_argument('--old', action='store_true', help="CSV was generated by old version of RSLogix")
     parser.add_argument('--noxls', action='store_true', help="Do not write XLSX file")
+    parser.add_argument('--constant_memory', action='store_true',
+                        help="Write XLSX row by row with flushing, to keep memory low on big projects")
     parser.add_argument('--test_run', action='store_true', help="Run test")
+    parser.add_argument('--stream', action='store_true',
+                        help="Read L5X incrementally, without loading the whole project into memory")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Re-process only the L5X programs changed since the previous run (uses the parse cache)")
     parser.add_argument('--print', action='store_true', help="Print table to stdout")
     parser.add_argument('--print_compact', action='store_true', help="Print compact table to stdout")
+    parser.add_argument('--find', nargs='+', metavar='QUERY',
+                        help="Show where tags are wired: tag name, KIP name (PT-1024), part of a tag name "
+                             "or of a description")
     parser.add_argument('--version-info', action='store_true',
                         help="Show versions of xlsxwriter and l5x libraries")
+    parser.add_argument('--batch', nargs='*', metavar='INPUT',
+                        help="Batch mode: process input_file and the given files in parallel. "
+                             "Glob patterns are expanded (quote them), e.g. --batch 'projects/*.L5X'")
+    parser.add_argument('--parallel', action='store_true',
+                        help="Read the programs of an L5X project in parallel worker processes (see --jobs)")
+    parser.add_argument('--jobs', type=int, default=None,
+                        help="Number of worker processes for --batch and --parallel (default: number of CPUs)")
+    parser.add_argument('--cache-dir', default=None,
+                        help="Directory for cached parse results (default: per-user cache directory)")
+    parser.add_argument('--no-cache', action='store_true', help="Always parse the input, do not use the parse cache")
+    parser.add_argument('--store', metavar='DB',
+                        help="Archive the parsed points in an SQLite point store (see iogen_store.py)")
+    parser.add_argument('--project', help="Project name in --store (default: input file name without extension)")
+    parser.add_argument('--watch', action='store_true',
+                        help="Keep running: re-read the input and write the outputs again whenever the input "
+                             "or map file changes (L5X programs are re-processed incrementally)")
+    parser.add_argument('--watch-debounce', type=float, default=1.0, metavar='SECONDS',
+                        help="Quiet time after the last write before --watch regenerates (default: 1.0)")
+    parser.add_argument('--watch-poll', action='store_true',
+                        help="Poll file size and mtime instead of using inotify (e.g. on network shares)")
+    parser.add_argument('--revision', help="Revision name in --store (default: modification time of the input)")
+    parser.add_argument('--log-level', action='append', metavar='[COMPONENT=]LEVEL',
+                        help="Log level, overall (INFO) or per component (map=DEBUG, l5x=WARNING); repeatable")
+    parser.add_argument('--log-json', metavar='FILE', help="Also write the log as JSON lines to FILE")
+    parser.add_argument('--profile', action='store_true', help="Print stage timings and counters at the end of the run")
+    parser.add_argument('--cprofile', nargs='+', metavar='STAGE',
+                        help="Run these stages under cProfile ('*' for all, e.g. l5x.project, write_xlsx); "
+                             "implies --profile")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="Record peak memory of every stage with tracemalloc (slow); implies --profile")
+    parser.add_argument('--debug-chassis', nargs='+', default=(), metavar='CHASSIS',
+                        help="Log every parsed tag of these chassis (like --debug, for selected chassis only)")
+    parser.add_argument('--startup-profile', action='store_true',
+                        help="Report import times of this module and of the libraries it loads on first use, then exit")
 
     args = parser.parse_args()
 
+    try:
+        log_levels = iogen_log.parse_levels(args.log_level)
+    except ValueError as e:
+        parser.error(str(e))
+    iogen_log.configure_logging(level=log_levels.pop('iogen', 'INFO'), levels=log_levels,
+                                json_path=args.log_json, debug_chassis=args.debug_chassis)
+    if args.profile or args.cprofile or args.trace_memory:
+        profiler.enable(cprofile_stages=args.cprofile or (), trace_memory=args.trace_memory)
+
     # если пользователь вызвал --version-info, просто выводим версии и выходим
     if args.version_info:
+        import xlsxwriter
+        import l5x
         print("Library versions:")
         print(f"  xlsxwriter: {getattr(xlsxwriter, '__version__', 'unknown')}")
         print(f"  l5x:        {getattr(l5x, '__version__', 'unknown')}")
         raise SystemExit(0)
 
+    # время импорта модуля и отложенно загружаемых библиотек, в отдельном интерпретаторе
+    if args.startup_profile:
+        print("⏱ Startup (import) profile:")
+        print(import_report(['IO_Table_generator', *LAZY_MODULES]))
+        raise SystemExit(0)
+
     if args.test_run:
         print("Running tests")
 
+    # ---- Пакетная обработка ----
+    if args.batch is not None:
+        if args.map is not None and not Path(args.map).is_file():
+            print('No mapping file!')
+            raise SystemExit(1)
+        batch_inputs = expand_inputs(([args.input_file] if args.input_file else []) + args.batch)
+        if not batch_inputs:
+            parser.error("no input files for --batch")
+        batch_results = run_batch(batch_inputs, args.map, jobs=args.jobs,
+                                  old_csv_version=args.old, stream=args.stream,
+                                  write_xls=not args.noxls, constant_memory=args.constant_memory,
+                                  cache_dir=args.cache_dir, use_cache=not args.no_cache)
+        raise SystemExit(0 if all(r['status'] == 'ok' for r in batch_results) else 1)
+
     # ---- Проверка наличия входного файла ----
     if not args.input_file:
         parser.error("the following arguments are required: input_file")
@@ -670,33 +2283,85 @@ if __name__ == '__main__':
         pass
         # print(f'{args.map} mapping will be used')
 
-    # ---- Обработка по типу файла ----
-    ext = input_path.suffix.lower()
-    if ext == '.csv':
-        print("Detected CSV input file.")
-        if args.map is None:
-            print('No mapping will be used')
-        elif not Path(args.map).is_file():
-            print('No mapping file!')
-            raise SystemExit(1)
-        read_input_csv(args.input_file, args.map, old_csv_version=args.old)
+    parse_cache = None if args.no_cache else ParseCache(args.cache_dir)
 
-    elif ext == '.l5x':
-        print("Detected L5X input file.")
-        read_input_l5x(args.input_file, map_file_name=args.map, test_run=args.test_run, debug=args.debug)
+    # в режиме --watch программы L5X перечитываются инкрементально (нужен кэш разбора)
+    incremental_load = args.incremental or (args.watch and parse_cache is not None)
 
-    else:
-        print(f"Unsupported file type: {ext}")
+    def load_and_write():
+        """ Чтение входного файла и все выходные файлы; в режиме --watch повторяется при каждом изменении"""
+        # ---- Обработка по типу файла (по содержимому, не по расширению) ----
+        try:
+            input_format = detect_format(args.input_file, args.old)
+        except ValueError as e:
+            print(e)
+            return False
+        if input_format != 'l5x':
+            print("Detected CSV input file." if input_format == 'csv' else
+                  "Detected old RSLogix CSV input file ('?').")
+            if args.old != (input_format == 'csv_old'):
+                print(f"⚠️  --old {'ignored' if args.old else 'assumed'}: the file uses "
+                      f"'{',' if input_format == 'csv' else '?'}' as separator")
+            loaded = read_input(args.input_file, args.map, debug=args.debug, cache=parse_cache,
+                                input_format=input_format)
+        else:
+            print("Detected L5X input file.")
+            loaded = read_input(args.input_file, args.map, stream=args.stream, test_run=args.test_run,
+                                debug=args.debug, cache=parse_cache, incremental=incremental_load,
+                                input_format=input_format, parallel=args.parallel, jobs=args.jobs)
+        if loaded is False:
+            # выгрузка не прочитана (или ещё пишется) — прежние выходные файлы не трогаем
+            print(f"❌ Could not read {args.input_file}, no output written")
+            return False
+
+        if args.store:
+            from iogen_store import PointStore, default_revision
+            with PointStore(args.store) as point_store:
+                store_project = args.project or input_path.stem
+                store_revision = args.revision or default_revision(input_path)
+                point_store.save(default_model, store_project, store_revision, source=input_path.resolve(),
+                                 replace=True)
+            print(f"💾 Stored as {store_project} @ {store_revision} in {args.store}")
+
+        if args.find:
+            write_find(args.find)
+        if args.print_compact:
+            write_table_compact()
+        if args.print:
+            write_table()
+        # write_table_compact()
+        # write_csv_cspt(sep=':')
+        if not args.noxls:
+            out_xlsx = input_path.with_suffix('.xlsx')
+            write_xlsx(out_xlsx, constant_memory=args.constant_memory)
+
+        return True
+
+    if not load_and_write() and not args.watch:
         raise SystemExit(1)
 
-    if args.print_compact:
-        write_table_compact()
-    if args.print:
-        write_table()
-    # write_table_compact()
-    # write_csv_cspt(sep=':')
-    if not args.noxls:
-        out_xlsx = input_path.with_suffix('.xlsx')
-        write_xlsx(out_xlsx)
+    if profiler.enabled:
+        print("\n⏱ Profile:")
+        print(profiler.summary())
+
+    if args.watch:
+        from iogen_watch import watch
+
+        def regenerate(changed):
+            # новая выгрузка заменяет данные целиком; неизменённые программы L5X берутся из кэша
+            default_model.clear()
+            profiler.reset()
+            started = time.perf_counter()
+            try:
+                if load_and_write():
+                    print(f"✅ Regenerated in {time.perf_counter() - started:.2f} s")
+            except Exception as e:
+                # файл мог быть выгружен не полностью или XLSX открыт в Excel — ждём следующего изменения
+                print(f"❌ Regeneration failed: {e}")
+            if profiler.enabled:
+                print(profiler.summary())
+
+        watch([input_path, args.map], regenerate, debounce=args.watch_debounce,
+              backend='poll' if args.watch_poll else None)
 
 # See PyCharm help at https://www.jetbrains.com/help/pycharm/
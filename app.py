@@ -1,65 +1,168 @@
 import sys
+import time
+_STARTED = time.perf_counter()  # для --startup-profile: время от запуска до показа окна
 import os
 import datetime
+import tempfile
+import threading
 from pathlib import Path
 import traceback
 
-from PyQt6.QtCore import QObject, pyqtSignal, QThread, QSettings, QByteArray, Qt
-from PyQt6.QtWidgets import QApplication, QMainWindow, QFileDialog, QMessageBox, QDialog, QVBoxLayout, QTextEdit, \
-    QPushButton
+from PyQt6.QtCore import QObject, pyqtSignal, QThread, QSettings, QByteArray, Qt, QTimer
+from PyQt6.QtGui import QFontDatabase
+from PyQt6.QtWidgets import QApplication, QMainWindow, QFileDialog, QMessageBox, QListWidgetItem
 from iogen_main import Ui_MainWindow
 
 import IO_Table_generator as iogen
+import iogen_log
+from iogen_cache import ParseCache
+from iogen_profile import import_report
+from iogen_preview import PreviewDialog
+from iogen_watch import FileWatcher
 
 company_name = 'github_com_DamirKh_io_ref'
+FORMAT_NAMES = {'l5x': 'L5X (XML)', 'csv': "CSV (',')", 'csv_old': "CSV, old RSLogix ('?')"}
 
 # --- Поток вывода в GUI ---
-class EmittingStream(QObject):
-    textWritten = pyqtSignal(str)
+class BufferedLogSink(QObject):
+    """
+    Замена sys.stdout/sys.stderr для GUI.
 
-    def __init__(self, parent=None):
+    write() можно вызывать из любого потока: текст только складывается в
+    буфер под блокировкой. Таймер в GUI-потоке раз в `interval_ms` забирает
+    накопленное и одним куском добавляет в виджет. Виджет хранит не больше
+    `max_lines` строк (кольцевой буфер документа), полный лог пишется в файл.
+    """
+
+    def __init__(self, text_edit, log_path, interval_ms=75, max_lines=5000, parent=None):
         super().__init__(parent)
-        self._buffer = ""
+        self._text_edit = text_edit
+        self._text_edit.document().setMaximumBlockCount(max_lines)
+        self._lock = threading.Lock()
+        self._pending = []
+        self.log_path = Path(log_path)
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        self._log_file = open(self.log_path, "a", encoding="utf-8")
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.flush_to_widget)
+        self._timer.start()
 
     def write(self, text):
-        self._buffer += text
-        while "\n" in self._buffer:
-            line, self._buffer = self._buffer.split("\n", 1)
-            self.textWritten.emit(line + "\n")
+        with self._lock:
+            self._pending.append(text)
+        return len(text)
 
     def flush(self):
-        if self._buffer:
-            self.textWritten.emit(self._buffer)
-            self._buffer = ""
+        pass  # вывод в виджет — по таймеру
+
+    def flush_to_widget(self):
+        with self._lock:
+            if not self._pending:
+                return
+            chunk = "".join(self._pending)
+            self._pending.clear()
+
+        if self._log_file is not None:
+            self._log_file.write(chunk)
+            self._log_file.flush()
+
+        cursor = self._text_edit.textCursor()
+        cursor.movePosition(cursor.MoveOperation.End)
+        cursor.insertText(chunk)
+        self._text_edit.setTextCursor(cursor)
+        self._text_edit.ensureCursorVisible()
+
+    def close(self):
+        self._timer.stop()
+        self.flush_to_widget()
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
 
 # --- Рабочий поток, в котором будет выполняться загурзка L5X ---
 class LoaderWorker(QObject):
-    finished = pyqtSignal()
+    finished = pyqtSignal(object)  # IOModel с прочитанными данными, в default_model её переносит GUI-поток
     error = pyqtSignal(str)
+    cancelled = pyqtSignal()
+    progress = pyqtSignal(str, int)  # этап, промилле выполнения
 
-    def __init__(self, input_file, map_file):
+    def __init__(self, input_file, map_file, debug=False):
         super().__init__()
         self.input_file = input_file
         self.map_file = map_file
+        self.debug = debug  # DEBUG-записи по каждому тегу (флажок Debug log)
+        # не чаще 5 обновлений в секунду; cancel() можно вызывать из GUI-потока
+        self.load_progress = iogen.LoadProgress(self._on_progress, interval=0.2)
+
+    def _on_progress(self, stage, done, total):
+        self.progress.emit(stage, done * 1000 // total if total else 0)
+
+    def cancel(self):
+        self.load_progress.cancel()
 
     def run(self):
         try:
             print(f"📂 Loading project: {self.input_file}")
             print(f"🗺 Map file: {self.map_file or 'not provided'}")
 
-            iogen.read_input_l5x(
+            iogen.profiler.reset()
+            iogen.profiler.enable()
+            model = iogen.IOModel()
+            loaded = iogen.read_input(
                 self.input_file,
                 map_file_name=self.map_file,
-                debug=True,
+                debug=self.debug,
+                model=model,
+                cache=ParseCache(),
+                incremental=True,
+                progress=self.load_progress,
             )
+            if loaded is False:
+                # файл повреждён или ещё выгружается: данные и сохранённый XLSX не трогаем
+                self.error.emit(f"Could not read {self.input_file}, loaded data left unchanged.")
+                return
 
             print("✅ Loading completed successfully.")
-            self.finished.emit()
+            self.finished.emit(model)
+
+        except iogen.LoadCancelled:
+            # данные не тронуты: read_input сливает результат в модель только после полной загрузки
+            print("⛔ Loading cancelled, loaded data left unchanged.")
+            self.cancelled.emit()
 
         except Exception as e:
             self.error.emit(str(e))
 
 
+# --- Слежение за входным файлом и картой (режим Watch) ---
+class WatchWorker(QObject):
+    """Ждёт в своём потоке изменения файлов; о каждом завершённом изменении сообщает сигналом changed"""
+    changed = pyqtSignal(list)
+    finished = pyqtSignal()
+
+    def __init__(self, paths):
+        super().__init__()
+        self.watcher = FileWatcher(paths)
+
+    def stop(self):
+        # можно вызывать из GUI-потока: wait() вернётся в течение долей секунды
+        self.watcher.stop()
+
+    def run(self):
+        try:
+            while True:
+                changed = self.watcher.wait()
+                if self.watcher.stopped:
+                    break
+                if changed:
+                    self.changed.emit(changed)
+        finally:
+            self.watcher.close()
+            self.finished.emit()
+
+
 class MainWindow(QMainWindow, Ui_MainWindow):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -67,30 +170,64 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         self._map_file_path = None
         self._out_dir = None
         self._default_dir = ""
+        self._index = None  # IOIndex загруженной модели, строится при первом поиске
+        self._loading = False
+        self._watch_thread = None
+        self._watch_worker = None
+        self._watch_pending = False  # файл изменился во время загрузки — перечитать после неё
+        self._replace_on_load = False  # загрузка по изменению файла заменяет данные и сохраняет XLSX
         self.setupUi(self)
         self.connectSignalsSlots()
         self.statusbar.showMessage("Start application")
 
         # === Подключаем перехват stdout ===
-        self.emitting_stream = EmittingStream()
-        self.emitting_stream.textWritten.connect(self.normalOutputWritten)
-        sys.stdout = self.emitting_stream
-        sys.stderr = self.emitting_stream
-
-
-    def normalOutputWritten(self, text):
-        """Добавляет текст в QTextEdit с переводами строк"""
-        cursor = self.textEdit_log.textCursor()
-        cursor.movePosition(cursor.MoveOperation.End)
-        cursor.insertText(text)
-        self.textEdit_log.setTextCursor(cursor)
-        self.textEdit_log.ensureCursorVisible()
+        log_path = Path(tempfile.gettempdir()) / "io_ref" / f"iogen_{datetime.datetime.now():%Y%m%d_%H%M%S}.log"
+        self.log_sink = BufferedLogSink(self.textEdit_log, log_path, parent=self)
+        sys.stdout = self.log_sink
+        sys.stderr = self.log_sink
+        print(f"📝 Full log: {log_path}")
+        # в окно журнала — INFO и выше; записи по каждому тегу только с флажком Debug log
+        iogen_log.configure_logging(level='INFO', stream=self.log_sink)
+
+        # === Панель профиля загрузки (заполняется после загрузки); доки, прогресс и Watch — в ui/iogen_main.ui ===
+        fixed_font = QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont)
+        self.profile_view.setFont(fixed_font)
+        self.profile_dock.hide()
+
+        # === Поиск: где подключён тег / КИП (по тегу, имени КИП, описанию) ===
+        self.find_results.setFont(fixed_font)
+        # поиск после паузы в наборе, а не на каждую букву
+        self._find_timer = QTimer(self)
+        self._find_timer.setSingleShot(True)
+        self._find_timer.setInterval(200)
+        self._find_timer.timeout.connect(self.onFind)
+        self.find_edit.textChanged.connect(self._find_timer.start)
+        self.find_edit.returnPressed.connect(self.onFind)
+        self.find_results.itemActivated.connect(self.onFindResult)
+
+        # === Прогресс загрузки и отмена (видны только во время загрузки) ===
+        self.progress_bar.hide()
+        self.pushButton_cancelLoad.clicked.connect(self.onCancelLoad)
+        self.pushButton_cancelLoad.hide()
+        self.statusbar.addPermanentWidget(self.progress_bar)
+        self.statusbar.addPermanentWidget(self.pushButton_cancelLoad)
+
+        # === Режим Watch: перечитать проект и сохранить XLSX после каждой новой выгрузки ===
+        self.checkBox_watch.toggled.connect(self.onWatchToggled)
+
+    def onShown(self, startup_profile=False):
+        """Окно уже на экране: тяжёлые библиотеки (xlsxwriter, l5x) подгружаем в фоне"""
+        shown = time.perf_counter() - _STARTED
+        threading.Thread(target=iogen.preload, name="preload", daemon=True).start()
+        if startup_profile:
+            print(f"⏱ Window shown {shown * 1000:.0f} ms after start")
+            print(import_report(['app', *iogen.LAZY_MODULES]))
 
     def connectSignalsSlots(self):
         self.pushButton.clicked.connect(self.onInputFileSelect)
         self.pushButton_3.clicked.connect(self.onMapFileSelect)
         self.pushButton_load.clicked.connect(self.onLoadBtn)
-        self.pushButton_preview.clicked.connect(self.preview)
+        self.pushButton_preview.clicked.connect(lambda: self.preview())
         self.pushButton_selectOutDir.clicked.connect(self.onSelect_OutDir)
         self.pushButton_Save.clicked.connect(self.onSave)
         self.pushButton_drop.clicked.connect(self.onDrop)
@@ -113,6 +250,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             self.lineEdit_3.clear()
             self.label_2.setText("No file selected.")
             self.statusbar.showMessage("Map data wiped")
+            self._restartWatch()
             self.pushButton_3.setEnabled(True)
             self.pushButton_wipeMap.setEnabled(False)
         else:
@@ -133,10 +271,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         if reply == QMessageBox.StandardButton.Yes:
             # --- Очистка данных в iogen ---
             try:
-                if hasattr(iogen, "io_config"):
-                    iogen.io_config.clear()
-                if hasattr(iogen, "io_description"):
-                    iogen.io_description.clear()
+                iogen.default_model.clear()
             except Exception as e:
                 QMessageBox.critical(
                     self,
@@ -146,6 +281,8 @@ class MainWindow(QMainWindow, Ui_MainWindow):
                 self.statusbar.showMessage("Ошибка очистки данных")
                 return
 
+            self._resetIndex()
+
             # --- Очистка UI ---
             # self._input_file_path = None
             # self._map_file_path = None
@@ -191,7 +328,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         out_path_str = self.lineEdit_Out.text().strip()
 
         # --- Проверка наличия данных ---
-        if not hasattr(iogen, "io_config") or not len(iogen.io_config):
+        if not len(iogen.default_model):
             QMessageBox.warning(
                 self,
                 "Nothing to Save",
@@ -242,7 +379,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
 
         # --- Попытка записи XLSX ---
         try:
-            iogen.write_xlsx(str(out_path))
+            iogen.write_xlsx(str(out_path), constant_memory=True)
             QMessageBox.information(
                 self,
                 "Save Successful",
@@ -286,39 +423,18 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         else:
             self.statusbar.showMessage("Output directory not selected")
 
-    def preview(self):
-        """Показ предварительного просмотра таблицы с запоминанием размера и позиции"""
+    def preview(self, focus=None):
+        """Показ предварительного просмотра таблицы с запоминанием размера и позиции; focus — (шасси, слот, канал)"""
+        if not len(iogen.default_model):
+            self.statusbar.showMessage("⚠ Nothing to preview, load a project first")
+            return
         try:
-            pv = iogen.write_table(print_to_stdout=False)
+            dialog = PreviewDialog(iogen.default_model, self, index=self._index, focus=focus)
         except Exception as e:
             self.statusbar.showMessage("❌ Error while generating preview")
             print(f"❌ Exception: {e}")
             return
 
-        # создаём диалог
-        dialog = QDialog(self)
-        dialog.setWindowTitle("Preview Table")
-
-        layout = QVBoxLayout(dialog)
-
-        text_edit = QTextEdit(dialog)
-        text_edit.setReadOnly(True)
-        text_edit.setPlainText(pv)
-
-        # используем моноширинный шрифт, чтобы таблица не "расползалась"
-        font = text_edit.font()
-        font.setFamily("Courier New")
-        font.setPointSize(10)
-        text_edit.setFont(font)
-
-        layout.addWidget(text_edit)
-
-        close_button = QPushButton("Close", dialog)
-        close_button.clicked.connect(dialog.accept)
-        layout.addWidget(close_button)
-
-        dialog.setLayout(layout)
-
         # --- QSettings для сохранения состояния окна ---
         settings = QSettings(company_name, "IO_Generator")
 
@@ -335,9 +451,40 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         # сохраняем геометрию окна
         settings.setValue("PreviewDialog/geometry", dialog.saveGeometry())
 
+    # --- Поиск по загруженной модели ---
+    def _resetIndex(self):
+        """Модель изменилась: индекс строится заново при следующем поиске"""
+        self._index = None
+        self.find_results.clear()
+        if self.find_edit.text():
+            self._find_timer.start()
+
+    def onFind(self):
+        self._find_timer.stop()
+        self.find_results.clear()
+        query = self.find_edit.text().strip()
+        if not query or not len(iogen.default_model):
+            return
+        if self._index is None:
+            started = time.perf_counter()
+            self._index = iogen.IOIndex(iogen.default_model)
+            print(f"🔎 Index of {len(self._index)} points built in {time.perf_counter() - started:.2f} s")
+        limit = 500
+        points = self._index.find(query, limit=limit + 1)
+        for p in points[:limit]:
+            item = QListWidgetItem(f"{p.chassis}:{p.slot}:{p.point:02}  {p.tag}", self.find_results)
+            item.setToolTip(p.description)
+            item.setData(Qt.ItemDataRole.UserRole, (p.chassis, p.slot, p.point))
+        more = "+" if len(points) > limit else ""
+        self.statusbar.showMessage(f"🔎 {min(len(points), limit)}{more} point(s) for '{query}'")
+
+    def onFindResult(self, item):
+        """Открыть предпросмотр на найденной точке"""
+        self.preview(focus=item.data(Qt.ItemDataRole.UserRole))
+
     # --- Запуск обработки в отдельном потоке ---
     def onLoadBtn(self):
-        if hasattr(iogen, "io_config") and len(iogen.io_config):
+        if len(iogen.default_model):
             reply = QMessageBox.question(
                 self,
                 "Данные уже загружены",
@@ -349,33 +496,140 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         if not self._input_file_path:
             print("⚠ Input file not selected!")
             return
+        self._startLoad()
 
+    def _startLoad(self, replace=False):
+        """Запуск загрузки в отдельном потоке; replace — заменить данные и сохранить XLSX (режим Watch)"""
+        self._loading = True
+        self._replace_on_load = replace
         self.statusbar.showMessage("Loading started...")
         self.pushButton_preview.setEnabled(False)
+        self.pushButton_load.setEnabled(False)
+        self.progress_bar.setValue(0)
+        self.progress_bar.show()
+        self.pushButton_cancelLoad.setEnabled(True)
+        self.pushButton_cancelLoad.show()
 
         # создаём поток и воркер
         self.thread = QThread()
-        self.worker = LoaderWorker(self._input_file_path, self._map_file_path)
+        self.worker = LoaderWorker(self._input_file_path, self._map_file_path, debug=self.checkBox_debug.isChecked())
         self.worker.moveToThread(self.thread)
 
         # подключаем сигналы
         self.thread.started.connect(self.worker.run)
         self.worker.finished.connect(self.onLoadFinished)
         self.worker.error.connect(self.onLoadError)
-        self.worker.finished.connect(self.thread.quit)
-        self.worker.error.connect(self.thread.quit)
-        self.worker.finished.connect(self.worker.deleteLater)
-        self.worker.error.connect(self.worker.deleteLater)
+        self.worker.cancelled.connect(self.onLoadCancelled)
+        self.worker.progress.connect(self.onLoadProgress)
+        for done in (self.worker.finished, self.worker.error, self.worker.cancelled):
+            done.connect(self.thread.quit)
+            done.connect(self.worker.deleteLater)
         self.thread.finished.connect(self.thread.deleteLater)
 
         # стартуем
         self.thread.start()
 
-    def onLoadFinished(self):
+    def onLoadProgress(self, stage, permille):
+        self.progress_bar.setValue(permille)
+        self.statusbar.showMessage(f"{stage}...")
+
+    def onCancelLoad(self):
+        self.pushButton_cancelLoad.setEnabled(False)
+        self.statusbar.showMessage("Cancelling...")
+        self.worker.cancel()
+
+    def _loadDone(self):
+        """Прячет прогресс и возвращает кнопки после завершения, ошибки или отмены загрузки"""
+        self._loading = False
+        self.progress_bar.hide()
+        self.pushButton_cancelLoad.hide()
+        self.pushButton_load.setEnabled(True)
+        self.pushButton_preview.setEnabled(len(iogen.default_model) > 0)
+        self._resetIndex()
+        if self._watch_pending:
+            # за время загрузки вышла ещё одна выгрузка
+            self._watch_pending = False
+            QTimer.singleShot(0, lambda: self._startLoad(replace=True))
+
+    def onLoadFinished(self, model):
+        if self._replace_on_load:
+            iogen.default_model.clear()
+        iogen.default_model.merge(model)
+        self._loadDone()
         self.statusbar.showMessage("✅ Loading completed successfully.")
-        self.pushButton_preview.setEnabled(True)
+        self.profile_view.setPlainText(iogen.profiler.summary())
+        self.profile_dock.show()
+        if self._replace_on_load:
+            self._autoSave()
+
+    # --- Режим Watch ---
+    def onWatchToggled(self, checked):
+        if checked:
+            self._startWatch()
+        else:
+            self._stopWatch()
+            self.statusbar.showMessage("Watch stopped")
+
+    def _startWatch(self):
+        if not self._input_file_path:
+            self.statusbar.showMessage("⚠ Select an input file to watch")
+            self.checkBox_watch.setChecked(False)
+            return
+        self._watch_thread = QThread()
+        self._watch_worker = WatchWorker([self._input_file_path, self._map_file_path])
+        self._watch_worker.moveToThread(self._watch_thread)
+        self._watch_thread.started.connect(self._watch_worker.run)
+        self._watch_worker.changed.connect(self.onWatchedFilesChanged)
+        self._watch_worker.finished.connect(self._watch_thread.quit)
+        self._watch_worker.finished.connect(self._watch_worker.deleteLater)
+        self._watch_thread.finished.connect(self._watch_thread.deleteLater)
+        self._watch_thread.start()
+        print(f"👀 Watching {', '.join(self._watch_worker.watcher.paths)} ({self._watch_worker.watcher.backend})")
+        self.statusbar.showMessage("👀 Watching input files")
+
+    def _stopWatch(self):
+        if self._watch_worker is not None:
+            self._watch_worker.stop()
+            self._watch_thread.quit()
+            self._watch_thread.wait()
+        self._watch_thread = None
+        self._watch_worker = None
+
+    def _restartWatch(self):
+        """Выбраны другие файлы — следим за ними"""
+        if self.checkBox_watch.isChecked():
+            self._stopWatch()
+            self._startWatch()
+
+    def onWatchedFilesChanged(self, paths):
+        print(f"🔄 Changed: {', '.join(os.path.basename(path) for path in paths)}")
+        if self._loading:
+            self._watch_pending = True
+            return
+        self._startLoad(replace=True)
+
+    def _autoSave(self):
+        """Сохранение XLSX без диалогов (режим Watch): ошибки только в журнал и строку состояния"""
+        out_path = self.lineEdit_Out.text().strip()
+        if not out_path:
+            self.statusbar.showMessage("⚠ Reloaded, but no output path to save XLSX")
+            return
+        try:
+            iogen.write_xlsx(out_path, constant_memory=True)
+        except Exception as e:
+            # например, файл открыт в Excel — сохраним после следующей выгрузки
+            print(f"❌ Auto save failed: {e}")
+            self.statusbar.showMessage("❌ Reloaded, but XLSX was not saved")
+            return
+        print(f"💾 Saved: {out_path}")
+        self.statusbar.showMessage(f"✅ Reloaded and saved: {out_path}")
+
+    def onLoadCancelled(self):
+        self._loadDone()
+        self.statusbar.showMessage("⛔ Loading cancelled.")
 
     def onLoadError(self, message):
+        self._loadDone()
         self.statusbar.showMessage("❌ Error during loading.")
         print(f"❌ Exception: {message}")
 
@@ -411,6 +665,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             self.pushButton_3.setEnabled(False)
             # --- Обновляем label ---
             self.label_2.setText(file_info_text)
+            self._restartWatch()
         else:
             self._map_file_path = None
             self.statusbar.showMessage("Map file not selected")
@@ -422,7 +677,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             self,
             "Select project file...",
             self._default_dir,  # Default directory (пустая строка — домашний каталог пользователя)
-            "L5X XML file (*.L5X);;CSV file (*.csv);;All Files (*)",  # Расширенный фильтр
+            "Project export (*.L5X *.csv);;L5X XML file (*.L5X);;CSV file (*.csv);;All Files (*)",  # Расширенный фильтр
         )
 
         if filename:
@@ -436,12 +691,18 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             file_size_kb = file_info.st_size / 1024
             mod_time = datetime.datetime.fromtimestamp(file_info.st_mtime)
 
+            # --- Формат определяем по содержимому, как и загрузчик ---
+            try:
+                file_type = FORMAT_NAMES[iogen.detect_format(filename)]
+            except (OSError, ValueError):
+                file_type = f"{os.path.splitext(filename)[1].upper()} (unsupported)"
+
             # --- Формируем красивый текст ---
             file_info_text = (
                 f"<b>Input file selected:</b><br>{filename}<br><br>"
                 f"<b>Size:</b> {file_size_kb:.1f} KB<br>"
                 f"<b>Modified:</b> {mod_time.strftime('%Y-%m-%d %H:%M:%S')}<br>"
-                f"<b>Type:</b> {os.path.splitext(filename)[1].upper()}<br>"
+                f"<b>Type:</b> {file_type}<br>"
             )
             # --- Обновляем label ---
             self.label.setText(file_info_text)
@@ -454,12 +715,14 @@ class MainWindow(QMainWindow, Ui_MainWindow):
                 # создаём полный путь к файлу XLSX
                 out_xlsx = Path(self._input_file_path).with_suffix('.xlsx')
             self.lineEdit_Out.setText(str(out_xlsx))
+            self._restartWatch()
 
         else:
             self.statusbar.showMessage("Input file not selected")
             self.label.setText("No file selected.")
 
     def closeEvent(self, event):
+        self._stopWatch()
         settings = QSettings(company_name, "IO_Generator")
         if self._out_dir:
             settings.setValue("out_dir", str(self._out_dir))
@@ -467,6 +730,10 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         settings.setValue("MainWindow/geometry", self.saveGeometry())
         super().closeEvent(event)
 
+        sys.stdout = sys.__stdout__
+        sys.stderr = sys.__stderr__
+        self.log_sink.close()
+
         settings.sync()  # гарантированная запись на диск
         event.accept()
 
@@ -486,9 +753,11 @@ class MainWindow(QMainWindow, Ui_MainWindow):
 
 
 def main():
+    startup_profile = "--startup-profile" in sys.argv
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
+    QTimer.singleShot(0, lambda: window.onShown(startup_profile))
     sys.exit(app.exec())
 
 
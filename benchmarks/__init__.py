@@ -0,0 +1,8 @@
+"""Benchmarks for IO_Table_generator. Run from the repository root, e.g.
+
+    python -m benchmarks.bench_pipeline --json before.json
+    python -m benchmarks.bench_pipeline --compare before.json
+    python -m benchmarks.bench_n11mapping
+
+benchmarks.synthetic generates the L5X/CSV/map inputs they run on.
+"""
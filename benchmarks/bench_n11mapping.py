@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Compare the old linear-scan n11mapping.replace with the prefix index.
+
+    python -m benchmarks.bench_n11mapping [--entries 10000] [--lookups 5000]
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import tempfile
+import timeit
+
+import IO_Table_generator as iogen
+
+
+def legacy_replace(n11: dict, point_address: str):
+    """n11mapping.replace as it was before the prefix index (first match in file order)."""
+    for n in n11.keys():
+        if point_address.startswith(n):
+            return point_address.replace(n, n11[n])
+    return point_address
+
+
+def make_map_file(path, entries):
+    with open(path, 'w', newline='') as f:
+        f.write('# synthetic N11 map\n')
+        for i in range(entries):
+            f.write(f'N11[{i}] RIO_{i // 208:03}:{(i // 16) % 13}:I.Data\n')
+
+
+def make_aliases(entries, lookups, seed=0):
+    rnd = random.Random(seed)
+    aliases = []
+    for _ in range(lookups):
+        if rnd.random() < 0.8:
+            aliases.append(f'N11[{rnd.randrange(entries)}].{rnd.randrange(16)}')
+        else:
+            aliases.append(f'RIO_{rnd.randrange(50):03}:{rnd.randrange(13)}:I.Data.{rnd.randrange(16)}')
+    return aliases
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--entries', type=int, default=10000, help="Number of rows in the map file")
+    parser.add_argument('--lookups', type=int, default=5000, help="Number of aliases to map")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        map_path = os.path.join(tmp, 'map.txt')
+        make_map_file(map_path, args.entries)
+        with contextlib.redirect_stdout(io.StringIO()):
+            mapping = iogen.n11mapping(map_path)
+
+    aliases = make_aliases(args.entries, args.lookups)
+    n11 = mapping._n11
+
+    legacy = min(timeit.repeat(lambda: [legacy_replace(n11, a) for a in aliases],
+                               number=1, repeat=args.repeat))
+    indexed = min(timeit.repeat(lambda: [mapping.replace(a) for a in aliases],
+                                number=1, repeat=args.repeat))
+
+    print(f"map entries: {args.entries}, lookups: {args.lookups}")
+    print(f"  linear scan:  {legacy:8.3f} s  ({legacy / args.lookups * 1e6:8.2f} us/lookup)")
+    print(f"  prefix index: {indexed:8.3f} s  ({indexed / args.lookups * 1e6:8.2f} us/lookup)")
+    print(f"  speed-up:     {legacy / indexed:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
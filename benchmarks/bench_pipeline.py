@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Time every stage of IO_Table_generator on a synthetic project.
+
+Stages: loading the L5X (l5x DOM and streaming) and CSV exports, map file
+lookups, alias classification, comment decoding, text rendering, XLSX
+writing and the diff of two project versions. Each stage is run --repeat times with cold caches and the best
+time is reported; peak memory is measured in one more run under tracemalloc.
+
+    python -m benchmarks.bench_pipeline [--chassis 20 ...] [--json out.json] [--compare old.json]
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import IO_Table_generator as iogen
+import iogen_diff
+import iogen_log
+from benchmarks import synthetic
+
+
+def _clear_caches():
+    iogen.RUS_comment_decoder.cache_clear()
+    iogen.alias_classifier.classify.cache_clear()
+
+
+def _load(reader, path, map_file, **kwargs):
+    def stage():
+        model = iogen.IOModel()
+        reader(path, map_file, model=model, **kwargs)
+        return len(model)
+    return stage
+
+
+def make_stages(paths, aliases, out_dir):
+    """ {name: callable returning the number of processed items}"""
+    model = iogen.IOModel()
+    iogen.read_input_l5x_stream(paths['l5x'], paths['map'], model=model)
+    alias_paths = [alias.rsplit(':', 1)[-1] for _, _, alias, _ in aliases]
+    comments = [comment for _, _, _, comment in aliases]
+    xlsx = os.path.join(out_dir, 'bench.xlsx')
+
+    def map_stage():
+        mapping = iogen.n11mapping(paths['map'])
+        for _, _, alias, _ in aliases:
+            mapping.replace(alias)
+        return len(aliases)
+
+    def classify_stage():
+        classify = iogen.alias_classifier._classify
+        for path in alias_paths:
+            classify(path)
+        return len(alias_paths)
+
+    def decode_stage():
+        return len(iogen.decode_many(comments))
+
+    def render_stage():
+        size = 0
+        for render in (iogen.iter_table, iogen.iter_table_compact, iogen.iter_csv_cspt):
+            for piece in render(model=model):
+                size += len(piece)
+        return size
+
+    # вторая версия проекта: каждая 50-я точка перенесена, каждая 70-я с новым описанием
+    changed = iogen.IOModel()
+    for n, p in enumerate(model.iter_points()):
+        if n % 50 == 0:
+            changed.put('MOVED_' + p.chassis, p.slot, p.point, p.tag, p.description)
+        else:
+            changed.put(p.chassis, p.slot, p.point, p.tag, p.description + ('*' if n % 70 == 0 else ''))
+
+    def diff_stage():
+        return len(iogen_diff.diff_models(model, changed))
+
+    def xlsx_stage(constant_memory):
+        def stage():
+            iogen.write_xlsx(xlsx, model=model, constant_memory=constant_memory)
+            return len(model)
+        return stage
+
+    return {
+        'load_l5x': _load(iogen.read_input_l5x, paths['l5x'], paths['map']),
+        'load_l5x_stream': _load(iogen.read_input_l5x_stream, paths['l5x'], paths['map']),
+        'load_csv': _load(iogen.read_input_csv, paths['csv'], paths['map']),
+        'load_csv_old': _load(iogen.read_input_csv, paths['csv_old'], paths['map'], old_csv_version=True),
+        'map': map_stage,
+        'classify': classify_stage,
+        'decode': decode_stage,
+        'render_text': render_stage,
+        'diff': diff_stage,
+        'write_xlsx': xlsx_stage(False),
+        'write_xlsx_constant_memory': xlsx_stage(True),
+    }
+
+
+def run_stage(stage, repeat):
+    """ Best wall time of `repeat` cold runs, then peak traced memory of one more run"""
+    best = None
+    items = 0
+    for _ in range(repeat):
+        _clear_caches()
+        gc.collect()
+        started = time.perf_counter()
+        items = stage()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    _clear_caches()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        stage()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'seconds': round(best, 6), 'peak_kb': peak // 1024, 'items': items}
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(iogen.__file__))).stdout.strip()
+    except OSError:
+        return ''
+
+
+def print_report(report, baseline=None):
+    print(f"commit {report['commit'] or '?'}, python {report['python']}, "
+          f"{report['points']} points, L5X {report['files']['l5x'] / 1e6:.1f} MB")
+    header = f"{'Stage':<28} {'Time,s':>9} {'Peak,MB':>9} {'Items':>9}"
+    if baseline:
+        header += f" {'Base,s':>9} {'Ratio':>7}"
+    print(header)
+    print('-' * len(header))
+    for name, r in report['stages'].items():
+        line = f"{name:<28} {r['seconds']:>9.3f} {r['peak_kb'] / 1024:>9.1f} {r['items']:>9}"
+        base = baseline['stages'].get(name) if baseline else None
+        if base:
+            line += f" {base['seconds']:>9.3f} {r['seconds'] / base['seconds'] if base['seconds'] else 0:>6.2f}x"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    synthetic.add_spec_arguments(parser)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--stages', nargs='+', metavar='STAGE', help="Run only these stages")
+    parser.add_argument('--keep', metavar='DIR', help="Generate the project into DIR and keep it")
+    parser.add_argument('--json', metavar='FILE', help="Write the results as JSON")
+    parser.add_argument('--compare', metavar='FILE', help="JSON results of an earlier run to compare with")
+    args = parser.parse_args()
+
+    iogen_log.configure_logging(level='WARNING', stream=sys.stderr)
+    spec = synthetic.spec_from_args(args)
+    with contextlib.ExitStack() as stack:
+        out_dir = args.keep or stack.enter_context(tempfile.TemporaryDirectory())
+        paths = synthetic.write_project(out_dir, spec)
+        aliases, _ = synthetic.generate(spec)
+        stages = make_stages(paths, aliases, out_dir)
+        unknown = set(args.stages or ()) - set(stages)
+        if unknown:
+            parser.error(f"unknown stage(s): {', '.join(sorted(unknown))}; choose from {', '.join(stages)}")
+
+        report = {
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'spec': spec.as_dict(),
+            'points': len(aliases),
+            'files': {kind: os.path.getsize(path) for kind, path in paths.items()},
+            'stages': {},
+        }
+        for name, stage in stages.items():
+            if args.stages and name not in args.stages:
+                continue
+            with contextlib.redirect_stdout(io.StringIO()):
+                report['stages'][name] = run_stage(stage, args.repeat)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Synthetic RSLogix 5000 exports for benchmarks.
+
+Builds a deterministic set of IO alias tags and writes it as an L5X project,
+a CSV tag export (new ',' or old '?' format) and an N11 map file:
+
+  * RIO racks, one module kind per slot: I.Data.n, O.Ch{n}Data, I.n (Flex IO)
+    or N11[k].n aliases which resolve through the map file;
+  * FlexBus adapters, FLEX_i:0:I.Data[n].m;
+  * one short form rack, SD_Console:I.Data[n].m;
+  * service tags (I.Ch0Fault) and non-IO aliases, which the readers skip;
+  * comments encoded as $04xx sequences, like Logix exports Russian text;
+  * optional ladder logic (--rungs per program), which is most of a real L5X.
+
+    python -m benchmarks.synthetic OUT_DIR [--chassis 20] [--slots 13] [--channels 16]
+"""
+import argparse
+import os
+import random
+from xml.sax.saxutils import quoteattr
+
+RUS_WORDS = ('Давление', 'Температура', 'Расход', 'Уровень', 'насоса', 'клапана', 'резервуара', 'открыт',
+             'закрыт', 'авария', 'на входе', 'на выходе', 'Текущая степень открытия, %')
+KIP_PREFIXES = ('PT', 'TT', 'FT', 'LT', 'XV', 'HS', 'ZS', 'PSH')
+SLOT_KINDS = ('data', 'ch', 'flex', 'mapped')
+
+
+class ProjectSpec(object):
+    """
+    Size and shape of a synthetic project.
+
+    Args:
+        chassis (int): Number of RIO racks.
+        slots (int): Slots per rack.
+        channels (int): Points per slot.
+        programs (int): Programs the tags are spread over (plus the controller scope).
+        flexbus (int): Number of FlexBus adapters (8 modules each).
+        comments (float): Share of tags with a comment.
+        service (float): Share of slots which also get a service (Fault) alias.
+        padding (int): Non-alias tags written per alias tag, to make the files realistically large.
+        rungs (int): Ladder rungs per program in the L5X file.
+        seed (int): Random seed, equal specs give byte-identical files.
+    """
+
+    def __init__(self, chassis=20, slots=13, channels=16, programs=10, flexbus=2, comments=0.8,
+                 service=0.2, padding=1, rungs=0, seed=0):
+        self.chassis = chassis
+        self.slots = slots
+        self.channels = channels
+        self.programs = programs
+        self.flexbus = flexbus
+        self.comments = comments
+        self.service = service
+        self.padding = padding
+        self.rungs = rungs
+        self.seed = seed
+
+    def as_dict(self):
+        return dict(vars(self))
+
+
+def encode_comment(text):
+    """ Logix style comment: non-ASCII characters as $hhhh, line breaks as $N"""
+    return ''.join('$N' if ch == '\n' else ch if ord(ch) < 128 else f'${ord(ch):04x}' for ch in text)
+
+
+def generate(spec):
+    """
+    Build the tags of a project.
+
+    Returns:
+        (aliases, map_rows): aliases is a list of (scope, name, alias_for, comment) with scope None
+        for controller tags, comment already encoded; map_rows is a list of (key, target).
+    """
+    rnd = random.Random(spec.seed)
+    aliases = []
+    map_rows = []
+    scopes = [None] + [f'Program_{i:02}' for i in range(spec.programs)]
+
+    def add(alias_for, direction='i'):
+        number = len(aliases)
+        name = f'{direction}{rnd.choice(KIP_PREFIXES)}{1000 + number}'
+        comment = ''
+        if rnd.random() < spec.comments:
+            comment = encode_comment(' '.join(rnd.sample(RUS_WORDS, 3)) + ('\n' if rnd.random() < 0.1 else '')
+                                     + f' {number}')
+        aliases.append((scopes[number % len(scopes)], name, alias_for, comment))
+
+    for c in range(spec.chassis):
+        chassis = f'RIO_{c:03}'
+        for slot in range(spec.slots):
+            kind = rnd.choice(SLOT_KINDS)
+            direction = rnd.choice('io')
+            io = direction.upper()
+            if kind == 'mapped':
+                key = f'N11[{len(map_rows)}]'
+                map_rows.append((key, f'{chassis}:{slot}:{io}.Data'))
+            for point in range(spec.channels):
+                if kind == 'data':
+                    add(f'{chassis}:{slot}:{io}.Data.{point}', direction)
+                elif kind == 'ch':
+                    add(f'{chassis}:{slot}:{io}.Ch{point}Data', direction)
+                elif kind == 'flex':
+                    add(f'{chassis}:{slot}:{io}.{point}', direction)
+                else:
+                    add(f'{key}.{point}', direction)
+            if rnd.random() < spec.service:
+                add(f'{chassis}:{slot}:I.Ch0Fault')
+
+    for adapter in range(spec.flexbus):
+        for module in range(8):
+            for point in range(spec.channels):
+                add(f'FLEX_{adapter}:0:I.Data[{module}].{point}')
+
+    for module in range(min(spec.slots, 8)):
+        for point in range(spec.channels):
+            add(f'SD_Console:I.Data[{module}].{point}')
+
+    for i in range(spec.chassis):
+        add(f'Local:{i % 4}:C.Ch0Config.HighEngineering')  # non-IO alias
+    return aliases, map_rows
+
+
+def write_map(path, map_rows):
+    with open(path, 'w', newline='') as f:
+        f.write('# synthetic N11 map\n')
+        for key, target in map_rows:
+            f.write(f'{key} {target}\n')
+
+
+def _l5x_tags(out, tags, padding):
+    out.write('<Tags>\n')
+    for name, alias_for, comment in tags:
+        out.write(f'<Tag Name={quoteattr(name)} TagType="Alias" Radix="Decimal" AliasFor={quoteattr(alias_for)} '
+                  f'ExternalAccess="Read/Write">\n')
+        if comment:
+            out.write(f'<Description>\n<![CDATA[{comment}]]>\n</Description>\n')
+        out.write('</Tag>\n')
+        for n in range(padding):
+            out.write(f'<Tag Name="{name}_v{n}" TagType="Base" DataType="REAL" Radix="Float" Constant="false" '
+                      f'ExternalAccess="Read/Write">\n<Data Format="Decorated">\n'
+                      f'<DataValue DataType="REAL" Radix="Float" Value="0.0"/>\n</Data>\n</Tag>\n')
+    out.write('</Tags>\n')
+
+
+def _l5x_rungs(out, rungs):
+    for n in range(rungs):
+        out.write(f'<Rung Number="{n}" Type="N">\n')
+        if n % 10 == 0:
+            # rung comments are CDATA and may hold anything, even markup
+            out.write(f'<Comment>\n<![CDATA[Step {n}: see <Tags> and </Tags> of the program]]>\n</Comment>\n')
+        out.write(f'<Text>\n<![CDATA[XIC(Step[{n}].EN)[TON(Step[{n}].T,?,?) ,MOV({n},State)]'
+                  f'GRT(Level,{n % 100})OTE(Pump_{n % 32}.Run);]]>\n</Text>\n</Rung>\n')
+
+
+def write_l5x(path, aliases, padding=1, rungs=0):
+    by_scope = {}
+    for scope, name, alias_for, comment in aliases:
+        by_scope.setdefault(scope, []).append((name, alias_for, comment))
+    with open(path, 'w', encoding='utf-8', newline='\n') as out:
+        out.write('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                  '<RSLogix5000Content SchemaRevision="1.0" SoftwareRevision="32.00" TargetName="SYNTH" '
+                  'TargetType="Controller" ContainsContext="false">\n'
+                  '<Controller Use="Target" Name="SYNTH" ProcessorType="1756-L85E" MajorRev="32" MinorRev="11">\n'
+                  '<DataTypes/>\n<Modules/>\n<AddOnInstructionDefinitions/>\n')
+        _l5x_tags(out, by_scope.get(None, []), padding)
+        out.write('<Programs>\n')
+        for scope in sorted(s for s in by_scope if s is not None):
+            out.write(f'<Program Name="{scope}" TestEdits="false" MainRoutineName="MainRoutine" Disabled="false">\n')
+            _l5x_tags(out, by_scope[scope], padding)
+            out.write('<Routines>\n<Routine Name="MainRoutine" Type="RLL">\n<RLLContent>\n')
+            _l5x_rungs(out, max(rungs, 1))
+            out.write('</RLLContent>\n</Routine>\n</Routines>\n</Program>\n')
+        out.write('</Programs>\n<Tasks/>\n</Controller>\n</RSLogix5000Content>\n')
+
+
+def write_csv(path, aliases, old_version=False, padding=1):
+    sep = '?' if old_version else ','
+    with open(path, 'w', encoding='ISO-8859-1', newline='\n') as out:
+        out.write('remark,"CSV-Import-Export"\nremark,"Date = Mon Jan 01 00:00:00 2024"\n0.3\n')
+        out.write(sep.join(('TYPE', 'SCOPE', 'NAME', 'DESCRIPTION', 'DATATYPE', 'SPECIFIER', 'ATTRIBUTES')) + '\n')
+        for scope, name, alias_for, comment in aliases:
+            out.write(sep.join(('ALIAS', scope or '', f'"{name}"', f'"{comment}"', '""', f'"{alias_for}"',
+                                '"(RADIX := Decimal)"')) + '\n')
+            for n in range(padding):
+                out.write(sep.join(('TAG', scope or '', f'"{name}_v{n}"', '""', '"REAL"', '""',
+                                    '"(RADIX := Float, Constant := false)"')) + '\n')
+
+
+def write_project(out_dir, spec):
+    """ Write project.L5X, project.csv, project_old.csv and map.txt; returns their paths"""
+    os.makedirs(out_dir, exist_ok=True)
+    aliases, map_rows = generate(spec)
+    paths = {
+        'l5x': os.path.join(out_dir, 'project.L5X'),
+        'csv': os.path.join(out_dir, 'project.csv'),
+        'csv_old': os.path.join(out_dir, 'project_old.csv'),
+        'map': os.path.join(out_dir, 'map.txt'),
+    }
+    write_l5x(paths['l5x'], aliases, spec.padding, spec.rungs)
+    write_csv(paths['csv'], aliases, padding=spec.padding)
+    write_csv(paths['csv_old'], aliases, old_version=True, padding=spec.padding)
+    write_map(paths['map'], map_rows)
+    return paths
+
+
+def add_spec_arguments(parser):
+    defaults = ProjectSpec()
+    parser.add_argument('--chassis', type=int, default=defaults.chassis, help="Number of RIO racks")
+    parser.add_argument('--slots', type=int, default=defaults.slots, help="Slots per rack")
+    parser.add_argument('--channels', type=int, default=defaults.channels, help="Points per slot")
+    parser.add_argument('--programs', type=int, default=defaults.programs, help="Number of programs")
+    parser.add_argument('--flexbus', type=int, default=defaults.flexbus, help="Number of FlexBus adapters")
+    parser.add_argument('--padding', type=int, default=defaults.padding, help="Non-alias tags per alias tag")
+    parser.add_argument('--rungs', type=int, default=defaults.rungs, help="Ladder rungs per program in the L5X")
+    parser.add_argument('--seed', type=int, default=defaults.seed)
+
+
+def spec_from_args(args):
+    return ProjectSpec(chassis=args.chassis, slots=args.slots, channels=args.channels, programs=args.programs,
+                       flexbus=args.flexbus, padding=args.padding, rungs=args.rungs, seed=args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('out_dir', help="Directory for the generated files")
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+    for kind, path in write_project(args.out_dir, spec_from_args(args)).items():
+        print(f"{kind:8} {path}  ({os.path.getsize(path) / 1e6:.1f} MB)")
+
+
+if __name__ == '__main__':
+    main()
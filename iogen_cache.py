@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+On-disk cache of parsed point tables.
+
+An entry is keyed on the content hash of the input file, the content hash
+of the map file, the reader options and the parser version, so a cache hit
+can skip XML/CSV parsing completely. Entries are zlib-compressed JSON of
+the column lists produced by IOModel.dump_columns(): plain lists of str and
+int, nothing in them is executed when loaded, even if IOGEN_CACHE_DIR points
+to a shared directory.
+
+Content hashes of big files are remembered by (size, mtime), so an
+unchanged 300 MB L5X is not re-hashed on every load.
+The same directory keeps the per-Program results of incremental L5X loads
+(entries keyed with `named_key`).
+"""
+import hashlib
+import json
+import os
+import time
+import zlib
+from pathlib import Path
+
+ENTRY_SUFFIX = '.iocache'
+DIGESTS_FILE = 'digests.json'
+
+
+def default_cache_dir():
+    """ Per-user cache directory (IOGEN_CACHE_DIR overrides it)"""
+    env = os.environ.get('IOGEN_CACHE_DIR')
+    if env:
+        return Path(env)
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or Path.home() / 'AppData' / 'Local'
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'io_ref'
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """ blake2b hex digest of a file's content"""
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ParseCache(object):
+    """
+    Directory of cached parse results.
+
+    Args:
+        cache_dir (str | Path | None): Cache location, `default_cache_dir()` if None.
+        max_bytes (int): Total size of entries kept after an eviction pass.
+        max_age_days (float): Entries not used for longer than this are removed.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=1 << 30, max_age_days=30):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.max_bytes = max_bytes
+        self.max_age = max_age_days * 24 * 3600
+        self.hits = 0
+        self.misses = 0
+        self._digests = None
+
+    # --- keys ---------------------------------------------------------------------------------------------------------
+    def _load_digests(self):
+        if self._digests is None:
+            try:
+                with open(self.cache_dir / DIGESTS_FILE, encoding='utf-8') as f:
+                    self._digests = json.load(f)
+            except (OSError, ValueError):
+                self._digests = {}
+        return self._digests
+
+    def _save_digests(self):
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_dir / f'{DIGESTS_FILE}.{os.getpid()}.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(self._digests, f)
+            os.replace(tmp, self.cache_dir / DIGESTS_FILE)
+        except OSError:
+            pass
+
+    def digest(self, path):
+        """ Content digest of a file, reused while its size and mtime do not change"""
+        st = os.stat(path)
+        name = os.path.abspath(path)
+        digests = self._load_digests()
+        known = digests.get(name)
+        if known and known[0] == st.st_size and known[1] == st.st_mtime_ns:
+            return known[2]
+        value = file_digest(path)
+        digests[name] = [st.st_size, st.st_mtime_ns, value]
+        self._save_digests()
+        return value
+
+    def key(self, input_file, map_file_name=None, *options):
+        """ Cache key of an input file, its map file and the reader options/version"""
+        h = hashlib.blake2b(digest_size=20)
+        h.update(self.digest(input_file).encode())
+        h.update(b'\0')
+        h.update(self.digest(map_file_name).encode() if map_file_name else b'-')
+        for option in options:
+            h.update(b'\0')
+            h.update(repr(option).encode())
+        return h.hexdigest()
+
+    @staticmethod
+    def named_key(*parts):
+        """ Cache key of plain values, for entries that are not keyed on file content"""
+        h = hashlib.blake2b(digest_size=20)
+        for part in parts:
+            h.update(repr(part).encode())
+            h.update(b'\0')
+        return h.hexdigest()
+
+    # --- entries ------------------------------------------------------------------------------------------------------
+    def _entry(self, key):
+        return self.cache_dir / f'{key}{ENTRY_SUFFIX}'
+
+    def __contains__(self, key):
+        return self._entry(key).is_file()
+
+    def load(self, key):
+        """ Cached table for the key, or None"""
+        path = self._entry(key)
+        try:
+            with open(path, 'rb') as f:
+                table = json.loads(zlib.decompress(f.read()))
+        except (OSError, zlib.error, ValueError):
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)  # keep recently used entries on eviction
+        except OSError:
+            pass
+        self.hits += 1
+        return table
+
+    def store(self, key, table):
+        """ Write an entry (JSON-serialisable: dicts with str keys, lists, str, int, None) atomically, then evict"""
+        data = zlib.compress(json.dumps(table, separators=(',', ':')).encode('utf-8'), 1)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_dir / f'{key}.{os.getpid()}.tmp'
+            with open(tmp, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, self._entry(key))
+        except OSError:
+            return False
+        self.evict()
+        return True
+
+    def evict(self):
+        """ Drop entries older than max_age, then the least recently used ones above max_bytes"""
+        now = time.time()
+        entries = []
+        for path in self.cache_dir.glob(f'*{ENTRY_SUFFIX}'):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            if now - st.st_mtime > self.max_age:
+                path.unlink(missing_ok=True)
+            else:
+                entries.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self):
+        for path in self.cache_dir.glob(f'*{ENTRY_SUFFIX}'):
+            path.unlink(missing_ok=True)
+        (self.cache_dir / DIGESTS_FILE).unlink(missing_ok=True)
+        self._digests = None
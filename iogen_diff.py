@@ -0,0 +1,300 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+IO changes between two versions of a project.
+
+Both exports are read into their own IOModel (the shared default model is
+not touched) and compared in two linear passes:
+
+  1. a merge of the points sorted by (chassis, slot, point) pairs up the
+     addresses present in both versions; a description change is found
+     here, every other difference leaves an unmatched old and/or new point;
+  2. the unmatched points are indexed by tag name: a tag that lost its old
+     address and appears at a new one has moved, the rest are removed or
+     added.
+
+Changes come out in address order (new address for added and moved
+points, old address for removed ones) and are written as text, CSV or an
+XLSX sheet with one colour per kind of change.
+
+    python iogen_diff.py OLD NEW [--map MAP] [--new-map MAP] [--csv FILE] [--xlsx FILE]
+
+Exit status is 0 when the projects have the same IO, 1 when they differ.
+"""
+import argparse
+import csv
+import datetime
+import sys
+from pathlib import Path
+
+import IO_Table_generator as iogen
+import iogen_log
+from iogen_cache import ParseCache
+from iogen_profile import profiler
+
+ADDED = 'added'
+REMOVED = 'removed'
+MOVED = 'moved'
+DESCRIPTION = 'description'
+KINDS = (ADDED, REMOVED, MOVED, DESCRIPTION)
+
+TEXT_MARKS = {ADDED: '+', REMOVED: '-', MOVED: '→', DESCRIPTION: '~'}
+# цвета строк XLSX по виду изменения
+XLSX_COLORS = {ADDED: '#C6EFCE', REMOVED: '#FFC7CE', MOVED: '#FFEB9C', DESCRIPTION: '#DDEBF7'}
+
+
+def address(p):
+    """ CHASSIS:slot:point of an IOPoint, '' for None"""
+    return f"{p.chassis}:{p.slot}:{p.point:02}" if p is not None else ''
+
+
+class IOChange(object):
+    """
+    One changed IO point.
+
+    `old` and `new` are the IOPoints of both versions: `old` is None for an
+    added point, `new` is None for a removed one. A moved point may also
+    have a changed description.
+    """
+    __slots__ = ('kind', 'old', 'new')
+
+    def __init__(self, kind, old=None, new=None):
+        self.kind = kind
+        self.old = old
+        self.new = new
+
+    @property
+    def tag(self):
+        return (self.new if self.new is not None else self.old).tag
+
+    @property
+    def description_changed(self):
+        return self.old is not None and self.new is not None and self.old.description != self.new.description
+
+    def __repr__(self):
+        return f'IOChange({self.kind!r}, {address(self.old)!r}, {address(self.new)!r}, {self.tag!r})'
+
+
+@profiler.timed('diff')
+def diff_models(old, new):
+    """ List of IOChange from model `old` to model `new`, in address order"""
+    old_points = list(old.iter_points())
+    new_points = list(new.iter_points())
+
+    # 1. сортированное слияние по адресу
+    events = []  # (kind, old, new): 'old' / 'new' — точка без пары, DESCRIPTION — изменилось описание
+    i = j = 0
+    while i < len(old_points) and j < len(new_points):
+        o = old_points[i]
+        n = new_points[j]
+        old_key = (o.chassis, o.slot, o.point)
+        new_key = (n.chassis, n.slot, n.point)
+        if old_key < new_key:
+            events.append(('old', o, None))
+            i += 1
+        elif new_key < old_key:
+            events.append(('new', None, n))
+            j += 1
+        else:
+            if o.tag != n.tag:
+                events.append(('old', o, None))
+                events.append(('new', None, n))
+            elif o.description != n.description:
+                events.append((DESCRIPTION, o, n))
+            i += 1
+            j += 1
+    events.extend(('old', o, None) for o in old_points[i:])
+    events.extend(('new', None, n) for n in new_points[j:])
+
+    # 2. индекс по тегу среди точек без пары: тег сменил адрес — перенос
+    old_by_tag = {}
+    new_tags = set()
+    for kind, o, n in events:
+        if kind == 'old':
+            old_by_tag.setdefault(o.tag, o)
+        elif kind == 'new':
+            new_tags.add(n.tag)
+
+    changes = []
+    for kind, o, n in events:
+        if kind == 'old':
+            if o.tag not in new_tags:
+                changes.append(IOChange(REMOVED, o, None))
+        elif kind == 'new':
+            moved_from = old_by_tag.get(n.tag)
+            changes.append(IOChange(ADDED, None, n) if moved_from is None else IOChange(MOVED, moved_from, n))
+        else:
+            changes.append(IOChange(DESCRIPTION, o, n))
+    profiler.count('diff points', len(old_points) + len(new_points))
+    profiler.count('diff changes', len(changes))
+    return changes
+
+
+def count_changes(changes):
+    """ {kind: number of changes} for all KINDS"""
+    counts = dict.fromkeys(KINDS, 0)
+    for change in changes:
+        counts[change.kind] += 1
+    return counts
+
+
+def load_project(input_file, map_file_name=None, old_csv_version=False, stream=False, cache=None,
+                 parallel=False, jobs=None):
+    """ Read an export into a new IOModel (see IO_Table_generator.read_input)"""
+    model = iogen.IOModel()
+    if iogen.read_input(input_file, map_file_name, old_csv_version=old_csv_version, stream=stream, model=model,
+                        cache=cache, parallel=parallel, jobs=jobs) is False:
+        raise ValueError(f"Could not read {input_file}")
+    return model
+
+
+def diff_files(old_file, new_file, map_file_name=None, new_map_file_name=None, **options):
+    """ Load two exports and diff them; the new one uses `map_file_name` unless `new_map_file_name` is given"""
+    old = load_project(old_file, map_file_name, **options)
+    new = load_project(new_file, new_map_file_name or map_file_name, **options)
+    return diff_models(old, new)
+
+
+def _one_line(text):
+    return text.replace('$N', ' ').replace('\n', ' ')
+
+
+def iter_diff_text(changes, old_name='old', new_name='new'):
+    """ Yields a readable change list: one line per point, summary first"""
+    counts = count_changes(changes)
+    yield f"🔀 {old_name} → {new_name}: " + ', '.join(f"{counts[kind]} {kind}" for kind in KINDS)
+    for change in changes:
+        o, n = change.old, change.new
+        mark = TEXT_MARKS[change.kind]
+        if change.kind == ADDED:
+            yield f"\n{mark} {address(n):<16} {n.tag:<28} {_one_line(n.description)}"
+        elif change.kind == REMOVED:
+            yield f"\n{mark} {address(o):<16} {o.tag:<28} {_one_line(o.description)}"
+        elif change.kind == MOVED:
+            yield f"\n{mark} {address(n):<16} {n.tag:<28} from {address(o)}"
+        if change.description_changed:
+            yield (f"\n{TEXT_MARKS[DESCRIPTION] if change.kind == DESCRIPTION else ' '} {address(n):<16} "
+                   f"{n.tag:<28} '{_one_line(o.description)}' → '{_one_line(n.description)}'")
+
+
+def write_diff_text(changes, old_name='old', new_name='new', out=None):
+    iogen._print_lines(iter_diff_text(changes, old_name, new_name), out)
+
+
+CSV_COLUMNS = ('Change', 'Tag', 'Old address', 'New address', 'Old description', 'New description')
+
+
+def _row(change):
+    o, n = change.old, change.new
+    return (change.kind, change.tag, address(o), address(n),
+            o.description if o is not None else '', n.description if n is not None else '')
+
+
+def write_diff_csv(out_file_name, changes, sep=','):
+    """ CSV, one row per change (UTF-8 with BOM, so Excel shows Cyrillic descriptions)"""
+    with open(out_file_name, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f, delimiter=sep)
+        writer.writerow(CSV_COLUMNS)
+        writer.writerows(map(_row, changes))
+
+
+@profiler.timed('diff.xlsx')
+def write_diff_xlsx(out_file_name, changes, old_name='old', new_name='new'):
+    """
+    XLSX sheet of the changes: summary on top, then one row per change
+    coloured by its kind, with an autofilter over the table. Written row
+    by row in constant_memory mode.
+    """
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(out_file_name, {'constant_memory': True})
+    date_format = workbook.add_format({'num_format': 'mmmm d yyyy'})
+    header_format = workbook.add_format({'bold': True, 'bottom': 1})
+    kind_formats = {kind: workbook.add_format({'bg_color': color}) for kind, color in XLSX_COLORS.items()}
+    worksheet = workbook.add_worksheet('IO changes')
+
+    worksheet.write_string(0, 0, 'Created at')
+    worksheet.write_datetime(0, 1, datetime.datetime.now(), date_format)
+    worksheet.write_string(1, 0, 'Old project')
+    worksheet.write_string(1, 1, str(old_name))
+    worksheet.write_string(2, 0, 'New project')
+    worksheet.write_string(2, 1, str(new_name))
+    row = 4
+    for kind, count in count_changes(changes).items():
+        worksheet.write_string(row, 0, kind, kind_formats[kind])
+        worksheet.write_number(row, 1, count)
+        row += 1
+
+    row += 1
+    first_row = row
+    for widths in ((0, 12), (1, 28), (2, 16), (3, 16), (4, 45), (5, 45)):
+        worksheet.set_column(widths[0], widths[0], widths[1])
+    for col, title in enumerate(CSV_COLUMNS):
+        worksheet.write_string(row, col, title, header_format)
+    worksheet.freeze_panes(row + 1, 0)
+    for change in changes:
+        row += 1
+        cell_format = kind_formats[change.kind]
+        for col, value in enumerate(_row(change)):
+            worksheet.write_string(row, col, value.replace('$N', '\r') if col >= 4 else value, cell_format)
+    worksheet.autofilter(first_row, 0, row, len(CSV_COLUMNS) - 1)
+
+    with profiler.stage('xlsx.close'):
+        workbook.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('old_file', help="Older CSV or L5X export")
+    parser.add_argument('new_file', help="Newer CSV or L5X export")
+    parser.add_argument('--map', help="Substitution file (for N11/N68 mapping)")
+    parser.add_argument('--new-map', help="Substitution file of the newer project (default: --map)")
+    parser.add_argument('--old', action='store_true', help="CSV was generated by old version of RSLogix")
+    parser.add_argument('--stream', action='store_true',
+                        help="Read L5X incrementally, without loading the whole project into memory")
+    parser.add_argument('--parallel', action='store_true',
+                        help="Read the programs of an L5X project in parallel worker processes (see --jobs)")
+    parser.add_argument('--jobs', type=int, default=None, help="Number of worker processes for --parallel")
+    parser.add_argument('--csv', metavar='FILE', help="Write the changes as CSV")
+    parser.add_argument('--xlsx', metavar='FILE', help="Write the changes as a highlighted XLSX sheet")
+    parser.add_argument('--summary', action='store_true', help="Print only the number of changes of each kind")
+    parser.add_argument('--cache-dir', default=None,
+                        help="Directory for cached parse results (default: per-user cache directory)")
+    parser.add_argument('--no-cache', action='store_true', help="Always parse the inputs, do not use the parse cache")
+    parser.add_argument('--log-level', default='WARNING', help="Log level of the readers (default: WARNING)")
+    parser.add_argument('--profile', action='store_true', help="Print stage timings and counters at the end of the run")
+    args = parser.parse_args()
+
+    iogen_log.configure_logging(level=args.log_level.upper(), stream=sys.stderr)
+    if args.profile:
+        profiler.enable()
+    for path in (args.old_file, args.new_file, args.map, args.new_map):
+        if path is not None and not Path(path).is_file():
+            parser.error(f"no such file: {path}")
+
+    try:
+        changes = diff_files(args.old_file, args.new_file, args.map, args.new_map, old_csv_version=args.old,
+                             stream=args.stream, cache=None if args.no_cache else ParseCache(args.cache_dir),
+                             parallel=args.parallel, jobs=args.jobs)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        raise SystemExit(2)
+
+    old_name, new_name = Path(args.old_file).name, Path(args.new_file).name
+    if args.summary:
+        print(next(iter_diff_text(changes, old_name, new_name)))
+    else:
+        write_diff_text(changes, old_name, new_name)
+    if args.csv:
+        write_diff_csv(args.csv, changes)
+    if args.xlsx:
+        write_diff_xlsx(args.xlsx, changes, args.old_file, args.new_file)
+
+    if profiler.enabled:
+        print("\n⏱ Profile:")
+        print(profiler.summary())
+    raise SystemExit(1 if changes else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Logging setup for the IO table generator.
+
+The readers log through a small logger hierarchy:
+
+    iogen                 read_input, cache, writers
+    iogen.csv             CSV reader
+    iogen.l5x             L5X readers
+    iogen.map             N11/N68 map files
+    iogen.alias           alias tags that were skipped
+    iogen.alias.<chassis> alias tags parsed into a chassis
+    iogen.watch           --watch: changed files
+
+Per-tag messages are DEBUG records guarded by isEnabledFor(), so a normal
+run at INFO only pays for one level check per tag. Console output is the
+bare message, exactly as the old print() calls looked; the optional
+JSON-lines handler writes one object per record with the `extra` fields.
+"""
+import contextlib
+import datetime
+import json
+import logging
+import sys
+
+ROOT = 'iogen'
+_STANDARD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+_config = {}
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """ One JSON object per record: time, level, logger, message and any `extra` fields"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        for name, value in vars(record).items():
+            if name not in _STANDARD_ATTRS and not name.startswith('_'):
+                entry[name] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def _logger_name(name):
+    """ 'map' → 'iogen.map'; full names are kept"""
+    return name if name == ROOT or name.startswith(ROOT + '.') else f'{ROOT}.{name}'
+
+
+def parse_levels(specs):
+    """
+    Turn --log-level values into {logger name: level}.
+    A spec is either LEVEL (for 'iogen') or NAME=LEVEL, e.g. 'map=DEBUG'.
+    """
+    levels = {}
+    for spec in specs or ():
+        name, _, level = spec.rpartition('=')
+        level = level.strip().upper()
+        if not isinstance(logging.getLevelName(level), int):
+            raise ValueError(f"Unknown log level '{level}'")
+        levels[_logger_name(name.strip()) if name else ROOT] = level
+    return levels
+
+
+def configure_logging(level='INFO', levels=None, json_path=None, stream=None, debug_chassis=()):
+    """
+    (Re)configure the `iogen` loggers. Calling it again replaces the previous setup.
+
+    Args:
+        level (str | int): Level of the `iogen` logger.
+        levels (dict | None): Per-component levels, {'iogen.map': 'DEBUG', ...} (see parse_levels).
+        json_path (str | Path | None): Also append records as JSON lines to this file.
+        stream: Console stream, sys.stdout if None.
+        debug_chassis (iterable of str): Chassis whose parsed tags are logged at DEBUG.
+    """
+    _config.clear()
+    _config.update(level=level, levels=dict(levels or {}), json_path=json_path, debug_chassis=tuple(debug_chassis))
+
+    logger = logging.getLogger(ROOT)
+    for handler in list(logger.handlers):
+        if getattr(handler, '_iogen', False):
+            logger.removeHandler(handler)
+            handler.close()
+
+    console = logging.StreamHandler(stream if stream is not None else sys.stdout)
+    console.setFormatter(logging.Formatter('%(message)s'))
+    console._iogen = 'console'
+    logger.addHandler(console)
+
+    if json_path:
+        json_handler = logging.FileHandler(json_path, encoding='utf-8')
+        json_handler.setFormatter(JsonLinesFormatter())
+        json_handler._iogen = 'json'
+        logger.addHandler(json_handler)
+
+    logger.setLevel(level)
+    logger.propagate = False
+    for name, component_level in _config['levels'].items():
+        logging.getLogger(name).setLevel(component_level)
+    for chassis in _config['debug_chassis']:
+        logging.getLogger(f'{ROOT}.alias.{chassis}').setLevel(logging.DEBUG)
+
+
+def reconfigure(config):
+    """ Apply a setup returned by current_config() (process pool initializer)"""
+    if config:
+        configure_logging(**config)
+
+
+def current_config():
+    """ Arguments of the last configure_logging() call, without the stream"""
+    return dict(_config)
+
+
+@contextlib.contextmanager
+def verbose(enabled, name=f'{ROOT}.alias'):
+    """ Lower a logger to DEBUG for the duration of a block (the readers' `debug` flag)"""
+    logger = logging.getLogger(name)
+    if not enabled or logger.isEnabledFor(logging.DEBUG):
+        yield
+        return
+    previous = logger.level
+    logger.setLevel(logging.DEBUG)
+    try:
+        yield
+    finally:
+        logger.setLevel(previous)
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self, records=None):
+        super().__init__()
+        self.records = [] if records is None else records
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@contextlib.contextmanager
+def captured(records=None):
+    """
+    Collect `iogen` records into a list (`records` if given) and keep them
+    off the console (batch and parallel workers). Other handlers, e.g. the
+    JSON file, still get them.
+    """
+    logger = logging.getLogger(ROOT)
+    collector = _ListHandler(records)
+    muted = [h for h in logger.handlers if getattr(h, '_iogen', None) == 'console']
+    levels = [h.level for h in muted]
+    for handler in muted:
+        handler.setLevel(logging.CRITICAL + 1)
+    logger.addHandler(collector)
+    try:
+        yield collector.records
+    finally:
+        logger.removeHandler(collector)
+        for handler, handler_level in zip(muted, levels):
+            handler.setLevel(handler_level)
+
+
+@contextlib.contextmanager
+def recorded(records=None, level=logging.WARNING):
+    """
+    Also collect `iogen` records of `level` and above into a list while they
+    are logged as usual (the parse cache keeps a reader's warnings this way).
+    """
+    logger = logging.getLogger(ROOT)
+    collector = _ListHandler(records)
+    collector.setLevel(level)
+    logger.addHandler(collector)
+    try:
+        yield collector.records
+    finally:
+        logger.removeHandler(collector)
+
+
+def tracing(name=f'{ROOT}.alias'):
+    """ True when DEBUG records of `name` or of a logger below it are logged (per-tag traces)"""
+    if logging.getLogger(name).isEnabledFor(logging.DEBUG):
+        return True
+    prefix = name + '.'
+    return any(child.startswith(prefix) and logger.isEnabledFor(logging.DEBUG)
+               for child, logger in list(logging.Logger.manager.loggerDict.items())
+               if isinstance(logger, logging.Logger))
@@ -44,6 +44,13 @@ class Ui_MainWindow(object):
         self.checkBox_useKip.setChecked(True)
         self.checkBox_useKip.setObjectName("checkBox_useKip")
         self.verticalLayout_2.addWidget(self.checkBox_useKip)
+        self.checkBox_watch = QtWidgets.QCheckBox(parent=self.centralwidget)
+        self.checkBox_watch.setObjectName("checkBox_watch")
+        self.verticalLayout_2.addWidget(self.checkBox_watch)
+        self.checkBox_debug = QtWidgets.QCheckBox(parent=self.centralwidget)
+        self.checkBox_debug.setChecked(False)
+        self.checkBox_debug.setObjectName("checkBox_debug")
+        self.verticalLayout_2.addWidget(self.checkBox_debug)
         spacerItem1 = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Policy.Minimum, QtWidgets.QSizePolicy.Policy.Expanding)
         self.verticalLayout_2.addItem(spacerItem1)
         self.gridLayout_2.addLayout(self.verticalLayout_2, 9, 0, 1, 1)
@@ -98,7 +105,43 @@ class Ui_MainWindow(object):
         MainWindow.setMenuBar(self.menubar)
         self.statusbar = QtWidgets.QStatusBar(parent=MainWindow)
         self.statusbar.setObjectName("statusbar")
+        self.progress_bar = QtWidgets.QProgressBar(parent=self.statusbar)
+        self.progress_bar.setMaximumSize(QtCore.QSize(250, 16777215))
+        self.progress_bar.setMaximum(1000)
+        self.progress_bar.setProperty("value", 0)
+        self.progress_bar.setObjectName("progress_bar")
+        self.pushButton_cancelLoad = QtWidgets.QPushButton(parent=self.statusbar)
+        self.pushButton_cancelLoad.setObjectName("pushButton_cancelLoad")
         MainWindow.setStatusBar(self.statusbar)
+        self.find_dock = QtWidgets.QDockWidget(parent=MainWindow)
+        self.find_dock.setObjectName("find_dock")
+        self.find_widget = QtWidgets.QWidget()
+        self.find_widget.setObjectName("find_widget")
+        self.find_layout = QtWidgets.QVBoxLayout(self.find_widget)
+        self.find_layout.setContentsMargins(0, 0, 0, 0)
+        self.find_layout.setObjectName("find_layout")
+        self.find_edit = QtWidgets.QLineEdit(parent=self.find_widget)
+        self.find_edit.setClearButtonEnabled(True)
+        self.find_edit.setObjectName("find_edit")
+        self.find_layout.addWidget(self.find_edit)
+        self.find_results = QtWidgets.QListWidget(parent=self.find_widget)
+        self.find_results.setObjectName("find_results")
+        self.find_layout.addWidget(self.find_results)
+        self.find_dock.setWidget(self.find_widget)
+        MainWindow.addDockWidget(QtCore.Qt.DockWidgetArea(2), self.find_dock)
+        self.profile_dock = QtWidgets.QDockWidget(parent=MainWindow)
+        self.profile_dock.setObjectName("profile_dock")
+        self.profile_widget = QtWidgets.QWidget()
+        self.profile_widget.setObjectName("profile_widget")
+        self.profile_layout = QtWidgets.QVBoxLayout(self.profile_widget)
+        self.profile_layout.setContentsMargins(0, 0, 0, 0)
+        self.profile_layout.setObjectName("profile_layout")
+        self.profile_view = QtWidgets.QPlainTextEdit(parent=self.profile_widget)
+        self.profile_view.setReadOnly(True)
+        self.profile_view.setObjectName("profile_view")
+        self.profile_layout.addWidget(self.profile_view)
+        self.profile_dock.setWidget(self.profile_widget)
+        MainWindow.addDockWidget(QtCore.Qt.DockWidgetArea(8), self.profile_dock)
 
         self.retranslateUi(MainWindow)
         QtCore.QMetaObject.connectSlotsByName(MainWindow)
@@ -111,6 +154,10 @@ class Ui_MainWindow(object):
         self.pushButton_load.setText(_translate("MainWindow", "Load"))
         self.pushButton_drop.setText(_translate("MainWindow", "Drop"))
         self.checkBox_useKip.setText(_translate("MainWindow", "Convert tag name to kip"))
+        self.checkBox_watch.setToolTip(_translate("MainWindow", "Reload the project and write the XLSX file whenever the input or map file changes"))
+        self.checkBox_watch.setText(_translate("MainWindow", "Watch files (reload and save XLSX)"))
+        self.checkBox_debug.setToolTip(_translate("MainWindow", "Log every parsed and skipped alias tag (slows down loading of large projects)"))
+        self.checkBox_debug.setText(_translate("MainWindow", "Debug log"))
         self.label_2.setText(_translate("MainWindow", "Map file info here"))
         self.pushButton_wipeMap.setText(_translate("MainWindow", "Wipe map"))
         self.label.setText(_translate("MainWindow", "L5X Project File Info here"))
@@ -119,3 +166,7 @@ class Ui_MainWindow(object):
         self.pushButton_3.setText(_translate("MainWindow", "Select map:"))
         self.pushButton_selectOutDir.setText(_translate("MainWindow", "XLSX save to:"))
         self.pushButton_Save.setText(_translate("MainWindow", "Save"))
+        self.pushButton_cancelLoad.setText(_translate("MainWindow", "Cancel"))
+        self.find_dock.setWindowTitle(_translate("MainWindow", "Find"))
+        self.find_edit.setPlaceholderText(_translate("MainWindow", "Tag, KIP (PT-1024) or description"))
+        self.profile_dock.setWindowTitle(_translate("MainWindow", "Load profile"))
@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Предпросмотр таблицы IO в GUI.
+
+Вместо текстовой таблицы (write_table) используется QAbstractTableModel
+поверх IOModel: одно шасси на экране, строки — каналы, столбцы — все слоты
+шасси. Ячейки не готовятся заранее, data() читает точку из IOModel только
+для видимых ячеек, поэтому открытие не зависит от размера проекта.
+Описание точки показывается во всплывающей подсказке; строка фильтра
+подсвечивает совпадения по тегу и описанию во всех шасси (IOIndex).
+"""
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer
+from PyQt6.QtGui import QBrush, QColor, QFontDatabase
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QComboBox, QLineEdit, QLabel, QTableView, \
+    QPushButton, QAbstractItemView, QHeaderView
+
+import IO_Table_generator as iogen
+
+MATCH_BRUSH = QBrush(QColor(255, 235, 130))
+DIMMED_BRUSH = QBrush(QColor(160, 160, 160))
+
+
+class IOTableModel(QAbstractTableModel):
+    """
+    Каналы одного шасси IOModel: строка — номер канала, столбец — слот.
+
+    Args:
+        model (IOModel): Данные; модель читает их при каждом запросе ячейки.
+    """
+
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self._model = model
+        self._chassis = None
+        self._slots = []
+        self._slot_points = []  # dict point → IOPoint для каждого столбца
+        self._rows = 0
+        self._matches = None  # {(slot, point)} совпадений фильтра в этом шасси, None — фильтра нет
+
+    def chassis(self):
+        return self._chassis
+
+    def setChassis(self, chassis):
+        self.beginResetModel()
+        self._chassis = chassis
+        self._slots = self._model.slots(chassis) if chassis is not None else []
+        self._slot_points = [self._model.slot_points(chassis, slot) for slot in self._slots]
+        self._rows = max((max(points) + 1 for points in self._slot_points if points), default=0)
+        self.endResetModel()
+
+    def setMatches(self, matches):
+        """ Подсветить точки {(slot, point)} (None — снять подсветку)"""
+        self._matches = matches
+        if self._rows and self._slots:
+            self.dataChanged.emit(self.index(0, 0), self.index(self._rows - 1, len(self._slots) - 1),
+                                  [Qt.ItemDataRole.BackgroundRole, Qt.ItemDataRole.ForegroundRole])
+
+    def indexOf(self, slot, point):
+        try:
+            return self.index(point, self._slots.index(slot))
+        except ValueError:
+            return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._rows
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._slots)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        point = self._slot_points[index.column()].get(index.row())
+        if role == Qt.ItemDataRole.DisplayRole:
+            return iogen.tag2kip(point.tag) if point is not None else None
+        if point is None:
+            return None
+        if role == Qt.ItemDataRole.ToolTipRole:
+            address = f"{point.chassis}:{point.slot}:{point.point:02}"
+            return f"{point.tag}\n{address}" + (f"\n\n{point.description}" if point.description else "")
+        if self._matches is not None:
+            matched = (point.slot, point.point) in self._matches
+            if role == Qt.ItemDataRole.BackgroundRole and matched:
+                return MATCH_BRUSH
+            if role == Qt.ItemDataRole.ForegroundRole and not matched:
+                return DIMMED_BRUSH
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return f"SLOT {self._slots[section]}" if section < len(self._slots) else None
+        return f"{section:02}"
+
+
+class PreviewDialog(QDialog):
+    """Просмотр таблицы IO: выбор шасси, фильтр, подсказки с описаниями"""
+
+    def __init__(self, model=None, parent=None, index=None, focus=None):
+        """index — готовый IOIndex модели (иначе строится при первом фильтре), focus — (шасси, слот, канал)"""
+        super().__init__(parent)
+        self._model = iogen.default_model if model is None else model
+        self._index = index
+        self._matches = []
+        self._by_chassis = {}
+        self._current = -1  # номер совпадения, выбранного по Enter
+
+        self.setWindowTitle("Preview Table")
+        layout = QVBoxLayout(self)
+
+        top = QHBoxLayout()
+        self.chassis_box = QComboBox(self)
+        self.chassis_box.setSizeAdjustPolicy(QComboBox.SizeAdjustPolicy.AdjustToContents)
+        for chassis in self._model.chassis():
+            self.chassis_box.addItem(chassis, chassis)
+        top.addWidget(QLabel("Chassis:", self))
+        top.addWidget(self.chassis_box)
+        self.filter_edit = QLineEdit(self)
+        self.filter_edit.setPlaceholderText("Filter: tag or description, Enter — next match")
+        self.filter_edit.setClearButtonEnabled(True)
+        top.addWidget(self.filter_edit, 1)
+        self.match_label = QLabel(self)
+        top.addWidget(self.match_label)
+        layout.addLayout(top)
+
+        self.table_model = IOTableModel(self._model, self)
+        self.view = QTableView(self)
+        self.view.setModel(self.table_model)
+        self.view.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        self.view.setWordWrap(False)
+        self.view.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        # фиксированная ширина столбцов: размер по содержимому запросил бы все ячейки
+        self.view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.view.horizontalHeader().setDefaultSectionSize(self.view.fontMetrics().horizontalAdvance('W' * 16))
+        self.view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        layout.addWidget(self.view)
+
+        close_button = QPushButton("Close", self)
+        close_button.clicked.connect(self.accept)
+        layout.addWidget(close_button)
+
+        # фильтр применяется после паузы в наборе, а не на каждую букву
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(150)
+        self._filter_timer.timeout.connect(self.applyFilter)
+
+        self.chassis_box.currentIndexChanged.connect(self.onChassisChanged)
+        self.filter_edit.textChanged.connect(self._filter_timer.start)
+        self.filter_edit.returnPressed.connect(self.nextMatch)
+        self.onChassisChanged(self.chassis_box.currentIndex())
+        if focus is not None:
+            self.showPoint(*focus)
+
+    def showPoint(self, chassis, slot, point):
+        if chassis != self.table_model.chassis():
+            self.chassis_box.setCurrentIndex(self.chassis_box.findData(chassis))
+        index = self.table_model.indexOf(slot, point)
+        self.view.setCurrentIndex(index)
+        self.view.scrollTo(index, QAbstractItemView.ScrollHint.PositionAtCenter)
+
+    def onChassisChanged(self, index):
+        chassis = self.chassis_box.itemData(index) if index >= 0 else None
+        self.table_model.setChassis(chassis)
+        self.table_model.setMatches(self._by_chassis.get(chassis, set()) if self.filter_edit.text() else None)
+
+    def applyFilter(self):
+        text = self.filter_edit.text()
+        self._current = -1
+        if not text:
+            self._matches = []
+            self._by_chassis = {}
+            self.match_label.clear()
+            self.table_model.setMatches(None)
+            return
+        if self._index is None:
+            self._index = iogen.IOIndex(self._model)
+        self._matches = [(p.chassis, p.slot, p.point) for p in self._index.search(text)]
+        self._by_chassis = {}
+        for chassis, slot, point in self._matches:
+            self._by_chassis.setdefault(chassis, set()).add((slot, point))
+        self.match_label.setText(f"{len(self._matches)} match(es) in {len(self._by_chassis)} chassis")
+        chassis = self.table_model.chassis()
+        if self._matches and chassis not in self._by_chassis:
+            self.nextMatch()  # показать первое шасси с совпадениями
+        else:
+            self.table_model.setMatches(self._by_chassis.get(chassis, set()))
+
+    def nextMatch(self):
+        if self._filter_timer.isActive():
+            self._filter_timer.stop()
+            self.applyFilter()
+            return
+        if not self._matches:
+            return
+        self._current = (self._current + 1) % len(self._matches)
+        self.showPoint(*self._matches[self._current])
@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Stage timers and counters of a load/export run.
+
+The readers and writers wrap their stages in `profiler.stage(name)` and
+report totals with `profiler.count(name, n)`. While the profiler is
+disabled (the default) a stage costs one attribute check, so the hooks
+stay in place in normal runs.
+
+Stage times are inclusive: a stage nested in another one (decoding inside
+the L5X parse of the streaming reader) is also part of the outer time.
+Selected stages can additionally be run under cProfile, and tracemalloc
+can record the peak traced memory of every stage.
+
+`import_report()` measures startup: import times of modules in a fresh
+interpreter (python -X importtime). cProfile, pstats and tracemalloc are
+imported only when a profile asks for them.
+"""
+import contextlib
+import functools
+import io
+import os
+import sys
+import time
+
+_NULL = contextlib.nullcontext()
+
+
+class RunProfile(object):
+    """
+    Timers and counters of one run.
+
+    Args:
+        enabled (bool): Record stages; a disabled profiler only keeps counters.
+        cprofile_stages (iterable of str): Stages to run under cProfile ('*' — all outermost stages).
+        trace_memory (bool): Record the peak traced memory of each stage (slows the run down).
+    """
+
+    def __init__(self, enabled=False, cprofile_stages=(), trace_memory=False):
+        self.enabled = enabled
+        self.cprofile_stages = set(cprofile_stages)
+        self.trace_memory = trace_memory
+        self.stages = {}  # name → [seconds, calls, peak bytes]
+        self.counters = {}
+        self.profiles = {}  # stage name → pstats.Stats
+        self._depth = 0
+        self._memory = []
+        self._profiling = False  # one cProfile at a time, nested stages are part of it
+
+    def enable(self, cprofile_stages=(), trace_memory=False):
+        self.enabled = True
+        self.cprofile_stages = set(cprofile_stages)
+        self.trace_memory = trace_memory
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        self.stages.clear()
+        self.counters.clear()
+        self.profiles.clear()
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def stage(self, name):
+        """ Context manager timing a stage; a no-op while the profiler is disabled"""
+        if not self.enabled:
+            return _NULL
+        return self._stage(name)
+
+    def timed(self, name):
+        """ Decorator running a whole function as a stage"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    @contextlib.contextmanager
+    def _stage(self, name):
+        record = self.stages.setdefault(name, [0.0, 0, 0])
+        profile = None
+        if not self._profiling and (name in self.cprofile_stages or
+                                    ('*' in self.cprofile_stages and self._depth == 0)):
+            import cProfile
+            profile = cProfile.Profile()
+            self._profiling = True
+        if self.trace_memory:
+            self._memory_enter()
+        self._depth += 1
+        started = time.perf_counter()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+                self._profiling = False
+            elapsed = time.perf_counter() - started
+            self._depth -= 1
+            record[0] += elapsed
+            record[1] += 1
+            if self.trace_memory:
+                record[2] = max(record[2], self._memory_exit())
+            if profile is not None:
+                if name in self.profiles:
+                    self.profiles[name].add(profile)
+                else:
+                    import pstats
+                    self.profiles[name] = pstats.Stats(profile)
+
+    def _memory_enter(self):
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if self._memory:
+            # the peak so far belongs to the enclosing stage
+            self._memory[-1] = max(self._memory[-1], tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        self._memory.append(0)
+
+    def _memory_exit(self):
+        import tracemalloc
+        peak = max(self._memory.pop(), tracemalloc.get_traced_memory()[1])
+        if self._memory:
+            self._memory[-1] = max(self._memory[-1], peak)
+        else:
+            tracemalloc.stop()
+        return peak
+
+    def summary_lines(self, top=15):
+        """ Text report: stages, counters and the top functions of cProfile'd stages"""
+        if self.stages:
+            yield f"{'Stage':<26} {'Time,s':>9} {'Calls':>7}" + (f" {'Peak,MB':>9}" if self.trace_memory else '')
+            yield '-' * (44 + (10 if self.trace_memory else 0))
+            for name, (seconds, calls, peak) in self.stages.items():
+                line = f"{name:<26} {seconds:>9.3f} {calls:>7}"
+                if self.trace_memory:
+                    line += f" {peak / (1 << 20):>9.1f}"
+                yield line
+        if self.counters:
+            yield ''
+            for name, value in self.counters.items():
+                yield f"{name:<26} {value:>9}"
+        for name, stats in self.profiles.items():
+            out = io.StringIO()
+            stats.stream = out
+            stats.sort_stats('cumulative').print_stats(top)
+            yield ''
+            yield f"cProfile: {name}"
+            yield out.getvalue().rstrip()
+
+    def summary(self, top=15):
+        return '\n'.join(self.summary_lines(top))
+
+
+def import_report(modules, top=15):
+    """
+    Import `modules` one after another in a fresh interpreter with -X importtime.
+
+    Each module's time includes only what it imports on top of the ones
+    before it (e.g. ['IO_Table_generator', 'xlsxwriter'] gives the cost of a
+    lazily imported library at first use). Returns text: the time of every
+    module and the `top` slowest modules they pulled in.
+    """
+    import subprocess
+
+    code = '; '.join(f'import {name}' for name in modules)
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    wall = time.perf_counter() - started
+    if result.returncode:
+        return f"import failed:\n{result.stderr.strip()}"
+
+    # importtime lists a module after its imports, indented two spaces per level
+    totals = {}
+    pulled = []  # (cumulative us, name) of the direct imports of the requested modules
+    children = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        name = name.strip()
+        if depth == 1:
+            children.append((int(cumulative), name))
+        elif depth == 0:
+            if name in modules:
+                totals[name] = int(cumulative)
+                pulled += children
+            children = []
+
+    lines = [f"{'Module':<32} {'Import,ms':>10}", '-' * 43]
+    for name in modules:
+        lines.append(f"{name:<32} {totals.get(name, 0) / 1000:>10.1f}")
+    lines.append(f"{'interpreter run, wall':<32} {wall * 1000:>10.1f}")
+    lines += ['', f"{'Slowest imports (cumulative)':<32} {'ms':>10}", '-' * 43]
+    for cumulative, name in sorted(pulled, reverse=True)[:top]:
+        lines.append(f"{name:<32} {cumulative / 1000:>10.1f}")
+    return '\n'.join(lines)
+
+
+profiler = RunProfile()
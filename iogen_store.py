@@ -0,0 +1,287 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+SQLite archive of parsed IO allocations: one revision per controller export.
+
+A revision keeps every point of the model (chassis, slot, point, tag, tag
+without program, KIP name, description and the AliasFor address it was
+parsed from) plus the slot list, so `load()` rebuilds an IOModel that
+renders exactly like the parsed one, without reading the L5X again.
+
+Points of a revision are written with one executemany in one transaction
+and clustered by (revision, chassis, slot, point) (a WITHOUT ROWID table),
+so reading a revision back is a single range scan. Secondary indexes on
+tag, name, KIP name and address serve lookups across projects and revisions.
+
+    python iogen_store.py DB save INPUT [MAP] [--project P] [--revision R]
+    python iogen_store.py DB list [PROJECT]
+    python iogen_store.py DB find TAG_OR_KIP [--project P]
+    python iogen_store.py DB show PROJECT [REVISION] [--print] [--xlsx FILE]
+"""
+import argparse
+import datetime
+import json
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+import IO_Table_generator as iogen
+import iogen_log
+from iogen_profile import profiler
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS revisions (
+    id INTEGER PRIMARY KEY,
+    project TEXT NOT NULL,
+    revision TEXT NOT NULL,
+    source TEXT NOT NULL DEFAULT '',
+    created TEXT NOT NULL,
+    points INTEGER NOT NULL DEFAULT 0,
+    stats TEXT NOT NULL DEFAULT '{}',
+    UNIQUE (project, revision)
+);
+CREATE TABLE IF NOT EXISTS slots (
+    revision_id INTEGER NOT NULL REFERENCES revisions(id) ON DELETE CASCADE,
+    chassis TEXT NOT NULL,
+    slot INTEGER NOT NULL,
+    PRIMARY KEY (revision_id, chassis, slot)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS points (
+    revision_id INTEGER NOT NULL REFERENCES revisions(id) ON DELETE CASCADE,
+    chassis TEXT NOT NULL,
+    slot INTEGER NOT NULL,
+    point INTEGER NOT NULL,
+    tag TEXT NOT NULL,
+    name TEXT NOT NULL,
+    kip TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    alias TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (revision_id, chassis, slot, point)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS points_tag ON points (tag COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS points_name ON points (name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS points_kip ON points (kip COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS points_address ON points (chassis, slot, point);
+"""
+
+
+class PointStore(object):
+    """
+    A point archive in an SQLite file (created on first use).
+
+    Args:
+        path (str | Path): Database file, ':memory:' for a temporary store.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        if path != ':memory:':
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(path))
+        self.db.execute('PRAGMA foreign_keys = ON')
+        if path != ':memory:':
+            self.db.execute('PRAGMA journal_mode = WAL')
+            self.db.execute('PRAGMA synchronous = NORMAL')
+        version = self.db.execute('PRAGMA user_version').fetchone()[0]
+        if version > SCHEMA_VERSION:
+            self.db.close()
+            raise ValueError(f"{path}: point store schema {version} is newer than this program ({SCHEMA_VERSION})")
+        with self.db:
+            self.db.executescript(SCHEMA)
+            self.db.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- запись -------------------------------------------------------------------------------------------------------
+    @profiler.timed('store.save')
+    def save(self, model, project, revision, source='', replace=False):
+        """
+        Store all points of `model` as `revision` of `project`, returns the revision id.
+        An existing revision is overwritten only with replace=True (ValueError otherwise).
+        """
+        model = iogen._model(model)
+        with self.db:
+            row = self.db.execute('SELECT id FROM revisions WHERE project = ? AND revision = ?',
+                                  (project, revision)).fetchone()
+            if row is not None:
+                if not replace:
+                    raise ValueError(f"Revision '{revision}' of '{project}' is already stored")
+                self.db.execute('DELETE FROM revisions WHERE id = ?', row)
+            revision_id = self.db.execute(
+                'INSERT INTO revisions (project, revision, source, created, points, stats) VALUES (?, ?, ?, ?, ?, ?)',
+                (project, revision, str(source), datetime.datetime.now().isoformat(timespec='seconds'),
+                 len(model), json.dumps(model.stats, default=str))).lastrowid
+            self.db.executemany('INSERT INTO slots VALUES (?, ?, ?)',
+                                ((revision_id, chassis, slot) for chassis in model.chassis()
+                                 for slot in model.slots(chassis)))
+            # точки в порядке адреса — в порядке первичного ключа
+            self.db.executemany('INSERT INTO points VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                                self._point_rows(revision_id, model))
+        profiler.count('stored points', len(model))
+        return revision_id
+
+    @staticmethod
+    def _point_rows(revision_id, model):
+        for p in model.iter_points():
+            name = p.tag.rpartition('/')[2]
+            # имя КИП без учёта iogen.use_kip_tag
+            yield revision_id, p.chassis, p.slot, p.point, p.tag, name, iogen._kip_name(name), p.description, p.alias
+
+    def delete(self, project, revision):
+        """ Remove a revision, returns False if there was none"""
+        with self.db:
+            return self.db.execute('DELETE FROM revisions WHERE project = ? AND revision = ?',
+                                   (project, revision)).rowcount > 0
+
+    # --- чтение -------------------------------------------------------------------------------------------------------
+    def projects(self):
+        return [name for name, in self.db.execute('SELECT DISTINCT project FROM revisions ORDER BY project')]
+
+    def revisions(self, project=None):
+        """ [(project, revision, created, points, source)], oldest first"""
+        sql = 'SELECT project, revision, created, points, source FROM revisions'
+        if project is not None:
+            return self.db.execute(sql + ' WHERE project = ? ORDER BY id', (project,)).fetchall()
+        return self.db.execute(sql + ' ORDER BY project, id').fetchall()
+
+    def _revision_id(self, project, revision=None):
+        if revision is None:
+            row = self.db.execute('SELECT id FROM revisions WHERE project = ? ORDER BY id DESC LIMIT 1',
+                                  (project,)).fetchone()
+        else:
+            row = self.db.execute('SELECT id FROM revisions WHERE project = ? AND revision = ?',
+                                  (project, revision)).fetchone()
+        if row is None:
+            raise KeyError(f"No stored revision '{revision or 'latest'}' of '{project}'")
+        return row[0]
+
+    @profiler.timed('store.load')
+    def load(self, project, revision=None, model=None):
+        """
+        Rebuild the points of a stored revision (the latest if None) into `model`
+        (a new IOModel if None) and return the model. Raises KeyError if not stored.
+        """
+        revision_id = self._revision_id(project, revision)
+        stats, = self.db.execute('SELECT stats FROM revisions WHERE id = ?', (revision_id,)).fetchone()
+        rows = self.db.execute('SELECT chassis, slot, point, tag, description, alias FROM points '
+                               'WHERE revision_id = ?', (revision_id,)).fetchall()
+        columns = list(zip(*rows)) or [()] * 6
+        table = dict(zip(('chassis', 'slot', 'point', 'tag', 'description', 'alias'), columns))
+        table['slots'] = self.db.execute('SELECT chassis, slot FROM slots WHERE revision_id = ?',
+                                         (revision_id,)).fetchall()
+        table['stats'] = json.loads(stats)
+        model = iogen.IOModel() if model is None else model
+        model.load_columns(table)
+        return model
+
+    def find(self, name, project=None):
+        """
+        Where a tag (with or without the program prefix) or KIP name was wired in every stored revision:
+        [(project, revision, chassis, slot, point, tag, description)]
+        """
+        sql = ('SELECT r.project, r.revision, p.chassis, p.slot, p.point, p.tag, p.description '
+               'FROM points p JOIN revisions r ON r.id = p.revision_id '
+               'WHERE (p.tag = ?1 COLLATE NOCASE OR p.name = ?1 COLLATE NOCASE OR p.kip = ?1 COLLATE NOCASE)')
+        params = [name]
+        if project is not None:
+            sql += ' AND r.project = ?2'
+            params.append(project)
+        return self.db.execute(sql + ' ORDER BY r.project, r.id, p.chassis, p.slot, p.point', params).fetchall()
+
+
+def default_revision(input_file):
+    """ Revision name of an export: its modification time"""
+    return datetime.datetime.fromtimestamp(os.stat(input_file).st_mtime).isoformat(timespec='seconds')
+
+
+def main():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--profile', action='store_true', help="Print stage timings and counters at the end of the run")
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('db', help="SQLite point store file")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    save = commands.add_parser('save', parents=[common], help="Parse an export and store it as a revision")
+    save.add_argument('input_file', help="CSV or L5X file exported from RSLogix / Studio 5000")
+    save.add_argument('map', nargs='?', help="Substitution file (for N11/N68 mapping)")
+    save.add_argument('--project', help="Project name (default: input file name without extension)")
+    save.add_argument('--revision', help="Revision name (default: modification time of the input)")
+    save.add_argument('--replace', action='store_true', help="Overwrite the revision if it is already stored")
+    save.add_argument('--old', action='store_true', help="CSV was generated by old version of RSLogix")
+
+    listing = commands.add_parser('list', parents=[common], help="List stored revisions")
+    listing.add_argument('project', nargs='?')
+
+    find = commands.add_parser('find', parents=[common],
+                               help="Show where a tag or KIP name was wired in every stored revision")
+    find.add_argument('name')
+    find.add_argument('--project')
+
+    show = commands.add_parser('show', parents=[common], help="Render a stored revision without parsing the export")
+    show.add_argument('project')
+    show.add_argument('revision', nargs='?', help="Revision name (default: the latest one)")
+    show.add_argument('--print', action='store_true', help="Print table to stdout")
+    show.add_argument('--print_compact', action='store_true', help="Print compact table to stdout")
+    show.add_argument('--xlsx', metavar='FILE', help="Write the IO table to an XLSX file")
+
+    args = parser.parse_args()
+
+    iogen_log.configure_logging(level='WARNING', stream=sys.stderr)
+    if args.profile:
+        profiler.enable()
+
+    with PointStore(args.db) as store:
+        if args.command == 'save':
+            model = iogen.IOModel()
+            if iogen.read_input(args.input_file, args.map, old_csv_version=args.old, stream=True,
+                                model=model) is False:
+                print(f"❌ Could not read {args.input_file}")
+                raise SystemExit(1)
+            project = args.project or Path(args.input_file).stem
+            revision = args.revision or default_revision(args.input_file)
+            try:
+                store.save(model, project, revision, source=os.path.abspath(args.input_file), replace=args.replace)
+            except ValueError as e:
+                print(f"❌ {e} (use --replace)")
+                raise SystemExit(1)
+            print(f"💾 {len(model)} points stored as {project} @ {revision}")
+
+        elif args.command == 'list':
+            for project, revision, created, points, source in store.revisions(args.project):
+                print(f"{project:<24} {revision:<20} {points:>8} points  stored {created}  {source}")
+
+        elif args.command == 'find':
+            for project, revision, chassis, slot, point, tag, description in store.find(args.name, args.project):
+                print(f"{project:<24} {revision:<20} {chassis}:{slot}:{point:02}  {tag:<28} "
+                      f"{description.replace(chr(10), ' ')}")
+
+        else:
+            try:
+                model = store.load(args.project, args.revision)
+            except KeyError as e:
+                print(f"❌ {e.args[0]}")
+                raise SystemExit(1)
+            if args.print_compact:
+                iogen.write_table_compact(model=model)
+            if args.print:
+                iogen.write_table(model=model)
+            if args.xlsx:
+                iogen.write_xlsx(args.xlsx, model=model)
+
+    if profiler.enabled:
+        print("\n⏱ Profile:")
+        print(profiler.summary())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Waiting for new exports of the input and map files (--watch).
+
+On Linux the directories of the files are watched with inotify, called
+through ctypes (no extra package); a file replaced by rename is seen as
+well as one written in place. Elsewhere, or when inotify is not available
+(some network shares), size and mtime of the files are polled.
+
+A change is reported only when it is over:
+
+  * bursts of events are merged until nothing happened for `debounce`
+    seconds (Studio 5000 writes a big L5X in many chunks);
+  * then the size and mtime of each changed file must stay the same for
+    `settle` seconds;
+  * a file whose size and mtime are the ones already reported is skipped
+    (touch without a change, events that arrived while it was processed).
+"""
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+log = logging.getLogger('iogen.watch')
+
+# inotify(7)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_ONLYDIR = 0x01000000
+WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_ONLYDIR
+_EVENT = struct.Struct('iIII')  # wd, mask, cookie, len; затем имя длиной len
+
+
+def _stat(path):
+    """ (size, mtime_ns) of a file, None if it does not exist"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+class _Inotify(object):
+    """ inotify instance watching some directories; read() returns the names of changed files in them"""
+
+    def __init__(self, directories):
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_init1: {os.strerror(ctypes.get_errno())}")
+        self.directories = {}  # wd → directory
+        for directory in directories:
+            wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+            if wd < 0:
+                error = ctypes.get_errno()
+                self.close()
+                raise OSError(error, f"inotify_add_watch {directory}: {os.strerror(error)}")
+            self.directories[wd] = directory
+
+    def read(self, timeout):
+        """ Paths changed within `timeout` seconds (None — all watched directories overflowed)"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self.fd, 1 << 16)
+        except BlockingIOError:
+            return set()
+        changed = set()
+        pos = 0
+        while pos + _EVENT.size <= len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, pos)
+            pos += _EVENT.size
+            name = data[pos:pos + length].rstrip(b'\0')
+            pos += length
+            if mask & IN_Q_OVERFLOW:
+                return None
+            if wd in self.directories and name:
+                changed.add(os.path.join(self.directories[wd], os.fsdecode(name)))
+        return changed
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class FileWatcher(object):
+    """
+    Waits until some of `paths` changed and settled.
+
+    Args:
+        paths (iterable of str | Path | None): Files to watch; None entries are ignored.
+        debounce (float): Quiet time which ends a burst of changes, seconds.
+        settle (float): Time size and mtime of a changed file must stay the same, seconds.
+        poll_interval (float): Period of the polling backend, seconds.
+        backend (str | None): 'inotify', 'poll' or None (inotify where available).
+
+    `stop()` may be called from another thread, `wait()` then returns [].
+    """
+
+    def __init__(self, paths, debounce=1.0, settle=0.5, poll_interval=1.0, backend=None):
+        self.paths = sorted({os.path.abspath(p) for p in paths if p})
+        self.debounce = debounce
+        self.settle = settle
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._reported = {path: _stat(path) for path in self.paths}  # состояние файлов на момент последнего отчёта
+        self._polled = dict(self._reported)
+        self._inotify = None
+        if backend is None:
+            backend = 'inotify' if sys.platform.startswith('linux') else 'poll'
+        if backend == 'inotify':
+            try:
+                self._inotify = _Inotify(sorted({os.path.dirname(path) for path in self.paths}))
+            except (OSError, AttributeError) as e:
+                log.warning("⚠️  inotify is not available (%s), polling the files every %.1f s", e, poll_interval)
+                backend = 'poll'
+        self.backend = backend
+
+    def stop(self):
+        self._stop.set()
+
+    @property
+    def stopped(self):
+        return self._stop.is_set()
+
+    def close(self):
+        self.stop()
+        if self._inotify is not None:
+            self._inotify.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _events(self, timeout):
+        """ Watched paths with an event within `timeout` seconds"""
+        if self._inotify is not None:
+            changed = self._inotify.read(min(timeout, 0.25))  # короткий select, чтобы заметить stop()
+            return set(self.paths) if changed is None else changed.intersection(self.paths)
+        if self._stop.wait(min(timeout, self.poll_interval)):
+            return set()
+        changed = set()
+        for path in self.paths:
+            current = _stat(path)
+            if current != self._polled[path]:
+                self._polled[path] = current
+                changed.add(path)
+        return changed
+
+    def _quiet(self, seconds):
+        """ Collect events until there was none for `seconds`"""
+        changed = set()
+        quiet_since = time.monotonic()
+        while not self._stop.is_set():
+            left = quiet_since + seconds - time.monotonic()
+            if left <= 0:
+                break
+            more = self._events(left)
+            if more:
+                changed |= more
+                quiet_since = time.monotonic()
+        return changed
+
+    def _settled(self, path):
+        """ Wait until size and mtime of a file stop changing, returns them (None for a missing file)"""
+        previous = _stat(path)
+        while not self._stop.wait(self.settle):
+            current = _stat(path)
+            if current == previous:
+                return current
+            previous = current
+        return None
+
+    def wait(self, timeout=None):
+        """
+        Block until watched files changed and settled; returns their sorted paths.
+        Returns [] on timeout, after stop() and when the changes turned out to be no change.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        changed = set()
+        while not changed and not self._stop.is_set():
+            left = 3600.0 if deadline is None else deadline - time.monotonic()
+            if left <= 0:
+                return []
+            changed = self._events(left)
+        changed |= self._quiet(self.debounce)
+
+        result = []
+        for path in sorted(changed):
+            state = self._settled(path)
+            if self._stop.is_set():
+                return []
+            if state is not None and state != self._reported[path]:
+                self._reported[path] = state
+                result.append(path)
+        # события, пришедшие за время ожидания стабильности, относятся к уже учтённому состоянию
+        self._polled.update(self._reported)
+        return result
+
+
+def watch(paths, on_change, debounce=1.0, settle=0.5, poll_interval=1.0, backend=None):
+    """ Call on_change(changed paths) after every settled change of `paths`, until Ctrl+C"""
+    with FileWatcher(paths, debounce, settle, poll_interval, backend) as watcher:
+        log.info("👀 Watching %s (%s), Ctrl+C to stop", ', '.join(watcher.paths), watcher.backend)
+        try:
+            while True:
+                changed = watcher.wait()
+                if changed:
+                    log.info("\n🔄 Changed: %s", ', '.join(os.path.basename(path) for path in changed))
+                    on_change(changed)
+        except KeyboardInterrupt:
+            log.info("Watch stopped")
@@ -0,0 +1,73 @@
+"""
+RUS_comment_decoder against the original character loop: same text for
+every comment, and the same exception for the ones the loop rejects.
+"""
+import random
+
+import pytest
+
+import IO_Table_generator as iogen
+from benchmarks.synthetic import RUS_WORDS, encode_comment
+
+
+def legacy_decoder(comment):
+    """ RUS_comment_decoder as it was before the compiled substitution and the unicode_escape path"""
+    if comment is None:
+        return ""
+    out = ''
+    pos = 0
+    try:
+        while pos < len(comment):
+            if comment[pos] == '$':
+                if comment[pos + 1] == 'Q' or comment[pos + 1] == 'N':
+                    out += '\n'
+                    pos += 2
+                    continue
+                rus_symbol_code = comment[pos + 1:pos + 5]
+                out += chr(int(rus_symbol_code, base=16))
+                pos += 5
+            else:
+                out += comment[pos]
+                pos += 1
+    except IndexError:
+        pass
+    return out
+
+
+def outcome(decoder, comment):
+    try:
+        return 'ok', decoder(comment)
+    except Exception as e:
+        return 'error', type(e)
+
+
+# '$' sequences the loop accepts, truncates or rejects; int() also takes signs, spaces and '_'
+PIECES = ('$', '$N', '$Q', '$n', '$0422', '$043a', '$00e9', '$D800', '$FFFF', '$00', '$04', '$+123', '$ 12 ',
+          '$1_23', '$$0041', '0', '4', 'a', 'F', 'N', 'Q', ' ', '%', '_', '+', '\\', '\\u0041', 'é', 'Ж', '\n')
+
+
+def random_comments(count, seed):
+    rnd = random.Random(seed)
+    for _ in range(count):
+        yield ''.join(rnd.choice(PIECES) for _ in range(rnd.randrange(1, 12)))
+
+
+@pytest.mark.parametrize('comment', [
+    None, '', 'no codes', '$0422$0435$043a$0443$0449$0430$044f, %', 'line$Nbreak$Qquote', 'end$', 'end$04',
+    'bad$zzzz', '$$', '\\$0041', 'é$0416', 'Ж$0416', '$+123', '$ 12 ', '$1_23',
+])
+def test_known_comments(comment):
+    assert outcome(iogen.RUS_comment_decoder, comment) == outcome(legacy_decoder, comment)
+
+
+def test_synthetic_comments():
+    # comments the way Logix exports Russian text (benchmarks.synthetic)
+    for text in RUS_WORDS + ('Давление на входе\nнасоса', 'PT-1024: 0..16 кгс/см²'):
+        comment = encode_comment(text)
+        assert iogen.RUS_comment_decoder(comment) == legacy_decoder(comment) == text
+
+
+def test_random_escape_strings():
+    iogen.RUS_comment_decoder.cache_clear()
+    for comment in random_comments(20000, seed=4):
+        assert outcome(iogen.RUS_comment_decoder, comment) == outcome(legacy_decoder, comment), comment
@@ -0,0 +1,48 @@
+"""
+_csv_alias_lines against the csv module reading the whole export: the same
+ALIAS records for any chunk size, also when a quoted field holds line breaks
+and the record crosses a chunk boundary.
+"""
+import csv
+import io
+import random
+
+import pytest
+
+import IO_Table_generator as iogen
+from benchmarks.synthetic import ProjectSpec, generate, write_csv
+
+
+def multiline_export(path, delimiter):
+    """ Synthetic export with quoted line breaks and quotes in the DESCRIPTION of some records"""
+    rnd = random.Random(5)
+    lines = []
+    for line in path.read_text(encoding='ISO-8859-1').split('\n'):
+        record, sep, rest = line.partition(delimiter + '""' + delimiter)
+        if sep and rnd.random() < 0.3:
+            # пустое описание → многострочное, с кавычками и разделителем внутри
+            text = '\n'.join(rnd.choice(('Line', 'Pump "P-1"', f'a{delimiter}b', f'ALIAS{delimiter}x', ''))
+                             for _ in range(rnd.randint(2, 5)))
+            line = record + delimiter + '"' + text.replace('"', '""') + '"' + delimiter + rest
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+@pytest.fixture(scope='module', params=[',', '?'], ids=['csv', 'csv_old'])
+def export(request, tmp_path_factory):
+    aliases, _ = generate(ProjectSpec(chassis=2, slots=4, channels=8, programs=3, flexbus=1, comments=0.5, seed=3))
+    path = tmp_path_factory.mktemp('csv') / 'project.csv'
+    write_csv(path, aliases, old_version=request.param == '?')
+    return request.param, multiline_export(path, request.param)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 64, 997, 1 << 20])
+def test_same_records_as_csv_module(export, chunk_size):
+    delimiter, text = export
+    expected = [row for row in csv.reader(io.StringIO(text, newline=''), delimiter=delimiter)
+                if row and row[0] == 'ALIAS']
+    assert any('\n' in row[3] for row in expected)
+    seen = [0]
+    lines = iogen._csv_alias_lines(io.StringIO(text, newline=''), delimiter, seen, chunk_size=chunk_size)
+    assert list(csv.reader(lines, delimiter=delimiter)) == expected
+    assert seen[0] == text.count('\n')
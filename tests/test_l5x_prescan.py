@@ -0,0 +1,115 @@
+"""
+L5XPrescan and the readers built on it against the l5x DOM reader
+(read_input_l5x) on synthetic projects: same aliases per scope, same model,
+and the sequential fallback for files the pre-scan does not handle.
+"""
+import pytest
+
+import IO_Table_generator as iogen
+from benchmarks.synthetic import ProjectSpec, encode_comment, generate, write_l5x, write_map
+
+
+def tricky_aliases(aliases):
+    """ Synthetic aliases plus CDATA comments with markup and a point aliased in two scopes"""
+    aliases = list(aliases)
+    programs = sorted({scope for scope, _, _, _ in aliases if scope is not None})
+    scope, name, alias_for, comment = next(a for a in aliases if a[0] is None and a[2].startswith('RIO_'))
+    aliases += [
+        (programs[0], 'iMarkup1', 'RIO_000:1:I.Data.15', encode_comment('see </Tags> and <Tags> ]] > <Program>')),
+        (programs[-1], 'iMarkup2', 'RIO_001:2:I.Data.14', '<![CDATA[ $N</Description>'),
+        # контроллерный тег перекрывает программный с тем же адресом
+        (programs[1], name + '_prog', alias_for, encode_comment('Программный')),
+    ]
+    return aliases
+
+
+@pytest.fixture(scope='module')
+def project(tmp_path_factory):
+    out = tmp_path_factory.mktemp('project')
+    aliases, map_rows = generate(ProjectSpec(chassis=3, slots=6, channels=8, programs=6, flexbus=1, rungs=12,
+                                             seed=7))
+    paths = {'l5x': out / 'project.L5X', 'map': out / 'map.txt'}
+    write_l5x(paths['l5x'], tricky_aliases(aliases), padding=1, rungs=12)
+    write_map(paths['map'], map_rows)
+    return paths
+
+
+def read_points(reader, path, map_path, **kwargs):
+    """ Slots and points a reader puts into a new model"""
+    model = iogen.IOModel()
+    assert reader(str(path), str(map_path), model=model, **kwargs) is True
+    return model.dump_columns()['slots'], [(p.chassis, p.slot, p.point, p.tag, p.description, p.alias)
+                                           for p in model.iter_points()]
+
+
+def scope_aliases(parse):
+    """ {scope: [(tag_name, alias_for, description)]} reported by a collector"""
+    found = {}
+    collector = iogen.L5XAliasCollector(lambda scope, *alias: found.setdefault(scope, []).append(alias))
+    parse(collector)
+    return found
+
+
+def with_header(path, copy, header):
+    """ Copy of an L5X file with `header` inserted after the XML declaration"""
+    text = path.read_text(encoding='utf-8')
+    end = text.index('?>') + 2
+    copy.write_text(text[:end] + header + text[end:], encoding='utf-8')
+    return copy
+
+
+def test_regions_give_the_aliases_of_a_full_parse(project):
+    full = scope_aliases(lambda c: c.parse_file(str(project['l5x']), prescan=False))
+    assert sum(len(tags) for tags in full.values()) > 200
+    regions = iogen.L5XPrescan.scan(str(project['l5x']))
+    assert regions is not None
+    with regions:
+        assert scope_aliases(lambda c: c.parse_regions(regions)) == full
+        # прогоны параллельного чтения по отдельности дают те же алиасы
+        chunks = iogen._split_scopes(regions, 3)
+        assert len(chunks) > 1
+        merged = {}
+        for scopes in chunks:
+            merged.update(scope_aliases(lambda c: c.parse_regions(regions, set(scopes))))
+    assert merged == full
+
+
+@pytest.mark.parametrize('chunk_size', [1 << 20, 61])
+@pytest.mark.parametrize('reader', [
+    iogen.read_input_l5x_stream,
+    lambda *args, **kwargs: iogen.read_input_l5x_parallel(*args, jobs=1, **kwargs),
+    lambda *args, **kwargs: iogen.read_input_l5x_parallel(*args, jobs=2, **kwargs),
+], ids=['stream', 'parallel-1', 'parallel-2'])
+def test_readers_match_the_dom_reader(project, monkeypatch, reader, chunk_size):
+    expected = read_points(iogen.read_input_l5x, project['l5x'], project['map'])
+    # мелкие куски режут теги и CDATA на границах кусков
+    monkeypatch.setattr(iogen.L5XAliasCollector, 'chunk_size', chunk_size)
+    assert read_points(reader, project['l5x'], project['map']) == expected
+
+
+@pytest.mark.parametrize('header', ['<!-- exported by hand -->', '<!DOCTYPE RSLogix5000Content>'])
+def test_fallback_for_files_the_prescan_does_not_handle(project, tmp_path, header):
+    path = with_header(project['l5x'], tmp_path / 'project.L5X', header)
+    assert iogen.L5XPrescan.scan(str(path)) is None
+    expected = read_points(iogen.read_input_l5x, path, project['map'])
+    assert read_points(iogen.read_input_l5x_stream, path, project['map']) == expected
+    assert read_points(iogen.read_input_l5x_parallel, path, project['map'], jobs=2) == expected
+
+
+def test_prescan_refuses_other_encodings(project, tmp_path):
+    text = project['l5x'].read_text(encoding='utf-8')
+    path = tmp_path / 'utf16.L5X'
+    path.write_text(text.replace('encoding="UTF-8"', 'encoding="UTF-16"'), encoding='utf-16')
+    assert iogen.L5XPrescan.scan(str(path)) is None
+    path = tmp_path / 'cp1251.L5X'
+    path.write_text(text.replace('encoding="UTF-8"', 'encoding="windows-1251"'), encoding='cp1251')
+    assert iogen.L5XPrescan.scan(str(path)) is None
+
+
+@pytest.mark.parametrize('reader', [iogen.read_input_l5x_stream, iogen.read_input_l5x_parallel])
+def test_truncated_file_is_not_loaded(project, tmp_path, reader):
+    data = project['l5x'].read_bytes()
+    path = tmp_path / 'truncated.L5X'
+    path.write_bytes(data[:len(data) * 2 // 3])
+    model = iogen.IOModel()
+    assert reader(str(path), str(project['map']), model=model) is False
@@ -0,0 +1,53 @@
+"""
+n11mapping.replace against the lookups it replaced: the original scan in
+file order (same result whenever no key is a prefix of another) and a plain
+longest-prefix scan (for maps with N11[1] and N11[10] side by side).
+"""
+import random
+
+import IO_Table_generator as iogen
+from benchmarks.bench_n11mapping import legacy_replace, make_aliases, make_map_file
+
+
+def longest_prefix_replace(n11, point_address):
+    matches = [n for n in n11 if point_address.startswith(n)]
+    if not matches:
+        return point_address
+    n = max(matches, key=len)
+    return n11[n] + point_address[len(n):]
+
+
+def load(tmp_path, rows):
+    path = tmp_path / 'map.txt'
+    path.write_text(''.join(f'{key} {target}\n' for key, target in rows))
+    return iogen.n11mapping(str(path))
+
+
+def test_same_as_linear_scan(tmp_path):
+    path = tmp_path / 'map.txt'
+    make_map_file(path, 500)
+    mapping = iogen.n11mapping(str(path))
+    aliases = make_aliases(500, 5000, seed=2)
+    for alias in aliases:
+        assert mapping.replace(alias) == longest_prefix_replace(mapping._n11, alias)
+    # N11[100]..N11[499] have the same length, so none is a prefix of another and the old scan agrees
+    prefix_free = {key: target for key, target in mapping._n11.items() if len(key) == len('N11[100]')}
+    mapping = load(tmp_path, prefix_free.items())
+    replaced = 0
+    for alias in aliases:
+        assert mapping.replace(alias) == legacy_replace(prefix_free, alias)
+        replaced += mapping.replace(alias) != alias
+    assert replaced > 2000
+
+
+def test_random_overlapping_keys(tmp_path):
+    rnd = random.Random(5)
+    alphabet = 'NO1[]0.:'
+    rows = {''.join(rnd.choice(alphabet) for _ in range(rnd.randrange(1, 6))): f'T{i}:0:I.Data'
+            for i in range(200)}
+    rows['#comment'] = 'ignored'
+    mapping = load(tmp_path, rows.items())
+    del rows['#comment']
+    for _ in range(20000):
+        alias = ''.join(rnd.choice(alphabet + 'RI') for _ in range(rnd.randrange(0, 10)))
+        assert mapping.replace(alias) == longest_prefix_replace(rows, alias), alias